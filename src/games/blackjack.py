@@ -14,11 +14,14 @@ Outputs: Functional GUI for Blackjack.
 
 
 
-from PyQt6.QtWidgets import QWidget, QGraphicsScene, QPushButton, QMessageBox
+from PyQt6.QtWidgets import QWidget, QGraphicsScene, QPushButton, QMessageBox, QLabel
 from PyQt6.QtCore import QPropertyAnimation, QPointF, QEasingCurve, QTimer, pyqtSignal, Qt, QTimer
 from PyQt6.QtGui import QPixmap
 from .ui.blackjack_ui import Ui_BlackJackScreen
-from .objects.deck import Deck, AnimatedCard
+from .objects.deck import Deck
+from .objects.animated_card import AnimatedCard
+from .objects.cardcodes import BLACKJACK_VALUES, ACE, pixmapName
+from .objects import blackjack_ev
 import os
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -56,6 +59,17 @@ class BlackJackScreen(QWidget):
         self.rulesButton.move(20, 20)
         self.rulesButton.clicked.connect(self.showRules)
 
+        # Optional advice overlay: the EV of each move for the cards left in the deck.
+        self.adviceButton = QPushButton("Show Advice", self)
+        self.adviceButton.setCheckable(True)
+        self.adviceButton.move(100, 20)
+        self.adviceButton.toggled.connect(self.setAdviceShown)
+        self.adviceLabel = QLabel(self)
+        self.adviceLabel.setGeometry(20, 150, 271, 81)
+        self.adviceLabel.setStyleSheet("QLabel { background-color: rgba(0, 0, 0, 160); color: white; "
+                                       "border-radius: 8px; padding: 4px; }")
+        self.adviceLabel.hide()
+
         self.state = state
         self.pot = 0
         self.ui.chipsNum.setText(f"Chip Total: {self.state.chips}")
@@ -89,6 +103,29 @@ class BlackJackScreen(QWidget):
         )
         QMessageBox.information(self, "Blackjack Rules", rules_text)
 
+    def setAdviceShown(self, shown):
+        self.adviceButton.setText("Hide Advice" if shown else "Show Advice")
+        self.adviceLabel.setVisible(shown)
+        self.refreshAdvice()
+
+    '''
+    Shows the EV of every move for the hand in play (see objects/blackjack_ev.py). Doubling and
+    splitting aren't moves the table offers, they're shown for reference.
+    '''
+    def refreshAdvice(self):
+        if not self.adviceButton.isChecked():
+            return
+        if not self.ui.standButton.isEnabled() or len(self.game.dealerHand) < 2:
+            self.adviceLabel.setText("")
+            return
+        evs = self.game.decisionEVs()
+        best = "Hit" if evs['hit'] > evs['stand'] else "Stand"
+        text = f"Stand {evs['stand']:+.3f}   Hit {evs['hit']:+.3f}\nBest: {best}"
+        extras = [f"{name.title()} {evs[name]:+.3f}" for name in ('double', 'split') if name in evs]
+        if extras:
+            text += "\n(" + ", ".join(extras) + ")"
+        self.adviceLabel.setText(text)
+
 
     '''
     Initiates the dealing process and animates the player's and dealer's hands.
@@ -117,6 +154,7 @@ class BlackJackScreen(QWidget):
         print(self.game.dealerHand)
         print(self.game.playerHand)
         self.ui.dealButton.setEnabled(False)
+        self.refreshAdvice()
 
 
     '''
@@ -128,7 +166,7 @@ class BlackJackScreen(QWidget):
         if hidden:
             path = os.path.join(CARDS_DIR, "card_back.jpg")
         else:
-            path = os.path.join(CARDS_DIR, "" + str(card.rank) + "_of_" + card.suit + ".png")
+            path = os.path.join(CARDS_DIR, pixmapName(card.code))
         print(path)
         pixmap = QPixmap(path).scaled(100, 145)
         return pixmap
@@ -183,6 +221,7 @@ class BlackJackScreen(QWidget):
     def dealerGo(self):
         self.ui.hitButton.setEnabled(False)
         self.ui.standButton.setEnabled(False)
+        self.refreshAdvice()
         reveal = self.createCard(self.game.dealerHand[0], hidden=False)
         self.hidden_card._pixmap = reveal
         self.hidden_card.update()
@@ -256,6 +295,7 @@ class BlackJackScreen(QWidget):
         QTimer.singleShot(1000, Qt.TimerType.PreciseTimer, lambda: self.ui.betButton.setEnabled(True))
         self.ui.hitButton.setEnabled(False)
         self.ui.standButton.setEnabled(False)
+        self.refreshAdvice()
 
         return
 
@@ -276,7 +316,7 @@ class BlackJackScreen(QWidget):
             self.ui.hitButton.setEnabled(False)
             self.ui.standButton.setEnabled(False)
             QTimer.singleShot(1000, Qt.TimerType.PreciseTimer, lambda: self.game_over("dealer"))
-            
+        self.refreshAdvice()
         return
     
     '''
@@ -312,6 +352,7 @@ class BlackJackScreen(QWidget):
         self.ui.betButton.setEnabled(True)
         self.ui.hitButton.setEnabled(False)
         self.ui.standButton.setEnabled(False)
+        self.refreshAdvice()
         self.addDeckBack()
         self.switch_to_menu.emit()
 
@@ -332,6 +373,21 @@ class BlackJack:
         self.dealerScore = 0
         self.bust = False
 
+    '''
+    Counts (see blackjack_ev.VALUES) of the cards the player hasn't seen: the deck and the dealer's
+    hidden card.
+    '''
+    def shoe(self):
+        return blackjack_ev.shoeCounts([card.code for card in self.deck.deck] + [self.dealerHand[0].code])
+
+    '''
+    EV of each move for the player's hand against the dealer's upcard, from the cards they haven't
+    seen (see blackjack_ev.actionEVs).
+    '''
+    def decisionEVs(self):
+        return blackjack_ev.actionEVs([card.code for card in self.playerHand], self.dealerHand[1].code,
+                                      self.shoe())
+
     '''Adds card to a hand''' 
     def deal(self, hand):
         hand.append(self.deck.draw())
@@ -354,12 +410,11 @@ class BlackJack:
     def getTotal(self, hand):
         total = [0]
         for card in hand:
-            if card.rank == 'ace':
-                total.append('ace')
-            elif card.rank in ['jack', 'queen', 'king']:
-                total[0] = total[0] + 10
+            rank = card.code >> 2
+            if rank == ACE:
+                total.append(card.code)
             else:
-                total[0] = total[0] + card.rank
+                total[0] = total[0] + BLACKJACK_VALUES[rank]
         return total
 
     '''
@@ -0,0 +1,135 @@
+'''
+Name: hud.py
+
+Authors: Joshua Welicky, Gavin Billinger, Mark Kitchin, Bisshoy Bhattacharjee, Max Biundo
+
+Description: Odds overlay for the poker screen. Shows the player's chance of winning and their outs
+after every street.
+
+The numbers are worked out on a background thread and the sampling itself runs in the equity
+process pool, so the GUI thread (and the card animations) never wait on them. Answers refine in
+stages: a rough number from a small sample comes back in a few milliseconds, then tighter ones
+follow. Every request gets a generation number, and as soon as the board changes the older
+generation stops and anything it still sends is ignored.
+'''
+import numpy as np
+from PyQt6.QtCore import QObject, QThread, QRect, pyqtSignal
+from PyQt6.QtWidgets import QLabel, QPushButton
+
+from .objects import equity, preflop
+
+# Samples for each refinement stage. The first is small enough to show up well inside 50 ms.
+STAGES = (1500, 15000, 60000)
+
+
+class EquityWorker(QThread):
+    # generation, equity.Equity, outs, final
+    result = pyqtSignal(int, object, int, bool)
+
+    def __init__(self, hud, generation, hole, board, opponents):
+        super().__init__()
+        self.hud = hud
+        self.generation = generation
+        self.hole = hole
+        self.board = board
+        self.opponents = opponents
+
+    def stale(self):
+        return self.hud.generation != self.generation
+
+    def run(self):
+        hole, board, opponents = self.hole, self.board, self.opponents
+        outs = equity.countOuts(hole, board)
+        if not board and preflop.isAvailable():
+            # The table only stores pot share, so ties are counted into win.
+            share = preflop.preflopEquity(*hole, opponents)
+            self.result.emit(self.generation, equity.Equity(share, 0.0, 1.0 - share, share, 0), outs, True)
+            return
+
+        executor = equity.getExecutor(None)
+        if equity.stateSpace(board, opponents) <= equity.EXACT_THRESHOLD:
+            answer = executor.submit(equity.exactEquity, hole, board, opponents).result()
+            if not self.stale():
+                self.result.emit(self.generation, answer, outs, True)
+            return
+
+        total = equity.Tally()
+        seeds = np.random.SeedSequence().spawn(len(STAGES))
+        for stage, (count, seed) in enumerate(zip(STAGES, seeds)):
+            if self.stale():
+                return
+            total = total + executor.submit(equity.sampleRunouts, hole, board, opponents, count, seed).result()
+            if self.stale():
+                return
+            self.result.emit(self.generation, total.result(), outs, stage == len(STAGES) - 1)
+
+
+'''
+The overlay itself: a toggle button and a label on the poker screen.
+'''
+class EquityHud(QObject):
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.generation = 0
+        self.workers = [] # Running workers, kept alive until they finish.
+        self.lastRequest = None
+
+        self.toggle = QPushButton("Show Odds", parent)
+        self.toggle.setCheckable(True)
+        self.toggle.setGeometry(QRect(650, 20, 131, 31))
+        self.toggle.toggled.connect(self.setShown)
+        self.label = QLabel(parent)
+        self.label.setGeometry(QRect(560, 55, 221, 61))
+        self.label.setStyleSheet("QLabel { background-color: rgba(0, 0, 0, 160); color: white; "
+                                 "border-radius: 8px; padding: 4px; }")
+        self.label.hide()
+
+    def isShown(self):
+        return self.toggle.isChecked()
+
+    def setShown(self, shown):
+        self.toggle.setText("Hide Odds" if shown else "Show Odds")
+        self.label.setVisible(shown)
+        if shown and self.lastRequest:
+            self.refresh(*self.lastRequest)
+        elif not shown:
+            self.generation += 1 # Nobody is looking, stop working.
+
+    '''
+    Starts working out the odds for a new situation. Anything still running for an old board is
+    dropped.
+    '''
+    def refresh(self, hole, board, opponents):
+        self.lastRequest = (list(hole), list(board), opponents)
+        self.generation += 1
+        if not self.isShown():
+            return
+        if len(hole) != 2 or opponents < 1:
+            self.label.setText("No hand")
+            return
+        self.label.setText("Working out odds...")
+        worker = EquityWorker(self, self.generation, list(hole), list(board), opponents)
+        worker.result.connect(self.showResult)
+        worker.finished.connect(lambda: self.workers.remove(worker))
+        self.workers.append(worker)
+        worker.start()
+
+    '''
+    Clears the overlay, e.g. when the hand ends or the player folds.
+    '''
+    def clear(self):
+        self.generation += 1
+        self.lastRequest = None
+        self.label.setText("")
+
+    def showResult(self, generation, answer, outs, final):
+        if generation != self.generation:
+            return
+        text = f"Equity {answer.equity:.1%}"
+        if answer.samples:
+            text += f"  (win {answer.win:.1%}, tie {answer.tie:.1%})"
+        if outs:
+            text += f"\nOuts: {outs}"
+        if not final:
+            text += "  (refining...)"
+        self.label.setText(text)
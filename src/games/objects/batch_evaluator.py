@@ -0,0 +1,137 @@
+'''
+Name: batch_evaluator.py
+
+Authors: Joshua Welicky, Gavin Billinger, Mark Kitchin, Bisshoy Bhattacharjee, Max Biundo
+
+Description: NumPy version of the lookup-table evaluator for scoring huge numbers of hands per call.
+It takes an (N, 7) int array of card codes (any width up to 7 works) and returns the same strengths
+and categories that evaluator.evaluate and Hand.getBestHand give, one hand per row.
+
+Big batches are worked through in fixed-size chunks so memory use stays bounded. omahaStrengthsBatch
+does the same for Omaha hands (see omaha_evaluator.py).
+'''
+from itertools import combinations
+
+import numpy as np
+
+from . import evaluator
+
+CHUNK_SIZE = 1 << 16
+
+# The rank table is a dict in evaluator.py. Here it is flattened into an array with a perfect hash:
+# a hand's ranks are split into a low part (2-8) and a high part (9-A). High parts are numbered
+# smallest first, and each low part gets a row just long enough for the high parts that still fit
+# in 7 cards. Row offset plus high number then lands on a unique slot with no gaps.
+_LOW_RANKS = 7
+_LOW_BASE = 5 ** _LOW_RANKS
+
+
+def _digitSums(keys):
+    total = np.zeros_like(keys)
+    while keys.any():
+        total += keys % 5
+        keys = keys // 5
+    return total
+
+
+def _buildRankArrays():
+    keys = np.array(list(evaluator.RANK_TABLE), dtype=np.int64)
+    values = np.array(list(evaluator.RANK_TABLE.values()), dtype=np.int32)
+    lows, highs = keys % _LOW_BASE, keys // _LOW_BASE
+
+    uniqueHighs = np.unique(highs)
+    highSizes = _digitSums(uniqueHighs)
+    order = np.lexsort((uniqueHighs, highSizes))
+    highIds = np.zeros(int(uniqueHighs.max()) + 1, dtype=np.int32)
+    highIds[uniqueHighs[order]] = np.arange(len(order), dtype=np.int32)
+    # How many high parts have at most n cards.
+    fitting = np.cumsum(np.bincount(highSizes, minlength=8))
+
+    uniqueLows = np.unique(lows)
+    rowLengths = fitting[7 - _digitSums(uniqueLows)]
+    lowOffsets = np.zeros(int(uniqueLows.max()) + 1, dtype=np.int32)
+    lowOffsets[uniqueLows] = np.concatenate(([0], np.cumsum(rowLengths)[:-1]))
+
+    table = np.zeros(len(keys), dtype=np.int32)
+    table[lowOffsets[lows] + highIds[highs]] = values
+    return lowOffsets, highIds, table
+
+
+_LOW_OFFSETS, _HIGH_IDS, _RANK_VALUES = _buildRankArrays()
+
+# A card's key packs its high-part digit (bits 29+), low-part digit (bits 12-28) and suit counter.
+_POWERS = np.array(evaluator.POWERS, dtype=np.int64)
+_RANKS = np.arange(52) >> 2
+_CARD_KEYS = np.where(_RANKS < _LOW_RANKS, _POWERS[_RANKS] << 12, (_POWERS[_RANKS] // _LOW_BASE) << 29)
+_CARD_KEYS |= 1 << 3 * (np.arange(52) & 3)
+_RANK_BITS = np.array(evaluator.RANK_BITS, dtype=np.int32)
+_FLUSH_TABLE = np.array(evaluator.FLUSH_TABLE, dtype=np.int32)
+_FLUSH_SUITS = np.array(evaluator.FLUSH_SUITS, dtype=np.int8)
+
+
+def _evaluateChunk(cards, out):
+    keys = _CARD_KEYS[cards].sum(axis=1)
+    out[:] = _RANK_VALUES[_LOW_OFFSETS[(keys >> 12) & 0x1FFFF] + _HIGH_IDS[keys >> 29]]
+
+    # Only a few percent of hands hold a flush, so those rows get their own pass.
+    suits = _FLUSH_SUITS[keys & 0xFFF]
+    rows = np.flatnonzero(suits >= 0)
+    if rows.size:
+        flushCards = cards[rows]
+        inSuit = (flushCards & 3) == suits[rows, None]
+        masks = np.where(inSuit, _RANK_BITS[flushCards], 0).sum(axis=1)
+        out[rows] = np.maximum(out[rows], _FLUSH_TABLE[masks])
+
+
+'''
+Scores every row of cards. Returns (strengths, categories) as (N,) arrays.
+'''
+def evaluateBatch(cards, chunkSize=CHUNK_SIZE):
+    cards = np.asarray(cards)
+    if cards.ndim != 2 or cards.shape[1] > 7:
+        raise ValueError("cards must be an (N, k) array with k <= 7")
+    strengths = np.empty(len(cards), dtype=np.int32)
+    for start in range(0, len(cards), chunkSize):
+        chunk = cards[start:start + chunkSize].astype(np.intp, copy=False)
+        _evaluateChunk(chunk, strengths[start:start + chunkSize])
+    categories = (strengths >> evaluator.CATEGORY_SHIFT).astype(np.int8)
+    return strengths, categories
+
+
+'''
+Just the strengths, for callers (like the equity code) that only compare hands.
+'''
+def strengthsBatch(cards, chunkSize=CHUNK_SIZE):
+    return evaluateBatch(cards, chunkSize)[0]
+
+
+'''
+Omaha strengths: the best hand made from exactly two of the four hole cards in each row of holes
+(N, 4) plus exactly three of the five board cards in the same row of boards (N, 5). The six pair
+keys and ten triple keys are summed once each and broadcast against each other, so all 60 hands of
+a row are scored with one add and one lookup apiece. Returns an (N,) array of strengths.
+'''
+def omahaStrengthsBatch(holes, boards, chunkSize=CHUNK_SIZE // 16):
+    holes = np.asarray(holes)
+    boards = np.asarray(boards)
+    if holes.ndim != 2 or holes.shape[1] != 4 or boards.shape != (len(holes), 5):
+        raise ValueError("holes must be (N, 4) and boards (N, 5)")
+    pairs = np.array(list(combinations(range(4), 2)))
+    triples = np.array(list(combinations(range(5), 3)))
+    strengths = np.empty(len(holes), dtype=np.int32)
+    for start in range(0, len(holes), chunkSize):
+        hole = holes[start:start + chunkSize].astype(np.intp, copy=False)
+        board = boards[start:start + chunkSize].astype(np.intp, copy=False)
+        pairKeys = _CARD_KEYS[hole[:, pairs]].sum(axis=2)
+        tripleKeys = _CARD_KEYS[board[:, triples]].sum(axis=2)
+        keys = pairKeys[:, :, None] + tripleKeys[:, None, :]
+        values = _RANK_VALUES[_LOW_OFFSETS[(keys >> 12) & 0x1FFFF] + _HIGH_IDS[keys >> 29]]
+
+        # Five cards only make a flush if all five share the suit, so all their rank bits count.
+        flushes = _FLUSH_SUITS[keys & 0xFFF] >= 0
+        if flushes.any():
+            masks = np.bitwise_or.reduce(_RANK_BITS[hole[:, pairs]], axis=2)[:, :, None] \
+                | np.bitwise_or.reduce(_RANK_BITS[board[:, triples]], axis=2)[:, None, :]
+            values = np.where(flushes, np.maximum(values, _FLUSH_TABLE[masks]), values)
+        strengths[start:start + chunkSize] = values.reshape(len(hole), -1).max(axis=1)
+    return strengths
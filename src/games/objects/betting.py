@@ -0,0 +1,94 @@
+'''
+Name: betting.py
+
+Authors: Joshua Welicky, Gavin Billinger, Mark Kitchin, Bisshoy Bhattacharjee, Max Biundo
+
+Description: The betting round as a state machine. BettingRound goes round the table one seat per
+step(), with no recursion, so a table of any size costs the same stack. Opponents act when their
+seat comes up, and everything that happens is put on an event queue:
+
+(OPPONENT_ACTED, seat index, how it reads) - an opponent acted
+(PLAYER_TURN,) - the player (seat 0) is up, the machine waits for resume()
+(ROUND_OVER,) - everyone has matched, time for the next street
+(HAND_OVER,) - only one player is left
+
+The poker screen drains the queue on a timer, the headless table and the pondering code just run
+it to the next stop.
+'''
+from collections import deque
+
+RUNNING = 'running'
+PLAYER_TURN = 'player'
+ROUND_OVER = 'roundOver'
+HAND_OVER = 'handOver'
+OPPONENT_ACTED = 'opponent'
+
+
+class BettingRound:
+    '''
+    chooser(opp, index), if given, may return an action for the opponent in seat `index` (see
+    Ponderer.nextAction). When it returns None the opponent decides for itself.
+    '''
+    def __init__(self, game, chooser=None):
+        self.game = game
+        self.chooser = chooser
+        self.state = RUNNING
+        self.events = deque()
+
+    '''
+    Starts a new betting round from the first seat.
+    '''
+    def start(self):
+        self.game.start_round()
+        self.resume()
+
+    '''
+    Carries on from wherever the turn is, e.g. once the player has acted.
+    '''
+    def resume(self):
+        self.state = RUNNING
+
+    def stop(self, state):
+        self.state = state
+        self.events.append((state,))
+        return False
+
+    '''
+    Moves the turn on by one seat. Returns False once the machine has stopped: the player is up, or
+    the round or the hand is over.
+    '''
+    def step(self):
+        if self.state != RUNNING:
+            return False
+        game = self.game
+        if len(game.activePlayers) == 1:
+            return self.stop(HAND_OVER)
+        if game.checked == len(game.activePlayers):
+            game.checked = 0
+            game.activeBet = False
+            return self.stop(ROUND_OVER)
+
+        current = game.turn_index
+        game.turn_index = (current + 1) % (game.oppNo + 1)
+        if current == 0:
+            if game.folded:
+                return True
+            if game.skip:
+                game.checked += 1 # All in, nothing to decide.
+                return True
+            return self.stop(PLAYER_TURN)
+        opp = game.opps[current - 1]
+        if opp.folded or not opp.active:
+            return True
+        action = self.chooser(opp, current) if self.chooser else None
+        text = opp.act(action, current) if action else opp.decision(current)
+        self.events.append((OPPONENT_ACTED, current, text))
+        return True
+
+    '''
+    Steps until the machine stops. Returns the state it stopped in.
+    '''
+    def run(self):
+        while self.step():
+            pass
+        return self.state
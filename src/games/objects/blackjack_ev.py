@@ -0,0 +1,316 @@
+'''
+Name: blackjack_ev.py
+
+Authors: Joshua Welicky, Gavin Billinger, Mark Kitchin, Bisshoy Bhattacharjee, Max Biundo
+
+Description: Exact expected values for blackjack decisions, worked out from the cards actually left
+in the shoe. A shoe is a tuple of counts by card value (ace, 2-9, then every ten-valued card), so a
+single deck part way through and a fresh six-deck shoe are handled the same way.
+
+The dealer plays by BlackJack.dealerTurn: the hole card is drawn like any other card (there's no
+peek) and the dealer hits until the best total is DEALER_STANDS or more. Drawing without
+replacement, the chance of a dealer hand only depends on which cards were drawn, not their order:
+the orderings that reach it, times the ways the shoe can supply those cards, over the ways to draw
+that many cards. dealerHands lists every hand the dealer can finish with for an upcard once, and
+dealerOutcomes turns a whole batch of shoes into final-total chances with two matrix products.
+
+A decision is a recursion over the cards the player could draw. Every shoe the player can reach is
+collected first and the dealer outcomes for all of them are worked out in one batch. Standing is
+scored against those outcomes, hitting takes the better of standing and hitting again after each
+card. Stand values and best plays are memoized on the shoe left, so paths that draw the same cards
+in a different order are only worked out once, and the next decision of a hand (which reaches a
+subset of the same shoes) is mostly answered from the memo.
+
+EVs are in bets: +1 is winning the bet, -1 losing it. Pushes are 0, and a two-card 21 counts like any
+other 21, as it does in the game.
+'''
+from collections import defaultdict
+from functools import lru_cache
+
+import numpy as np
+
+from .cardcodes import ACE, BLACKJACK_VALUES
+
+VALUES = (1, 2, 3, 4, 5, 6, 7, 8, 9, 10) # Card value of each shoe slot.
+SLOTS = len(VALUES)
+DEALER_STANDS = 18 # The dealer hits 17 and below, soft or hard.
+DEALER_TOTALS = tuple(range(DEALER_STANDS, 22))
+BUST = len(DEALER_TOTALS) # Index of the bust chance in an outcome row.
+MAX_DRAWS = 13 # Most cards the dealer can draw after the upcard (hole card included).
+BATCH = 1024 # Shoes per dealer outcome batch, keeps the work arrays a few MB.
+CACHE_SIZE = 1 << 18 # Memo entries kept before the memos are dropped.
+_NEVER = -1e6 # Stands in for log(0), so impossible hands still multiply out to exp() == 0.
+
+_standMemo = {} # (upcard slot, shoe) to the stand EV of every player total.
+_bestMemo = {} # (hard, soft, upcard slot, shoe) to the EV of playing on as well as possible.
+
+
+def slotOf(code):
+    rank = code >> 2
+    return 0 if rank == ACE else BLACKJACK_VALUES[rank] - 1
+
+
+'''
+Shoe counts (see VALUES) for a list of card codes.
+'''
+def shoeCounts(codes):
+    counts = [0] * SLOTS
+    for code in codes:
+        counts[slotOf(code)] += 1
+    return tuple(counts)
+
+
+def fullShoe(decks=1):
+    return tuple(4 * decks if value < 10 else 16 * decks for value in VALUES)
+
+
+def without(counts, slot):
+    return counts[:slot] + (counts[slot] - 1,) + counts[slot + 1:]
+
+
+def bestTotal(hard, soft):
+    return hard + 10 if soft and hard + 10 <= 21 else hard
+
+
+'''
+Every hand the dealer can finish with after showing the upcard in `upSlot`. Returns the one-hot
+drawn counts (hands x SLOTS * (MAX_DRAWS + 1)), the log of the number of orderings that reach each
+hand without the dealer stopping early, and how each ends, one-hot by cards drawn and final total
+(hands x (MAX_DRAWS + 1) * (BUST + 1)).
+'''
+@lru_cache(maxsize=None)
+def dealerHands(upSlot):
+    final = defaultdict(int)
+    level = {(0,) * SLOTS: 1} # Drawn counts to orderings, for hands the dealer still hits.
+    while level:
+        nextLevel = defaultdict(int)
+        for drawn, ways in level.items():
+            hard = VALUES[upSlot] + sum(count * value for count, value in zip(drawn, VALUES))
+            soft = upSlot == 0 or drawn[0] > 0
+            for slot in range(SLOTS):
+                after = drawn[:slot] + (drawn[slot] + 1,) + drawn[slot + 1:]
+                newHard = hard + VALUES[slot]
+                if newHard > 21 or bestTotal(newHard, soft or slot == 0) >= DEALER_STANDS:
+                    final[after] += ways
+                else:
+                    nextLevel[after] += ways
+        level = nextLevel
+
+    hands = list(final)
+    drawn = np.zeros((len(hands), SLOTS * (MAX_DRAWS + 1)))
+    ends = np.zeros((len(hands), (MAX_DRAWS + 1) * (BUST + 1)))
+    for row, hand in enumerate(hands):
+        drawn[row, [slot * (MAX_DRAWS + 1) + count for slot, count in enumerate(hand)]] = 1.0
+        hard = VALUES[upSlot] + sum(count * value for count, value in zip(hand, VALUES))
+        total = bestTotal(hard, upSlot == 0 or hand[0] > 0)
+        ends[row, sum(hand) * (BUST + 1) + (BUST if total > 21 else total - DEALER_STANDS)] = 1.0
+    return drawn, np.log([final[hand] for hand in hands]), ends
+
+
+'''
+log of n * (n - 1) * ... for 0 up to MAX_DRAWS factors, for every n in `counts`. Once the factors
+run out the product is 0, and each factor past that adds `never`.
+'''
+def _logFalling(counts, never=_NEVER):
+    factors = counts[..., None] - np.arange(MAX_DRAWS, dtype=np.float64)
+    logs = np.log(np.maximum(factors, 1.0))
+    logs[factors <= 0] = never
+    falling = np.zeros(counts.shape + (MAX_DRAWS + 1,))
+    np.cumsum(logs, axis=-1, out=falling[..., 1:])
+    return falling
+
+
+'''
+Final dealer total chances (DEALER_TOTALS, then bust) for a batch of shoes (shoes x SLOTS) the
+dealer draws from after showing the upcard in `upSlot`. The hole card is still in the shoe.
+
+Each hand's weight is its orderings times the ways the shoe supplies its cards. Those are summed by
+cards drawn and final total, and only then divided by the ways to draw that many cards, which keeps
+the work per hand down to one exp().
+'''
+def dealerOutcomes(shoes, upSlot):
+    drawn, logWays, ends = dealerHands(upSlot)
+    shoes = np.asarray(shoes, dtype=np.float64).reshape(-1, SLOTS)
+    outcomes = np.empty((len(shoes), BUST + 1))
+    for start in range(0, len(shoes), BATCH):
+        part = shoes[start:start + BATCH]
+        weights = _logFalling(part).reshape(len(part), -1) @ drawn.T
+        weights += logWays
+        np.exp(weights, out=weights)
+        bySize = (weights @ ends).reshape(len(part), MAX_DRAWS + 1, BUST + 1)
+        # A hand the shoe can't supply already weighs 0, so running out here just divides by 1.
+        draws = np.exp(-_logFalling(part.sum(axis=1), 0.0))
+        outcomes[start:start + BATCH] = np.einsum('skt,sk->st', bySize, draws)
+    return outcomes
+
+
+'''
+Final total chances for every upcard (ace first, tens last) from the shoe, the hole card still in it.
+Returns a list of outcome rows, None for upcards the shoe doesn't hold.
+'''
+def dealerTable(counts):
+    return [dealerOutcomes([without(counts, slot)], slot)[0] if counts[slot] else None
+            for slot in range(SLOTS)]
+
+
+'''
+Stand EV for every player total 0-21 against each dealer outcome row.
+'''
+def _standRows(outcomes):
+    totals = np.arange(22)[:, None]
+    dealer = np.array(DEALER_TOTALS)[None, :]
+    sign = np.sign(totals - dealer) # Player total against each dealer total.
+    return outcomes[:, BUST][:, None] + outcomes[:, :BUST] @ sign.T
+
+
+def _trim():
+    if len(_standMemo) + len(_bestMemo) > CACHE_SIZE:
+        clearCache()
+
+
+'''
+Works out (in one batch) the stand values of every shoe in `shoes` that isn't memoized yet.
+'''
+def _prepare(shoes, upSlot):
+    missing = [shoe for shoe in shoes if (upSlot, shoe) not in _standMemo]
+    if missing:
+        for shoe, row in zip(missing, _standRows(dealerOutcomes(missing, upSlot)).tolist()):
+            _standMemo[(upSlot, shoe)] = row
+
+
+'''
+Adds every shoe the player can reach from this hand by hitting to `shoes`, and with `doubling` the
+shoes after any one card, which doubling needs even on 21.
+'''
+def _reach(hard, soft, counts, upSlot, shoes, seen, doubling=False):
+    if doubling:
+        shoes.update(without(counts, slot) for slot, count in enumerate(counts) if count)
+    key = (hard, soft, counts)
+    if key in seen:
+        return
+    seen.add(key)
+    shoes.add(counts)
+    if bestTotal(hard, soft) >= 21 or (hard, soft, upSlot, counts) in _bestMemo:
+        return
+    for slot, count in enumerate(counts):
+        if count and hard + VALUES[slot] <= 21:
+            _reach(hard + VALUES[slot], soft or slot == 0, without(counts, slot), upSlot, shoes, seen)
+
+
+def standEV(total, counts, upSlot):
+    return _standMemo[(upSlot, counts)][total] if total <= 21 else -1.0
+
+
+'''
+Best EV from here, standing or hitting.
+'''
+def bestEV(hard, soft, counts, upSlot):
+    key = (hard, soft, upSlot, counts)
+    ev = _bestMemo.get(key)
+    if ev is None:
+        ev = standEV(bestTotal(hard, soft), counts, upSlot)
+        if bestTotal(hard, soft) < 21:
+            ev = max(ev, hitEV(hard, soft, counts, upSlot))
+        _bestMemo[key] = ev
+    return ev
+
+
+'''
+EV of taking one card and then playing on as well as possible.
+'''
+def hitEV(hard, soft, counts, upSlot):
+    left = sum(counts)
+    ev = 0.0
+    for slot, count in enumerate(counts):
+        if count:
+            newHard = hard + VALUES[slot]
+            if newHard > 21:
+                ev -= count / left
+            else:
+                ev += count / left * bestEV(newHard, soft or slot == 0, without(counts, slot), upSlot)
+    return ev
+
+
+'''
+EV of doubling: twice the bet, exactly one more card, then standing.
+'''
+def doubleEV(hard, soft, counts, upSlot):
+    left = sum(counts)
+    ev = 0.0
+    for slot, count in enumerate(counts):
+        if count:
+            total = bestTotal(hard + VALUES[slot], soft or slot == 0)
+            ev += 2 * count / left * standEV(total, without(counts, slot), upSlot)
+    return ev
+
+
+'''
+EV of splitting a pair of `slot` cards: each hand gets one of them plus a drawn card and is played
+out as well as possible (doubling allowed, no resplits, split aces stand on their one card). Both
+hands are scored as if they saw the shoe as it is now, the usual approximation, since the second
+hand's cards depend on how the first was played.
+'''
+def splitEV(slot, counts, upSlot):
+    left = sum(counts)
+    ev = 0.0
+    for drawn, count in enumerate(counts):
+        if count:
+            hard = VALUES[slot] + VALUES[drawn]
+            soft = slot == 0 or drawn == 0
+            after = without(counts, drawn)
+            if slot == 0:
+                hand = standEV(bestTotal(hard, soft), after, upSlot)
+            else:
+                hand = max(bestEV(hard, soft, after, upSlot), doubleEV(hard, soft, after, upSlot))
+            ev += count / left * hand
+    return 2 * ev
+
+
+'''
+EV of every move open to the player: a dict with 'stand' and 'hit', plus 'double' and 'split' on
+the first two cards (split only for a pair). playerCodes and upCode are card codes, and counts the
+shoe the rest of the cards come from, the dealer's hole card included.
+'''
+def actionEVs(playerCodes, upCode, counts):
+    _trim()
+    counts = tuple(counts)
+    hard = sum(VALUES[slotOf(code)] for code in playerCodes)
+    soft = any(slotOf(code) == 0 for code in playerCodes)
+    if hard > 21:
+        return {'stand': -1.0}
+    upSlot = slotOf(upCode)
+    pair = len(playerCodes) == 2 and slotOf(playerCodes[0]) == slotOf(playerCodes[1])
+
+    shoes, seen = set(), set()
+    _reach(hard, soft, counts, upSlot, shoes, seen, len(playerCodes) == 2)
+    if bestTotal(hard, soft) == 21: # The game still lets a soft 21 hit.
+        for slot, count in enumerate(counts):
+            if count and hard + VALUES[slot] <= 21:
+                _reach(hard + VALUES[slot], soft, without(counts, slot), upSlot, shoes, seen)
+    if pair:
+        first = slotOf(playerCodes[0])
+        for drawn, count in enumerate(counts):
+            if count:
+                _reach(VALUES[first] + VALUES[drawn], first == 0 or drawn == 0, without(counts, drawn),
+                       upSlot, shoes, seen, True)
+    _prepare(shoes, upSlot)
+
+    evs = {'stand': standEV(bestTotal(hard, soft), counts, upSlot)}
+    evs['hit'] = hitEV(hard, soft, counts, upSlot)
+    if len(playerCodes) == 2:
+        evs['double'] = doubleEV(hard, soft, counts, upSlot)
+        if pair:
+            evs['split'] = splitEV(slotOf(playerCodes[0]), counts, upSlot)
+    return evs
+
+
+def bestAction(evs):
+    return max(evs, key=evs.get)
+
+
+'''
+Drops the memos, e.g. between shoes, to keep memory down.
+'''
+def clearCache():
+    _standMemo.clear()
+    _bestMemo.clear()
@@ -0,0 +1,71 @@
+'''
+Name: cardcodes.py
+
+Authors: Joshua Welicky, Gavin Billinger, Mark Kitchin, Bisshoy Bhattacharjee, Max Biundo
+
+Description: Compact integer encoding for playing cards.
+
+A playing card is one small int with two bit fields: code = (rankIndex << 2) | suitIndex. rankIndex
+is 0 for a 2 up to 12 for an ace, so codes run 0-51. A set of cards fits in one 52-bit mask
+(1 << code per card), and a hand's ranks fit in one 13-bit mask.
+
+Sabacc cards need none of this, their signed value is already an int (Sabacc_Card.rank).
+
+The strings ('jack', 'heart', ...) are only needed at the edges: image file names and display.
+'''
+
+SUITS = ['spade', 'club', 'diamond', 'heart']
+RANKS = [2, 3, 4, 5, 6, 7, 8, 9, 10, 'jack', 'queen', 'king', 'ace']
+
+SUIT_INDEX = {suit: i for i, suit in enumerate(SUITS)}
+RANK_INDEX = {rank: i for i, rank in enumerate(RANKS)}
+
+# Short names for showing cards to the player.
+RANK_LABELS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
+# One letter each, as poker hand histories and range notation write them (Ah, Td, 7c).
+RANK_LETTERS = "23456789TJQKA"
+SUIT_LETTERS = "scdh" # In SUITS order.
+
+# Blackjack worth of each rankIndex. Aces count 1 here, getBestSum decides if one can be 11.
+BLACKJACK_VALUES = [2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10, 1]
+ACE = 12
+
+
+def encode(suit, rank):
+    return (RANK_INDEX[rank] << 2) | SUIT_INDEX[suit]
+
+
+def rankOf(code):
+    return code >> 2
+
+
+def suitOf(code):
+    return code & 3
+
+
+# Rank as a number from 2 to 14 (ace high).
+def rankValue(code):
+    return (code >> 2) + 2
+
+
+# One bit per card, for card sets (dead cards, combos) that are checked for clashes.
+def cardMask(codes):
+    mask = 0
+    for code in codes:
+        mask |= 1 << code
+    return mask
+
+
+#=================== EDGE CONVERSIONS ===================#
+
+def pixmapName(code):
+    return f"{RANKS[code >> 2]}_of_{SUITS[code & 3]}.png"
+
+
+def label(code):
+    return f"{SUITS[code & 3]}: {RANK_LABELS[code >> 2]}"
+
+
+def shortLabel(code):
+    return RANK_LETTERS[code >> 2] + SUIT_LETTERS[code & 3]
+
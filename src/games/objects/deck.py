@@ -5,37 +5,16 @@ Authors: Joshua Welicky, Gavin Billinger, Mark Kitchin, Bisshoy Bhattacharjee, M
 
 Description: Implementation for Playing card and card deck.
 '''
-from PyQt6.QtWidgets import QGraphicsObject
-from PyQt6.QtCore import QPointF, QRectF, pyqtProperty
+from .cardcodes import SUITS, RANKS, encode
 import random
 
-# Implementation for an animated playing card.
-# Displays to PyQt GUIs.
-class AnimatedCard(QGraphicsObject):
-    def __init__(self, pixmap):
-        super().__init__()
-        self._pixmap = pixmap
-        self._pos = QPointF(0, 0)
-
-    def boundingRect(self):
-        return QRectF(0, 0, self._pixmap.width(), self._pixmap.height())
-
-    def paint(self, painter, option, widget=None):
-        painter.drawPixmap(0, 0, self._pixmap)
-
-    def getPos(self):
-        return super().pos()
-
-    def setPos(self, pos):
-        super().setPos(pos)
-
-    pos = pyqtProperty(QPointF, fget=getPos, fset=setPos)
-
 #Implementation for playing card, whic just has a suit and rank.
+#code is the compact int form (see cardcodes.py) that all the game logic runs on.
 class Card:
 	def __init__(self, suit, rank):
 		self.suit = suit
 		self.rank = rank
+		self.code = encode(suit, rank)
 
 	def __str__(self):
 		return self.suit + ': ' + str(self.rank)
@@ -58,10 +37,8 @@ Shuffling restores the initial state of the deck.
 class Deck:
 	def __init__(self):
 		self.deck = []
-		suits = ['spade', 'club', 'diamond', 'heart']
-		ranks = [2, 3, 4, 5, 6, 7, 8, 9, 10, 'jack', 'queen', 'king', 'ace']
-		for suit in suits:
-			for rank in ranks:
+		for suit in SUITS:
+			for rank in RANKS:
 				self.deck.append(Card(suit, rank))
 
 	def __getitem__(self, i):
@@ -77,15 +54,11 @@ class Deck:
 		return output
 
 	def draw(self):
-		card = random.choice(self.deck)
-		index = self.deck.index(card)
-		self.deck.pop(index)
-		return card
+		# Same pick as random.choice, without searching the list for the card afterwards.
+		return self.deck.pop(random.randrange(len(self.deck)))
 	
 	def shuffle(self):
 		self.deck = []
-		suits = ['spade', 'club', 'diamond', 'heart']
-		ranks = [2, 3, 4, 5, 6, 7, 8, 9, 10, 'jack', 'queen', 'king', 'ace']	
-		for suit in suits:
-			for rank in ranks:
+		for suit in SUITS:
+			for rank in RANKS:
 				self.deck.append(Card(suit, rank))
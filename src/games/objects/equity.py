@@ -0,0 +1,393 @@
+'''
+Name: equity.py
+
+Authors: Joshua Welicky, Gavin Billinger, Mark Kitchin, Bisshoy Bhattacharjee, Max Biundo
+
+Description: Texas Hold'em equity calculator. Given our hole cards, the board so far and how many
+opponents are still live, it works out how often we win, tie and lose.
+
+When only a few cards are unknown (turn, river, or heads-up against a known hand) every remaining
+deal is enumerated and the answer is exact. Exact answers are cached under a canonical form of the
+situation, so spots that only differ by a relabeling of suits share one cache entry.
+
+Otherwise it deals random runouts and scores them with the NumPy batch evaluator. That work is cut
+into jobs that each get their own seeded random stream, so a run with a given seed always gives the
+same answer. Jobs are spread over a process pool and the run stops early once the standard error of
+our equity is under the target.
+
+All cards here are card codes (Card.code).
+'''
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from collections import OrderedDict
+from itertools import combinations, permutations
+from math import comb
+
+import numpy as np
+
+from .batch_evaluator import strengthsBatch
+from .cardcodes import cardMask
+from .evaluator import evaluate, CATEGORY_SHIFT
+
+JOB_SIZE = 25000 # Samples per job handed to a worker.
+MIN_SAMPLES = 20000 # Never stop early before this many samples.
+TARGET_ERROR = 0.002 # Default standard error to stop at.
+EXACT_THRESHOLD = 100000 # Enumerate instead of sampling when there are at most this many deals.
+BUDGET_JOB_SIZE = 1000 # Samples per batch when working to a time budget.
+SECONDS_PER_EVAL = 2e-7 # Rough cost of scoring one hand in an enumeration, used to plan budgets.
+EXACT_CACHE_SIZE = 4096 # Exact answers kept, least recently used go first.
+
+_exactCache = OrderedDict() # Canonical situation to its exact Equity.
+# The GUI, HUD and pondering threads all share the cache, so every look at it holds this.
+_cacheLock = threading.Lock()
+
+_executor = None
+_executorWorkers = 0
+
+
+'''
+Result of an equity calculation. equity is our expected share of the pot: a win counts 1 and a tie
+counts our split of it.
+'''
+class Equity:
+    def __init__(self, win, tie, lose, equity, samples, stdError=0.0):
+        self.win = win
+        self.tie = tie
+        self.lose = lose
+        self.equity = equity
+        self.samples = samples
+        self.stdError = stdError
+
+    def __str__(self):
+        return (f"win {self.win:.1%}, tie {self.tie:.1%}, lose {self.lose:.1%} "
+                f"(equity {self.equity:.1%}, {self.samples} samples)")
+
+    def __repr__(self):
+        return str(self)
+
+
+'''
+Running totals for a batch of samples. Adding two of these merges them.
+'''
+class Tally:
+    def __init__(self, wins=0, ties=0, samples=0, share=0.0, shareSq=0.0):
+        self.wins = wins
+        self.ties = ties
+        self.samples = samples
+        self.share = share # Sum of our pot share over all samples.
+        self.shareSq = shareSq # Sum of squared shares, for the standard error.
+
+    def __add__(self, other):
+        return Tally(self.wins + other.wins, self.ties + other.ties, self.samples + other.samples,
+                     self.share + other.share, self.shareSq + other.shareSq)
+
+    def stdError(self):
+        if self.samples < 2:
+            return 1.0
+        mean = self.share / self.samples
+        variance = max(self.shareSq / self.samples - mean * mean, 0.0)
+        return (variance / (self.samples - 1)) ** 0.5
+
+    def result(self):
+        n = max(self.samples, 1)
+        win, tie = self.wins / n, self.ties / n
+        return Equity(win, tie, 1.0 - win - tie, self.share / n, self.samples, self.stdError())
+
+
+def remainingCards(dead):
+    deadMask = cardMask(dead)
+    return np.array([code for code in range(52) if not deadMask & (1 << code)], dtype=np.int8)
+
+
+'''
+Scores finished deals. hero is (N, 7) and opps is (opponents, N, 7). Returns a Tally.
+'''
+def tallyShowdowns(hero, opps):
+    heroStrength = strengthsBatch(hero)
+    best = np.zeros(len(hero), dtype=np.int32)
+    tied = np.zeros(len(hero), dtype=np.int32)
+    for opp in opps:
+        strength = strengthsBatch(opp)
+        tied = np.where(strength > best, 1, tied + (strength == best))
+        best = np.maximum(best, strength)
+    win = heroStrength > best
+    tie = heroStrength == best
+    share = np.where(win, 1.0, np.where(tie, 1.0 / (tied + 1), 0.0))
+    return Tally(int(win.sum()), int(tie.sum()), len(hero), float(share.sum()), float((share * share).sum()))
+
+
+'''
+Stacks the hole cards of known opponents, then the randomly dealt ones, onto each full board.
+'''
+def buildOpponents(oppHands, drawn, fullBoard):
+    opps = []
+    for hand in oppHands:
+        fixed = np.broadcast_to(np.array(hand, dtype=np.int8), (len(fullBoard), 2))
+        opps.append(np.concatenate((fixed, fullBoard), axis=1))
+    for i in range(0, drawn.shape[1], 2):
+        opps.append(np.concatenate((drawn[:, i:i + 2], fullBoard), axis=1))
+    return opps
+
+
+def completeBoards(board, runouts):
+    fullBoard = np.empty((len(runouts), 5), dtype=np.int8)
+    fullBoard[:, :len(board)] = board
+    fullBoard[:, len(board):] = runouts
+    return fullBoard
+
+
+'''
+One job: deals count random runouts and hands for the unknown opponents and tallies them. Runs in a
+worker process.
+'''
+def sampleRunouts(hole, board, opponents, count, seed, oppHands=()):
+    rng = np.random.default_rng(seed)
+    deck = remainingCards(list(hole) + list(board) + [code for hand in oppHands for code in hand])
+    missing = 5 - len(board)
+    needed = missing + 2 * (opponents - len(oppHands))
+
+    # Random keys per card, smallest `needed` of them is a draw without replacement.
+    drawn = np.empty((count, 0), dtype=np.int8)
+    if needed:
+        keys = rng.random((count, len(deck)), dtype=np.float32)
+        drawn = deck[np.argpartition(keys, needed - 1, axis=1)[:, :needed]]
+
+    fullBoard = completeBoards(board, drawn[:, :missing])
+    hero = np.concatenate((np.broadcast_to(np.array(hole, dtype=np.int8), (count, 2)), fullBoard), axis=1)
+    return tallyShowdowns(hero, buildOpponents(oppHands, drawn[:, missing:], fullBoard))
+
+
+def getExecutor(workers):
+    global _executor, _executorWorkers
+    if _executor is None or _executorWorkers != workers:
+        if _executor is not None:
+            _executor.shutdown(cancel_futures=True)
+        _executor = ProcessPoolExecutor(max_workers=workers)
+        _executorWorkers = workers
+    return _executor
+
+
+def shutdown():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(cancel_futures=True)
+        _executor = None
+
+
+'''
+Monte Carlo equity of hole against `opponents` random hands on the given (partial) board.
+
+samples caps the total work; the run stops sooner once the standard error falls under
+targetError. workers=1 keeps everything in this process, which is best for small runs. oppHands
+lists hole cards of opponents we know (they count toward opponents).
+'''
+def monteCarloEquity(hole, board, opponents, samples=100000, targetError=TARGET_ERROR, seed=None,
+                     workers=None, oppHands=()):
+    if opponents < 1:
+        return Equity(1.0, 0.0, 0.0, 1.0, 0)
+    hole, board, oppHands = list(hole), list(board), [tuple(hand) for hand in oppHands]
+    jobs = max(1, -(-samples // JOB_SIZE))
+    sizes = [JOB_SIZE] * (jobs - 1) + [samples - JOB_SIZE * (jobs - 1)]
+    seeds = np.random.SeedSequence(seed).spawn(jobs)
+    workers = workers or os.cpu_count() or 1
+
+    total = Tally()
+    if workers == 1 or jobs == 1:
+        for size, jobSeed in zip(sizes, seeds):
+            total = total + sampleRunouts(hole, board, opponents, size, jobSeed, oppHands)
+            if total.samples >= MIN_SAMPLES and total.stdError() <= targetError:
+                break
+        return total.result()
+
+    # Keep a couple of jobs per worker in flight and take results back in order, so the answer for
+    # a given seed does not depend on which worker finishes first.
+    executor = getExecutor(workers)
+    pending = []
+    nextJob = 0
+    while nextJob < jobs or pending:
+        while nextJob < jobs and len(pending) < 2 * workers:
+            pending.append(executor.submit(sampleRunouts, hole, board, opponents, sizes[nextJob],
+                                           seeds[nextJob], oppHands))
+            nextJob += 1
+        total = total + pending.pop(0).result()
+        if total.samples >= MIN_SAMPLES and total.stdError() <= targetError:
+            for future in pending:
+                future.cancel()
+            break
+    return total.result()
+
+
+#=================== EXACT ENUMERATION ===================#
+
+'''
+How many deals an exact answer has to look at: every runout, times every hand for each unknown
+opponent.
+'''
+def stateSpace(board, opponents, knownHands=0):
+    unknown = 52 - 2 - len(board) - 2 * knownHands
+    missing = 5 - len(board)
+    size = comb(unknown, missing)
+    unknown -= missing
+    for _ in range(opponents - knownHands):
+        size *= comb(unknown, 2)
+        unknown -= 2
+    return size
+
+
+'''
+Every way to deal the missing board cards plus two cards to each unknown opponent, as indices into
+the remaining deck. Rows that would use a card twice are dropped using card bitmasks.
+'''
+def enumerateDeals(deckSize, missing, unknownOpps):
+    runouts = list(combinations(range(deckSize), missing))
+    deals = np.array(runouts, dtype=np.int8).reshape(len(runouts), missing)
+    masks = (np.int64(1) << deals.astype(np.int64)).sum(axis=1)
+    pairs = np.array(list(combinations(range(deckSize), 2)), dtype=np.int8)
+    pairMasks = (np.int64(1) << pairs.astype(np.int64)).sum(axis=1)
+    for _ in range(unknownOpps):
+        rows, cols = np.nonzero((masks[:, None] & pairMasks[None, :]) == 0)
+        deals = np.concatenate((deals[rows], pairs[cols]), axis=1)
+        masks = masks[rows] | pairMasks[cols]
+    return deals
+
+
+def _exactEquity(hole, board, opponents, oppHands):
+    deck = remainingCards(list(hole) + list(board) + [code for hand in oppHands for code in hand])
+    missing = 5 - len(board)
+    drawn = deck[enumerateDeals(len(deck), missing, opponents - len(oppHands))]
+    fullBoard = completeBoards(board, drawn[:, :missing])
+    hero = np.concatenate((np.broadcast_to(np.array(hole, dtype=np.int8), (len(drawn), 2)), fullBoard), axis=1)
+    return tallyShowdowns(hero, buildOpponents(oppHands, drawn[:, missing:], fullBoard)).result()
+
+
+def _exactCached(hole, board, opponents, oppHands):
+    key = (hole, board, opponents, oppHands)
+    with _cacheLock:
+        result = _exactCache.get(key)
+        if result is not None:
+            _exactCache.move_to_end(key)
+            return result
+    # Enumerate without the lock. Two threads may both work out the same spot, the answers match.
+    result = _exactEquity(hole, board, opponents, oppHands)
+    with _cacheLock:
+        _exactCache[key] = result
+        _exactCache.move_to_end(key)
+        if len(_exactCache) > EXACT_CACHE_SIZE:
+            _exactCache.popitem(last=False)
+    return result
+
+
+'''
+Rewrites a situation with its suits relabeled so every suit-isomorphic version of it comes out the
+same. Out of all 24 relabelings we keep the smallest, with cards sorted inside each group (the order
+of board cards and of known opponents does not change the answer).
+'''
+def canonicalize(hole, board, oppHands=()):
+    best = None
+    for suits in permutations(range(4)):
+        def relabel(codes):
+            return tuple(sorted((code & ~3) | suits[code & 3] for code in codes))
+        key = (relabel(hole), relabel(board), tuple(sorted(relabel(hand) for hand in oppHands)))
+        if best is None or key < best:
+            best = key
+    return best
+
+
+'''
+Exact equity by enumerating every remaining deal. Results are cached by canonical situation.
+'''
+def exactEquity(hole, board, opponents, oppHands=()):
+    if opponents < 1:
+        return Equity(1.0, 0.0, 0.0, 1.0, 0)
+    hole, board, oppHands = canonicalize(hole, board, oppHands)
+    return _exactCached(hole, board, opponents, oppHands)
+
+
+'''
+The exact answer if it's already cached, otherwise None. Never enumerates.
+'''
+def cachedEquity(hole, board, opponents, oppHands=()):
+    hole, board, oppHands = canonicalize(hole, board, oppHands)
+    key = (hole, board, opponents, oppHands)
+    with _cacheLock: # Pondering workers ask from their own threads (see pondering.py).
+        result = _exactCache.get(key)
+        if result is not None:
+            _exactCache.move_to_end(key)
+    return result
+
+
+'''
+Picks the cheaper way to answer: exact enumeration when the state space is at most threshold deals,
+Monte Carlo sampling otherwise. oppHands lists hole cards of opponents we know (they count toward
+opponents).
+'''
+def calculateEquity(hole, board, opponents, oppHands=(), threshold=EXACT_THRESHOLD, samples=100000,
+                    targetError=TARGET_ERROR, seed=None, workers=None):
+    if stateSpace(board, opponents, len(oppHands)) <= threshold:
+        return exactEquity(hole, board, opponents, oppHands)
+    return monteCarloEquity(hole, board, opponents, samples, targetError, seed, workers, oppHands)
+
+
+def clearCache():
+    with _cacheLock:
+        _exactCache.clear()
+
+
+#=================== TIME BUDGETED ===================#
+
+'''
+Best answer that fits in budgetMs milliseconds, for live decisions. Exact enumeration when it is
+already cached or cheap enough, otherwise small sampled batches until the time runs out (or the
+standard error is good enough). At least one batch is always run.
+
+samples, if given, stands in for the clock: batches are dealt until there are that many, however
+long it takes, so the answer is the same on a busy machine as on an idle one. budgetMs still decides
+whether to enumerate.
+'''
+def budgetedEquity(hole, board, opponents, budgetMs, seed=None, oppHands=(), targetError=TARGET_ERROR,
+                   samples=None):
+    if opponents < 1:
+        return Equity(1.0, 0.0, 0.0, 1.0, 0)
+    start = time.perf_counter()
+    deadline = start + budgetMs / 1000
+    cached = cachedEquity(hole, board, opponents, oppHands)
+    if cached is not None:
+        return cached
+    space = stateSpace(board, opponents, len(oppHands))
+    if space * (opponents + 1) * SECONDS_PER_EVAL <= budgetMs / 1000:
+        return exactEquity(hole, board, opponents, oppHands)
+
+    hole, board, oppHands = list(hole), list(board), [tuple(hand) for hand in oppHands]
+    seeds = np.random.SeedSequence(seed)
+    total = Tally()
+    while True:
+        total = total + sampleRunouts(hole, board, opponents, BUDGET_JOB_SIZE, seeds.spawn(1)[0], oppHands)
+        done = total.samples >= samples if samples is not None else time.perf_counter() >= deadline
+        if done:
+            break
+        if total.samples >= MIN_SAMPLES and total.stdError() <= targetError:
+            break
+    return total.result()
+
+
+#=================== OUTS ===================#
+
+'''
+Unseen cards that would lift our hand to a better category on the next card, not counting ones
+that only improve the board (a board pair helps everyone). Only means something on the flop and
+turn, anything else gives 0.
+'''
+def countOuts(hole, board):
+    if not 3 <= len(board) <= 4:
+        return 0
+    cards = list(hole) + list(board)
+    current = evaluate(cards) >> CATEGORY_SHIFT
+    outs = 0
+    for code in remainingCards(cards):
+        code = int(code)
+        improved = evaluate(cards + [code]) >> CATEGORY_SHIFT
+        if improved > current and improved > evaluate(list(board) + [code]) >> CATEGORY_SHIFT:
+            outs += 1
+    return outs
@@ -0,0 +1,240 @@
+'''
+Name: evaluator.py
+
+Authors: Joshua Welicky, Gavin Billinger, Mark Kitchin, Bisshoy Bhattacharjee, Max Biundo
+
+Description: Lookup-table poker hand evaluator. Every hand (up to 7 cards) is scored in a few table
+lookups instead of looking at every 5-card combination.
+
+A hand strength is a single integer: the hand category (index into HAND_RANKS) sits in the high bits
+and the five deciding card ranks sit below it, most important first, one 4-bit field each. Bigger is
+always better, so hands can be compared with plain integer comparison.
+
+Cards are handled as the compact codes from cardcodes.py (Card.code).
+'''
+from itertools import combinations_with_replacement, groupby
+
+# Bank of poker hands, weakest to strongest. A strength's category indexes into this list.
+HAND_RANKS = [
+    "High Card", "Pair", "Two Pair", "Three of a Kind", "Straight",
+    "Flush", "Full House", "Four of a Kind", "Straight Flush", "Royal Flush"
+]
+
+HIGH_CARD = 0
+PAIR = 1
+TWO_PAIR = 2
+THREE_OF_A_KIND = 3
+STRAIGHT = 4
+FLUSH = 5
+FULL_HOUSE = 6
+FOUR_OF_A_KIND = 7
+STRAIGHT_FLUSH = 8
+ROYAL_FLUSH = 9
+
+CATEGORY_SHIFT = 20
+
+#=================== TABLE CONSTRUCTION ===================#
+
+# Straights as 13-bit rank masks, best first. The last one is the ace-low wheel.
+_STRAIGHTS = [(0x1F << low, low + 6) for low in range(8, -1, -1)] + [(0x100F, 5)]
+
+
+def _packRanks(category, ranks):
+    strength = category
+    for rank in ranks:
+        strength = (strength << 4) | rank
+    # Short hands (fewer than five cards) still line up with full ones.
+    return strength << (4 * (5 - len(ranks)))
+
+
+def _straightHigh(mask):
+    for straight, high in _STRAIGHTS:
+        if mask & straight == straight:
+            return high
+    return 0
+
+
+def _straightRanks(high):
+    if high == 5:
+        return [5, 4, 3, 2, 1] # Note Ace as low (1) value.
+    return [high, high - 1, high - 2, high - 3, high - 4]
+
+
+'''
+Best 5-card strength for a multiset of ranks, ignoring suits. ranks holds rankIndex values (0-12),
+highest first.
+'''
+def _rankStrength(ranks):
+    # Ranks (2-14) grouped by how often they show up, highest first.
+    groups = ([], [], [], [], [])
+    mask = 0
+    for rank, run in groupby(ranks):
+        groups[len(list(run))].append(rank + 2)
+        mask |= 1 << rank
+    singles, pairs, trips, quads = groups[1], groups[2], groups[3], groups[4]
+
+    if quads:
+        kicker = sorted(quads[1:] + trips + pairs + singles, reverse=True)[:1]
+        return _packRanks(FOUR_OF_A_KIND, [quads[0]] * 4 + kicker)
+    if trips and (len(trips) > 1 or pairs):
+        pair = max(trips[1:] + pairs)
+        return _packRanks(FULL_HOUSE, [trips[0]] * 3 + [pair] * 2)
+    high = STRAIGHT_HIGHS[mask]
+    if high:
+        return _packRanks(STRAIGHT, _straightRanks(high))
+    if trips:
+        kickers = sorted(pairs + singles, reverse=True)[:2]
+        return _packRanks(THREE_OF_A_KIND, [trips[0]] * 3 + kickers)
+    if len(pairs) >= 2:
+        kicker = sorted(pairs[2:] + singles, reverse=True)[:1]
+        return _packRanks(TWO_PAIR, [pairs[0]] * 2 + [pairs[1]] * 2 + kicker)
+    if pairs:
+        return _packRanks(PAIR, [pairs[0]] * 2 + singles[:3])
+    return _packRanks(HIGH_CARD, singles[:5])
+
+
+'''
+Best strength for the ranks of a single suit holding five or more cards.
+'''
+def _flushStrength(mask):
+    high = STRAIGHT_HIGHS[mask]
+    if high == 14:
+        return _packRanks(ROYAL_FLUSH, _straightRanks(high))
+    if high:
+        return _packRanks(STRAIGHT_FLUSH, _straightRanks(high))
+    ranks = [i + 2 for i in range(12, -1, -1) if mask & (1 << i)]
+    return _packRanks(FLUSH, ranks[:5])
+
+
+def _buildRankTable():
+    table = {}
+    # Every rank multiset of up to 7 cards, keyed by the sum of 5^rankIndex over its cards.
+    for size in range(6):
+        for ranks in combinations_with_replacement(range(12, -1, -1), size):
+            if size == 5 and ranks[0] == ranks[4]:
+                continue # Only four cards of each rank exist.
+            table[sum(POWERS[rank] for rank in ranks)] = _rankStrength(ranks)
+    # Six and seven card hands are just the best hand left after dropping one card.
+    for size in (6, 7):
+        for ranks in combinations_with_replacement(range(13), size):
+            if any(ranks[i] == ranks[i + 4] for i in range(size - 4)):
+                continue
+            key = 0
+            for rank in ranks:
+                key += POWERS[rank]
+            table[key] = max(table[key - POWERS[rank]] for rank in set(ranks))
+    return table
+
+
+def _buildFlushTable():
+    table = [0] * (1 << 13)
+    for mask in range(1 << 13):
+        if bin(mask).count('1') >= 5:
+            table[mask] = _flushStrength(mask)
+    return table
+
+
+def _buildFlushSuits():
+    # Suit counts are packed 3 bits per suit; map every packing to the suit holding 5+ cards.
+    table = [-1] * (1 << 12)
+    for packed in range(1 << 12):
+        for suit in range(4):
+            if (packed >> (3 * suit)) & 7 >= 5:
+                table[packed] = suit
+    return table
+
+
+# A card's key adds 5^rankIndex (rank multiset, above bit 12) and a 1 in its suit's 3-bit counter.
+POWERS = [5 ** rank for rank in range(13)]
+CARD_KEYS = [(POWERS[code >> 2] << 12) | (1 << 3 * (code & 3)) for code in range(52)]
+RANK_BITS = [1 << (code >> 2) for code in range(52)]
+
+STRAIGHT_HIGHS = [_straightHigh(mask) for mask in range(1 << 13)]
+RANK_TABLE = _buildRankTable()
+FLUSH_TABLE = _buildFlushTable()
+FLUSH_SUITS = _buildFlushSuits()
+
+
+#=================== EVALUATION ===================#
+
+'''
+Scores a hand given as card codes (any length up to 7). Returns one comparable integer.
+'''
+def evaluate(codes):
+    key = 0
+    for code in codes:
+        key += CARD_KEYS[code]
+    suit = FLUSH_SUITS[key & 0xFFF]
+    strength = RANK_TABLE[key >> 12]
+    if suit < 0:
+        return strength
+    # A flush was found, but a full house or quads made with the other cards can still beat it.
+    mask = 0
+    for code in codes:
+        if code & 3 == suit:
+            mask |= RANK_BITS[code]
+    flush = FLUSH_TABLE[mask]
+    return flush if flush > strength else strength
+
+
+def category(strength):
+    return strength >> CATEGORY_SHIFT
+
+
+def handName(strength):
+    return HAND_RANKS[strength >> CATEGORY_SHIFT]
+
+
+'''
+Scores everyone at a showdown in one pass. `holes` has each player's hole card codes, or None for a
+player who folded, and `board` the shared board codes. Returns (strengths, winners): a strength for
+every player (-1 if folded) and the indices of all players tied for the best hand, so a pot can be
+split between them.
+'''
+def showdown(holes, board):
+    strengths = []
+    winners = []
+    best = -1
+    for i, hole in enumerate(holes):
+        if hole is None:
+            strengths.append(-1)
+            continue
+        strength = evaluate(list(hole) + list(board))
+        strengths.append(strength)
+        if strength > best:
+            best = strength
+            winners = [i]
+        elif strength == best:
+            winners.append(i)
+    return strengths, winners
+
+
+'''
+The five deciding ranks (2-14) of a strength, most important first. Short hands give fewer ranks.
+'''
+def strengthRanks(strength):
+    ranks = []
+    for shift in range(16, -1, -4):
+        rank = (strength >> shift) & 0xF
+        if rank:
+            ranks.append(14 if rank == 1 else rank)
+    return ranks
+
+
+'''
+Picks the actual cards that make up a strength out of the pool they were scored from.
+'''
+def bestCards(cards, codes, strength):
+    cat = strength >> CATEGORY_SHIFT
+    flushSuit = -1
+    if cat in (FLUSH, STRAIGHT_FLUSH, ROYAL_FLUSH):
+        flushSuit = FLUSH_SUITS[sum(CARD_KEYS[code] for code in codes) & 0xFFF]
+    remaining = list(zip(cards, codes))
+    best = []
+    for rank in strengthRanks(strength):
+        for i, (card, code) in enumerate(remaining):
+            if (code >> 2) + 2 == rank and (flushSuit < 0 or code & 3 == flushSuit):
+                best.append(card)
+                remaining.pop(i)
+                break
+    return tuple(best)
@@ -1,13 +1,15 @@
-from .deck import Deck
 from itertools import combinations
 from collections import Counter
+from . import evaluator, cardcodes
 
 class Hand:
     def __init__(self):
         self.hand = []
+        self.codes = [] # Card codes, kept in step with self.hand.
 
     def add(self, card):
         self.hand.append(card)
+        self.codes.append(card.code)
 
     def __str__(self):
         output = ''
@@ -22,32 +24,45 @@ class Hand:
                 return False
         return True
 
+    # Single comparable integer for the best hand this hand makes with the board. Higher is better.
+    def getStrength(self, board):
+        return evaluator.evaluate(self.codes + [card.code for card in board])
+
     def getBestHand(self, board):
         pool = self.hand + board
-        for card in pool:
-            if card.rank == 'jack':
-                card.rank = 11
-            elif card.rank == 'queen':
-                card.rank = 12
-            elif card.rank == 'king':
-                card.rank = 13
-            elif card.rank == 'ace':
-                card.rank = 14
+        codes = self.codes + [card.code for card in board]
+        # The evaluator scores all 7 cards at once with a few table lookups.
+        strength = evaluator.evaluate(codes)
+        # Then we just pick out which 5 cards made that hand.
+        return evaluator.handName(strength), evaluator.bestCards(pool, codes, strength)
+
+    '''
+    The original 21-combination search. It is much slower than getBestHand, but it is kept around as
+    an independent reference to check the lookup tables against.
+    '''
+    def getBestHandReference(self, board):
+        pool = self.hand + board
         # This lovely little function gets every combination of 5 cards from the possible 7 that are given.
         combos = combinations(pool, 5)
         bestRank = 0 # This will keep track of the hand rank (not card rank)
         bestCombo = None # This will specifically hold that best card combo.
+        bestValues = None
+
+        # Bank of poker hands.
+        handRanks = evaluator.HAND_RANKS
 
         # We will look through every five card hand and get properties to determine if its the best hand.
         for combo in combos:
+            values = [cardcodes.rankValue(card.code) for card in combo]
             if bestCombo == None:
                 bestCombo = combo
+                bestValues = values
             # Determine if hand has flush.
-            suits = [card.suit for card in combo]
+            suits = [cardcodes.suitOf(card.code) for card in combo]
             isFlush = len(set(suits)) == 1 # If all suits are the same, duplicates should be removed and 1 suit should remain.
             
             # Get sorted list of card ranks
-            ranks = sorted([card.rank for card in combo], reverse=True)
+            ranks = sorted(values, reverse=True)
             
             # While we're at it, count occurrence of ranks in full list.
             rankCounts = Counter(ranks)
@@ -88,19 +103,15 @@ class Hand:
             else:
                 handRank = 'High Card'
 
-            # Bank of poker hands.
-            handRanks = [
-                "High Card", "Pair", "Two Pair", "Three of a Kind", "Straight",
-                 "Flush", "Full House", "Four of a Kind", "Straight Flush", "Royal Flush"
-            ]
-
             # Compare poker hands by higher index.
             if handRanks.index(handRank) > bestRank:
                 bestRank = handRanks.index(handRank)
                 bestCombo = combo
+                bestValues = values
             elif handRanks.index(handRank) == bestRank: # In tie breaker case, we go by highest value card.
-                if sorted([card.rank for card in combo], reverse=True) > sorted([card.rank for card in bestCombo], reverse=True):
+                if sorted(values, reverse=True) > sorted(bestValues, reverse=True):
                     bestCombo = combo
+                    bestValues = values
 
         # Once we've checked every 5-card combination for best hand, return them!
         return handRanks[bestRank], bestCombo
@@ -0,0 +1,258 @@
+'''
+Name: hand_history.py
+
+Authors: Joshua Welicky, Gavin Billinger, Mark Kitchin, Bisshoy Bhattacharjee, Max Biundo
+
+Description: Hand histories for poker. Poker tells a HandRecorder what happens as it happens (seats,
+hole cards, board cards, every action, the payout), and the recorder keeps it as a list of small
+tuples. That's all the game loop pays for. At the end of the hand the list goes on a queue.
+
+A HandHistoryWriter thread takes hands off the queue, turns them into the usual text format:
+
+Hand #20261018192000-12: Hold'em (50 ante) - 2026/10/18 19:20:00
+Seat 1: Player (1000 in chips)
+Seat 2: King Hippo (1250 in chips)
+Player: posts the ante 50
+*** HOLE CARDS ***
+Dealt to Player [Jh Kd]
+*** FLOP *** [2c 7d Js]
+Player: bets to 100
+...
+*** SUMMARY ***
+Total pot 400
+Board [2c 7d Js 9h 3s]
+Seat 1: Player showed [Jh Kd] and won (400) with Pair
+
+Everyone who gets chips back at the showdown is a winner, side pots included. Here King Hippo took
+the main pot all in and the player the side pot:
+
+*** SHOW DOWN ***
+Player: shows [Jh Kd] (Pair)
+King Hippo: shows [7c 7h] (Three of a Kind)
+Glass Joe: shows [Qs Jd] (loses)
+*** SUMMARY ***
+Total pot 1100
+Board [2c 7d Js 9h 3s]
+Seat 1: Player showed [Jh Kd] and won (200) with Pair
+Seat 2: King Hippo showed [7c 7h] and won (900) with Three of a Kind
+Seat 3: Glass Joe showed [Qs Jd] and lost
+
+It then writes them through a zlib compressor (gzip framing, so zcat and gzip -d read the files) into
+hands.txt.gz in the history folder. Past a size limit the file is finished off and rotated to
+hands.1.txt.gz, hands.2.txt.gz and so on, dropping the oldest. The compressor is sync-flushed every
+so often, so even a file cut off by a crash reads back up to the last flush.
+
+Every hole card dealt is written, not just the player's, so the hands can be studied afterwards.
+'''
+import atexit
+import os
+import queue
+import threading
+import time
+import zlib
+
+from .cardcodes import shortLabel
+
+HISTORY_DIR = os.path.join(os.path.expanduser("~"), ".casino_poker_history")
+FILE_NAME = "hands"
+EXTENSION = ".txt.gz"
+MAX_BYTES = 4 << 20 # Rotate a file once it holds this much compressed.
+BACKUPS = 5 # Rotated files kept.
+FLUSH_SECONDS = 2.0 # Longest a finished hand waits before it's flushed to disk.
+ANTE = 50
+
+# What each action reads as. The ones ending in "to" or "for" are followed by the amount.
+ACTION_TEXT = {
+    'check': "checks",
+    'fold': "folds",
+    'call': "calls",
+    'bet': "bets to",
+    'raise': "raises to",
+    'allin': "goes all in for",
+}
+STREETS = {3: "FLOP", 4: "TURN", 5: "RIVER"}
+
+
+def cardList(codes):
+    return "[" + " ".join(shortLabel(code) for code in codes) + "]"
+
+
+'''
+Collects one hand at a time for a writer. The methods only append tuples, so they can sit in the
+middle of the game loop.
+'''
+class HandRecorder:
+    def __init__(self, writer, game="Hold'em"):
+        self.writer = writer
+        self.game = game
+        self.events = None
+
+    '''
+    seats is a list of (seat index, name, chips at the start or None, hole card codes) for everyone
+    dealt in.
+    '''
+    def startHand(self, seats):
+        self.events = [('start', time.time(), self.game, tuple(seats))]
+
+    def board(self, codes):
+        if self.events is not None:
+            self.events.append(('board', tuple(codes)))
+
+    def action(self, index, action, amount):
+        if self.events is not None:
+            self.events.append(('action', index, action, amount))
+
+    '''
+    Ends the hand and queues it for writing. payouts is what each seat index got back, winners the
+    seat indices with the best hand, handName that hand, and showdown whether hands were shown.
+    handNames, if given, is the hand each seat index showed (None for anyone who folded), so side pot
+    winners are written with their own hand.
+    '''
+    def finish(self, pot, payouts, winners, handName, showdown, handNames=None):
+        if self.events is None:
+            return
+        self.events.append(('end', pot, tuple(payouts), tuple(winners), handName, showdown,
+                            tuple(handNames) if handNames else None))
+        self.writer.write(self.events)
+        self.events = None
+
+
+'''
+Turns one recorded hand into history text.
+'''
+def formatHand(handId, events):
+    kind, started, game, seats = events[0]
+    names = {index: name for index, name, chips, hole in seats}
+    stamp = time.strftime("%Y/%m/%d %H:%M:%S", time.localtime(started))
+    lines = [f"Hand #{handId}: {game} ({ANTE} ante) - {stamp}"]
+    for index, name, chips, hole in seats:
+        lines.append(f"Seat {index + 1}: {name}" + (f" ({chips} in chips)" if chips is not None else ""))
+    for index, name, chips, hole in seats:
+        lines.append(f"{name}: posts the ante {ANTE}")
+    lines.append("*** HOLE CARDS ***")
+    for index, name, chips, hole in seats:
+        lines.append(f"Dealt to {name} {cardList(hole)}")
+
+    board = ()
+    folded = set()
+    for event in events[1:]:
+        if event[0] == 'board':
+            previous, board = board, event[1]
+            street = STREETS.get(len(board), "BOARD")
+            if previous:
+                lines.append(f"*** {street} *** {cardList(previous)} {cardList(board[len(previous):])}")
+            else:
+                lines.append(f"*** {street} *** {cardList(board)}")
+        elif event[0] == 'action':
+            kind, index, action, amount = event
+            text = ACTION_TEXT.get(action, action)
+            if action == 'fold':
+                folded.add(index)
+            lines.append(f"{names[index]}: {text} {amount}" if text.endswith(("to", "for")) else f"{names[index]}: {text}")
+        elif event[0] == 'end':
+            kind, pot, payouts, winners, handName, showdown, handNames = event
+            # Whoever got chips back won something, the main pot or a side pot.
+            shown = {index: handNames[index] if handNames else handName for index in range(len(payouts))}
+            if showdown:
+                lines.append("*** SHOW DOWN ***")
+                for index, name, chips, hole in seats:
+                    if index not in folded:
+                        lines.append(f"{name}: shows {cardList(hole)} ({shown[index] if payouts[index] > 0 else 'loses'})")
+            lines.append("*** SUMMARY ***")
+            lines.append(f"Total pot {pot}")
+            if board:
+                lines.append(f"Board {cardList(board)}")
+            for index, name, chips, hole in seats:
+                won = payouts[index]
+                if index in folded:
+                    lines.append(f"Seat {index + 1}: {name} folded")
+                elif showdown:
+                    result = f"won ({won}) with {shown[index]}" if won > 0 else "lost"
+                    lines.append(f"Seat {index + 1}: {name} showed {cardList(hole)} and {result}")
+                else:
+                    lines.append(f"Seat {index + 1}: {name} collected ({won})")
+    return "\n".join(lines) + "\n\n"
+
+
+'''
+Background writer for finished hands. write() only puts the hand on a queue; formatting,
+compressing and file handling all happen on the writer's own thread.
+'''
+class HandHistoryWriter:
+    def __init__(self, directory=HISTORY_DIR, maxBytes=MAX_BYTES, backups=BACKUPS, flushSeconds=FLUSH_SECONDS):
+        self.directory = directory
+        self.maxBytes = maxBytes
+        self.backups = backups
+        self.flushSeconds = flushSeconds
+        self.hands = 0 # Hands written so far, for numbering.
+        self.session = time.strftime("%Y%m%d%H%M%S") # Keeps hand numbers unique across runs.
+        self.queue = queue.SimpleQueue()
+        self.thread = threading.Thread(target=self.run, name="hand-history", daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def path(self, index=0):
+        suffix = f".{index}" if index else ""
+        return os.path.join(self.directory, FILE_NAME + suffix + EXTENSION)
+
+    def write(self, events):
+        self.queue.put(events)
+
+    '''
+    Writes out everything queued and stops the thread. Safe to call more than once.
+    '''
+    def close(self):
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+
+    '''
+    Renames hands.txt.gz to hands.1.txt.gz and so on down the line, dropping the oldest.
+    '''
+    def rotate(self):
+        for index in range(self.backups, 0, -1):
+            source = self.path(index - 1)
+            if os.path.exists(source):
+                os.replace(source, self.path(index))
+
+    def openFile(self):
+        os.makedirs(self.directory, exist_ok=True)
+        if os.path.exists(self.path()) and os.path.getsize(self.path()) >= self.maxBytes:
+            self.rotate()
+        # Appending makes a new gzip member, which readers just run on into.
+        return open(self.path(), 'ab'), zlib.compressobj(6, zlib.DEFLATED, 31)
+
+    def run(self):
+        try:
+            f, compressor = self.openFile()
+        except OSError:
+            # Nowhere to write, so just keep the queue drained.
+            while self.queue.get() is not None:
+                pass
+            return
+        size = f.tell()
+        lastFlush = time.monotonic()
+        pending = False # Hands compressed but not flushed to the file yet.
+        while True:
+            try:
+                events = self.queue.get(timeout=self.flushSeconds if pending else None)
+            except queue.Empty:
+                events = () # Quiet for a while, a good time to flush.
+            if events is None:
+                break
+            if events:
+                self.hands += 1
+                size += f.write(compressor.compress(formatHand(f"{self.session}-{self.hands}", events).encode()))
+                pending = True
+            if pending and (not events or time.monotonic() - lastFlush >= self.flushSeconds):
+                size += f.write(compressor.flush(zlib.Z_SYNC_FLUSH))
+                f.flush()
+                lastFlush, pending = time.monotonic(), False
+            if size >= self.maxBytes:
+                f.write(compressor.flush(zlib.Z_FINISH))
+                f.close()
+                self.rotate()
+                f, compressor = self.openFile()
+                size = 0
+        f.write(compressor.flush(zlib.Z_FINISH))
+        f.close()
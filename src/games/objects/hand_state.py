@@ -0,0 +1,71 @@
+'''
+Name: hand_state.py
+
+Authors: Joshua Welicky, Gavin Billinger, Mark Kitchin, Bisshoy Bhattacharjee, Max Biundo
+
+Description: Incremental hand evaluation. A HandState holds one player's hole cards plus the board
+dealt so far and is updated one card at a time as the flop, turn and river come out. Every add keeps
+the rank counts, suit counts and straight masks current and re-scores the hand with a couple of
+table lookups, so the current best hand is always ready without looking at the whole pool again.
+'''
+from . import evaluator
+
+
+class HandState:
+    def __init__(self, codes=()):
+        self.codes = [] # Every card seen so far, hole cards first.
+        self.key = 0 # Running sum of evaluator.CARD_KEYS, the lookup key for the whole pool.
+        self.rankCounts = [0] * 13 # How many of each rank we hold.
+        self.suitCounts = [0, 0, 0, 0]
+        self.rankMask = 0 # One bit per rank held, for straights.
+        self.suitMasks = [0, 0, 0, 0] # Rank bits held in each suit, for flushes and straight flushes.
+        self.strength = 0 # Best hand so far as a comparable integer.
+        for code in codes:
+            self.add(code)
+
+    def __len__(self):
+        return len(self.codes)
+
+    '''
+    Adds one card (a card code) and re-scores the hand.
+    '''
+    def add(self, code):
+        rank, suit = code >> 2, code & 3
+        self.codes.append(code)
+        self.key += evaluator.CARD_KEYS[code]
+        self.rankCounts[rank] += 1
+        self.suitCounts[suit] += 1
+        self.rankMask |= 1 << rank
+        self.suitMasks[suit] |= 1 << rank
+
+        strength = evaluator.RANK_TABLE[self.key >> 12]
+        flushSuit = evaluator.FLUSH_SUITS[self.key & 0xFFF]
+        if flushSuit >= 0:
+            # A full house or quads can still beat the flush, so keep the better of the two.
+            flush = evaluator.FLUSH_TABLE[self.suitMasks[flushSuit]]
+            if flush > strength:
+                strength = flush
+        self.strength = strength
+
+    '''
+    Highest card (2-14) of the best straight the ranks make, 0 if there is none.
+    '''
+    def straightHigh(self):
+        return evaluator.STRAIGHT_HIGHS[self.rankMask]
+
+    def category(self):
+        return self.strength >> evaluator.CATEGORY_SHIFT
+
+    def handName(self):
+        return evaluator.handName(self.strength)
+
+    def copy(self):
+        state = HandState()
+        state.codes = list(self.codes)
+        state.key = self.key
+        state.rankCounts = list(self.rankCounts)
+        state.suitCounts = list(self.suitCounts)
+        state.rankMask = self.rankMask
+        state.suitMasks = list(self.suitMasks)
+        state.strength = self.strength
+        return state
@@ -0,0 +1,164 @@
+'''
+Name: omaha_evaluator.py
+
+Authors: Joshua Welicky, Gavin Billinger, Mark Kitchin, Bisshoy Bhattacharjee, Max Biundo
+
+Description: Hand evaluation for Omaha, where a hand is exactly two of the four hole cards plus
+exactly three board cards. Scored one five-card hand at a time that is 6 pairs x 10 triples = 60
+evaluations per player.
+
+The evaluator's keys are additive, so a five-card key is just a pair key plus a triple key. Here the
+keys of the hole pairs and board triples are summed once, and every hand is then one add and one
+rank table lookup. The board triples are the same for every player, so they are worked out once per
+showdown and shared. A flush needs all five cards in one suit, so only a suited pair against a triple
+of the same suit can make one, and only those few hands look at the flush table.
+'''
+from functools import lru_cache
+from itertools import combinations
+
+import numpy as np
+
+from . import evaluator
+from .batch_evaluator import omahaStrengthsBatch
+from .equity import Tally, remainingCards, completeBoards
+
+HOLE_CARDS = 4
+BOARD_CARDS = 3 # Board cards every hand uses.
+
+
+'''
+Partial results for the hole pairs: (rank keys, suited pairs). The rank keys are the distinct pair
+keys with the suit counters shifted off, and the suited pairs are (suit, rank bits) for every pair
+that could start a flush.
+'''
+def holeParts(hole):
+    keys = set()
+    suited = []
+    for first, second in combinations(hole, 2):
+        keys.add((evaluator.CARD_KEYS[first] + evaluator.CARD_KEYS[second]) >> 12)
+        if first & 3 == second & 3:
+            suited.append((first & 3, evaluator.RANK_BITS[first] | evaluator.RANK_BITS[second]))
+    return tuple(keys), suited
+
+
+'''
+Partial results for the board triples: (rank keys, one-suit triples), the rank keys as in holeParts
+and the one-suit triples a dict of suit to the rank bits of every triple in that suit. A board that
+is still short of three cards counts as a single partial triple, so hands can be scored from the deal.
+'''
+def boardParts(board):
+    if len(board) < BOARD_CARDS:
+        return (sum(evaluator.CARD_KEYS[code] for code in board) >> 12,), {}
+    keys = set()
+    flushes = {}
+    for triple in combinations(board, BOARD_CARDS):
+        keys.add(sum(evaluator.CARD_KEYS[code] for code in triple) >> 12)
+        suit = triple[0] & 3
+        if triple[1] & 3 == suit and triple[2] & 3 == suit:
+            flushes.setdefault(suit, []).append(
+                evaluator.RANK_BITS[triple[0]] | evaluator.RANK_BITS[triple[1]] | evaluator.RANK_BITS[triple[2]])
+    return tuple(keys), flushes
+
+
+'''
+boardParts of a board given as a tuple, cached so every player's hand state on the same board
+shares one.
+'''
+@lru_cache(maxsize=64)
+def sharedBoardParts(board):
+    return boardParts(board)
+
+
+'''
+Best strength out of a hole's parts and a board's parts.
+'''
+def bestStrength(hole, board):
+    pairKeys, suitedPairs = hole
+    tripleKeys, flushTriples = board
+    table = evaluator.RANK_TABLE
+    best = max([table[pair + triple] for pair in pairKeys for triple in tripleKeys])
+    for suit, pairMask in suitedPairs:
+        for tripleMask in flushTriples.get(suit, ()):
+            flush = evaluator.FLUSH_TABLE[pairMask | tripleMask]
+            if flush > best:
+                best = flush
+    return best
+
+
+'''
+Scores one Omaha hand: four hole card codes and the board codes. Returns one comparable integer, on
+the same scale as evaluator.evaluate.
+'''
+def evaluateOmaha(hole, board):
+    return bestStrength(holeParts(hole), boardParts(board))
+
+
+'''
+Omaha version of evaluator.showdown, with the same arguments and results. The board triples are
+worked out once for everyone.
+'''
+def showdown(holes, board):
+    boardPart = boardParts(board)
+    strengths = []
+    winners = []
+    best = -1
+    for i, hole in enumerate(holes):
+        if hole is None:
+            strengths.append(-1)
+            continue
+        strength = bestStrength(holeParts(hole), boardPart)
+        strengths.append(strength)
+        if strength > best:
+            best = strength
+            winners = [i]
+        elif strength == best:
+            winners.append(i)
+    return strengths, winners
+
+
+'''
+The card codes (two hole cards, then the board cards) of the hand that makes the best strength.
+Only for showing the hand, so it just tries the combinations one by one.
+'''
+def bestCodes(hole, board):
+    best, bestCombo = -1, ()
+    for pair in combinations(hole, 2):
+        for triple in combinations(board, min(len(board), BOARD_CARDS)):
+            strength = evaluator.evaluate(pair + triple)
+            if strength > best:
+                best, bestCombo = strength, pair + triple
+    return bestCombo
+
+
+'''
+Samples Omaha equity against random hands: deals `samples` runouts and four cards to each opponent,
+then scores everything with omahaStrengthsBatch. Returns an equity.Tally, so batches can be added up.
+'''
+def sampleTally(hole, board, opponents, samples=20000, seed=None):
+    rng = np.random.default_rng(seed)
+    deck = remainingCards(list(hole) + list(board))
+    missing = 5 - len(board)
+    needed = missing + HOLE_CARDS * opponents
+    drawn = np.empty((samples, 0), dtype=np.int8)
+    if needed:
+        keys = rng.random((samples, len(deck)), dtype=np.float32)
+        drawn = deck[np.argpartition(keys, needed - 1, axis=1)[:, :needed]]
+
+    fullBoard = completeBoards(board, drawn[:, :missing])
+    heroStrength = omahaStrengthsBatch(np.broadcast_to(np.array(hole, dtype=np.int8), (samples, HOLE_CARDS)),
+                                       fullBoard)
+    best = np.zeros(samples, dtype=np.int32)
+    tied = np.zeros(samples, dtype=np.int32)
+    for start in range(missing, needed, HOLE_CARDS):
+        strength = omahaStrengthsBatch(drawn[:, start:start + HOLE_CARDS], fullBoard)
+        tied = np.where(strength > best, 1, tied + (strength == best))
+        best = np.maximum(best, strength)
+    win = heroStrength > best
+    tie = heroStrength == best
+    share = np.where(win, 1.0, np.where(tie, 1.0 / (tied + 1), 0.0))
+    return Tally(int(win.sum()), int(tie.sum()), samples, float(share.sum()),
+                 float((share * share).sum()))
+
+
+def sampleEquity(hole, board, opponents, samples=20000, seed=None):
+    return sampleTally(hole, board, opponents, samples, seed).result()
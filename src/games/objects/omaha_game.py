@@ -0,0 +1,131 @@
+'''
+Name: omaha_game.py
+
+Authors: Joshua Welicky, Gavin Billinger, Mark Kitchin, Bisshoy Bhattacharjee, Max Biundo
+
+Description: Omaha. Same table, ante and betting as Poker, but everyone gets four hole cards and a
+hand has to use exactly two of them with exactly three from the board. Scoring goes through
+omaha_evaluator.py.
+
+Opponents' preflop, push/fold and policy tables are all built for Hold'em, so in Omaha they play from
+the made hand alone (see Opponent.holdem) and don't read ranges.
+'''
+import numpy as np
+
+from . import equity, evaluator, omaha_evaluator
+from .omaha_evaluator import HOLE_CARDS
+from .poker_game import Poker
+
+SAMPLE_BATCH = 20000 # Runouts per batch in getEquity.
+
+
+'''
+Omaha version of HandState: the first four cards added are the hole cards, the rest the board, and
+every add re-scores the best two-plus-three hand. The hole pairs are worked out once, and the board
+triples once per board for everyone (omaha_evaluator.sharedBoardParts).
+'''
+class OmahaHandState:
+    def __init__(self, codes=()):
+        self.codes = [] # Every card seen so far, hole cards first.
+        self.board = []
+        self.holePart = None # omaha_evaluator.holeParts of the hole cards, once all four are in.
+        self.strength = 0 # Best hand so far as a comparable integer.
+        for code in codes:
+            self.add(code)
+
+    def __len__(self):
+        return len(self.codes)
+
+    '''
+    Adds one card (a card code) and re-scores the hand.
+    '''
+    def add(self, code):
+        self.codes.append(code)
+        if len(self.codes) < HOLE_CARDS:
+            self.strength = evaluator.evaluate(self.codes) # Still being dealt.
+            return
+        if len(self.codes) == HOLE_CARDS:
+            self.holePart = omaha_evaluator.holeParts(self.codes)
+        else:
+            self.board.append(code)
+        self.strength = omaha_evaluator.bestStrength(self.holePart,
+                                                     omaha_evaluator.sharedBoardParts(tuple(self.board)))
+
+    def category(self):
+        return self.strength >> evaluator.CATEGORY_SHIFT
+
+    def handName(self):
+        return evaluator.handName(self.strength)
+
+    def copy(self):
+        state = OmahaHandState()
+        state.codes = list(self.codes)
+        state.board = list(self.board)
+        state.holePart = self.holePart
+        state.strength = self.strength
+        return state
+
+
+class Omaha(Poker):
+    HOLE_CARDS = HOLE_CARDS
+    HAND_STATE = OmahaHandState
+
+    def __init__(self, verbose=True, tendencies=None, history=None, difficulty=None):
+        super().__init__(verbose, tendencies, history, difficulty)
+        self.trackRanges = False # Ranges are two-card combos.
+
+    """
+    Scores everyone still in at the showdown, two hole cards and three from the board each. Every
+    hand state has already scored the full board as it came out, so the showdown just reads them,
+    and only a state that doesn't hold this exact hand is scored again
+    """
+    def scoreShowdown(self, holes, board):
+        strengths = []
+        winners = []
+        best = -1
+        for i, hole in enumerate(holes):
+            if hole is None:
+                strengths.append(-1)
+                continue
+            state = self.handState if i == 0 else self.players[i].handState
+            if state.codes == list(hole) + list(board):
+                strength = state.strength
+            else:
+                strength = omaha_evaluator.evaluateOmaha(hole, board)
+            strengths.append(strength)
+            if strength > best:
+                best = strength
+                winners = [i]
+            elif strength == best:
+                winners.append(i)
+        return strengths, winners
+
+    """
+    Player's chances of winning from here, sampled against random four-card hands. Same arguments as
+    Poker.getEquity: batches are dealt until the standard error is under targetError (after
+    equity.MIN_SAMPLES) or `samples` are used up. There's no exact enumeration or process pool for
+    Omaha, so threshold and workers are accepted and ignored
+    """
+    def getEquity(self, samples=100000, targetError=equity.TARGET_ERROR, seed=None, workers=None,
+                  threshold=equity.EXACT_THRESHOLD):
+        board = [card.code for card in self.board]
+        seeds = np.random.SeedSequence(seed)
+        total = equity.Tally()
+        while total.samples < samples:
+            batch = min(SAMPLE_BATCH, samples - total.samples)
+            total = total + omaha_evaluator.sampleTally(self.playerHand.codes, board, self.liveOpponents(),
+                                                        batch, seeds.spawn(1)[0])
+            if total.samples >= equity.MIN_SAMPLES and total.stdError() <= targetError:
+                break
+        return total.result()
+
+    """
+    Finds the two hole cards and three board cards that make the player's best hand
+    """
+    def analyzeHand(self):
+        board = [card.code for card in self.board]
+        codes = omaha_evaluator.bestCodes(tuple(self.playerHand.codes), tuple(board))
+        cards = [card for card in self.playerHand.hand + self.board if card.code in codes]
+        self.handStrength = self.handState.strength
+        return evaluator.handName(self.handStrength), evaluator.bestCards(cards, [card.code for card in cards],
+                                                                            self.handStrength)
@@ -1,83 +1,259 @@
 from .hand import Hand
+from .hand_state import HandState
+from . import evaluator, preflop, equity, ranges, pushfold, policy
+import json
+import os
 import random
 
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Named difficulty levels written by tools/tune_opponents.py.
+LEVELS_PATH = os.path.join(BASE_DIR, "../../assets/opponent_levels.json")
+DEFAULT_LEVEL = "medium" # What the poker screen starts on, when the levels file has it.
+
 #=========================================================#
 #=================== AI OPPONENT CLASS ===================#
 #=========================================================#
 
 # To be honest, I'm not sure how extensible this is to Sabaac, but this is what I needed for Poker.
 
+# Made-hand strengths, used as the answer when there is no time to work out real equity.
+HAND_STRENGTHS = {
+    "High Card": 0.1,
+    "Pair": 0.25,
+    "Two Pair": 0.4,
+    "Three of a Kind": 0.55,
+    "Straight": 0.65,
+    "Flush": 0.75,
+    "Full House": 0.85,
+    "Four of a Kind": 0.9,
+    "Straight Flush": 0.95,
+    "Royal Flush": 1.0,
+}
+
+# How long (ms) an opponent may think about one decision. Keeps the GUI responsive.
+DEFAULT_BUDGET_MS = 25
+# Below this budget there is no point sampling, so the made-hand table is used instead.
+MIN_SAMPLING_MS = 2
+
+'''
+Knobs for how an opponent plays. Edges are multiples of a fair share of the pot (1 / players in
+the hand), so the same numbers work heads-up and multiway.
+'''
+DEFAULT_PARAMS = {
+    "foldMargin": 0.02, # Fold when equity is this far below the pot odds.
+    "heroCallChance": 0.1, # Chance to call anyway when the odds say fold.
+    "raiseEdge": 1.6, # Raise a bet when equity is at least this many fair shares...
+    "raiseChance": 0.6, # ...this often.
+    "betEdge": 1.25, # Open the betting with this many fair shares...
+    "betChance": 0.6, # ...this often.
+    "bluffChance": 0.08, # Bet with nothing this often.
+    "noise": 0.04, # Random wobble added to the equity estimate.
+    "policyMix": 0.0, # Share of decisions played straight from the policy table (see policy.py).
+}
+
+'''
+Every difficulty level in the levels file, as {name: params}. Empty if the file isn't there.
+'''
+def loadLevels(path=LEVELS_PATH):
+    try:
+        with open(path) as f:
+            levels = json.load(f)
+    except OSError:
+        return {}
+    return {name: level["params"] for name, level in levels.items()}
+
+'''
+Full set of play style params for a named difficulty level. None gives the defaults.
+'''
+def levelParams(level=None):
+    params = dict(DEFAULT_PARAMS)
+    if level is not None:
+        levels = loadLevels()
+        if level not in levels:
+            raise ValueError(f"Unknown opponent level {level!r}, expected one of {sorted(levels)}")
+        params.update(levels[level])
+    return params
+
 class Opponent:
-    def __init__(self, name, game, id):
+    def __init__(self, name, game, id, params=None, budgetMs=DEFAULT_BUDGET_MS):
         self.name = name
         self.game = game # The opponent needs the game instance to modify its state.
         self.oppHand = Hand()
+        self.handState = HandState() # Hole cards plus the board, kept up to date by the game.
         self.bestHand = []
         self.handRank = 0
+        self.handStrength = 0 # Single comparable integer from the hand evaluator.
+        self.equity = 0.0 # Last equity estimate against the live players.
+        self.ranges = {} # Read on every other player still in the hand, by seat (see ranges.py).
         self.stake = 0
         self.chipTotal = 0
         self.id = id
         self.active = True
         self.folded = False
+        self.params = dict(DEFAULT_PARAMS)
+        if params:
+            self.params.update(params)
+        self.budgetMs = budgetMs
+        # Samples per equity estimate in place of the clock, so a run replays the same however busy
+        # the machine is (see tools/tune_opponents.py). None goes by budgetMs.
+        self.samples = None
+        self.explore = 0.0 # Chance of a random policy action, for building the policy table.
+        self.policyLog = None # (state, slot) of every policy decision, when a list.
+        # Where decisions get their random numbers: the random module, so random.seed replays a game,
+        # or a random.Random of their own (see ponder.snapshot).
+        self.rng = random
 
     def __str__(self):
         return self.name
 
+    '''
+    True when we hold two cards. The preflop, push/fold and policy tables and the equity samplers are
+    all for Hold'em, so other games (see omaha_game.py) go by the made-hand table instead.
+    '''
+    def holdem(self):
+        return len(self.oppHand.codes) == 2
+
+    '''
+    Estimates our share of the pot against everyone else still in the hand, using the best method
+    the time budget allows: preflop table, the made-hand table, sampling against what we've read of
+    their ranges, or exact enumeration and sampling against random hands.
+    '''
+    def estimateEquity(self, opponents):
+        board = [card.code for card in self.game.board]
+        if not board and preflop.isAvailable() and self.holdem():
+            return preflop.preflopEquity(*self.oppHand.codes, opponents)
+        if self.budgetMs < MIN_SAMPLING_MS or not self.holdem():
+            # Rough chance of beating every one of them.
+            return HAND_STRENGTHS.get(self.handRank, 0.1) ** opponents
+        seed = self.rng.getrandbits(32) # Follows self.rng, so seeded games replay the same.
+        if self.ranges:
+            if self.samples is not None:
+                return ranges.rangeEquity(self.oppHand.codes, board, list(self.ranges.values()),
+                                          self.samples, seed).equity
+            return ranges.rangeEquity(self.oppHand.codes, board, list(self.ranges.values()), seed=seed,
+                                      budgetMs=self.budgetMs).equity
+        return equity.budgetedEquity(self.oppHand.codes, board, opponents, self.budgetMs, seed,
+                                     samples=self.samples).equity
+
+    '''
+    Short stacked, the only moves worth making are all in or fold, straight off the push/fold charts
+    (see pushfold.py). Facing a bet that would take most of the stack is a call-or-fold spot, anything
+    else a shove-or-fold one. Returns None when the stack is deep enough to play normally.
+    '''
+    def pushFoldAction(self, players):
+        behind = self.chipTotal - self.stake
+        pot = self.game.getPot()
+        toCall = max(self.game.minbet - self.stake, 0)
+        facing = self.game.activeBet and toCall >= behind / 2
+        if facing:
+            # Measured from before the shove, like the charts: the price against what else is in.
+            price = min(toCall, behind)
+            depth = pushfold.stackDepth(price, pot - price, players)
+        else:
+            depth = pushfold.stackDepth(behind, pot, players)
+        if depth is None or not self.holdem() or not pushfold.isAvailable() or not preflop.isAvailable():
+            return None
+        if self.game.board and self.budgetMs < MIN_SAMPLING_MS:
+            return None # The made-hand guess isn't a real equity, there's nothing to match a class to.
+        if self.game.board:
+            # The charts are for hole cards alone, so stand in the class with the same equity.
+            handClass = pushfold.equivalentClass(self.equity, players - 1)
+        else:
+            handClass = preflop.handClass(*self.oppHand.codes)
+        role = pushfold.CALL if facing else pushfold.PUSH
+        if self.rng.random() < pushfold.frequency(players, depth, role, handClass):
+            return 'allin'
+        return 'fold' if self.game.activeBet else 'check'
+
+    '''
+    Plays from the precompiled policy table: one bucket lookup, one read, then a weighted pick
+    between the slots that are open right now.
+    '''
+    def policyAction(self):
+        game = self.game
+        state = policy.gameState(game, self.oppHand.codes, self.stake)
+        if game.activeBet:
+            actions = ['fold', 'call', 'raise' if self.chipTotal > game.minbet + 50 else None]
+        else:
+            actions = ['check', None, 'bet']
+        weights = [float(w) if action else 0.0 for w, action in zip(policy.actionMix(state), actions)]
+        if self.rng.random() < self.explore or sum(weights) <= 0:
+            weights = [1.0 if action else 0.0 for action in actions]
+        slot = self.rng.choices(range(policy.SLOTS), weights)[0]
+        if self.policyLog is not None:
+            self.policyLog.append((state, slot))
+        return actions[slot]
+
+    '''
+    Picks the action and returns it without making it. Decisions work out equity: all in or fold
+    when short stacked, otherwise fold/call/raise (facing a bet) or check/bet from equity and pot
+    odds. Styles that set policyMix (none do by default) play that share of their Hold'em decisions
+    on the board straight from the policy table instead (policyAction), skipping all of that.
+    '''
+    def chooseAction(self):
+        params = self.params
+        if self.stake >= self.chipTotal:
+            return 'check' # Already all in, nothing to do but wait for the showdown.
+        self.handStrength = self.handState.strength
+        self.handRank = evaluator.handName(self.handStrength)
+        if params["policyMix"] and self.game.board and self.rng.random() < params["policyMix"] \
+                and self.holdem() and policy.isAvailable():
+            return self.policyAction()
+
+        opponents = max(len(self.game.activePlayers) - 1, 1)
+        fairShare = 1 / (opponents + 1)
+        self.equity = self.estimateEquity(opponents)
+        shortAction = self.pushFoldAction(opponents + 1)
+        if shortAction:
+            return shortAction
+        strength = self.equity + self.rng.uniform(-params["noise"], params["noise"])
+
+        # Lean on what we know about how the human plays, if they're in the hand.
+        foldMargin, bluffChance = params["foldMargin"], params["bluffChance"]
+        tendencies = self.game.tendencies
+        if tendencies and "Player" in self.game.activePlayers:
+            bluffChance += tendencies.bluffShift
+            if self.game.lastAggressor == 0:
+                foldMargin += tendencies.callShift
+
+        if self.game.activeBet:
+            toCall = max(self.game.minbet - self.stake, 0)
+            pot = self.game.getPot()
+            potOdds = toCall / (pot + toCall) if toCall else 0.0
+            canRaise = self.chipTotal > self.game.minbet + 50
+            if strength < potOdds - foldMargin and self.rng.random() >= params["heroCallChance"]:
+                return 'fold'
+            if canRaise and strength >= params["raiseEdge"] * fairShare and self.rng.random() < params["raiseChance"]:
+                return 'raise'
+            return 'call'
+        if strength >= params["betEdge"] * fairShare and self.rng.random() < params["betChance"]:
+            return 'bet'
+        if self.rng.random() < bluffChance:
+            return 'bet'
+        return 'check'
+
+    '''
+    Carries out an action on the game and returns how it reads in the round summary.
+    '''
+    def act(self, action, id):
+        if action == 'fold':
+            self.game.fold(id)
+            return 'folds'
+        if action == 'call':
+            self.game.call(id)
+            return 'calls'
+        if action == 'raise':
+            self.game._raise(id)
+            return 'raises'
+        if action == 'bet':
+            self.game.bet(id)
+            return 'bets'
+        if action == 'allin':
+            self.game.allIn(self.chipTotal, id)
+            return 'goes all in'
+        self.game.check(id)
+        return 'checks'
+
     def decision(self, id):
         if self.active == True:
-            self.handRank, self.bestHand = self.oppHand.getBestHand(self.game.board)
-            #print(f"{self.name}'s Best Hand:")
-            #print(self.handRank)
-            #print(self.bestHand)
-
-            hand_strengths = {
-                "High Card": 0.1,
-                "Pair": 0.25,
-                "Two Pair": 0.4,
-                "Three of a Kind": 0.55,
-                "Straight": 0.65,
-                "Flush": 0.75,
-                "Full House": 0.85,
-                "Four of a Kind": 0.9,
-                "Straight Flush": 0.95,
-                "Royal Flush": 1.0,
-            }
-
-            strength = hand_strengths.get(self.handRank, 0.1)
-            strength += random.uniform(-0.1, 0.1)
-
-            if self.game.activeBet:
-                if strength < 0.2:
-                    if random.random() < 0.8:
-                        self.game.fold(id)
-                        return 'folds'
-                    else:
-                        self.game.call(id)
-                        return 'calls'
-                elif strength < 0.5:
-                    self.game.call(id)
-                    return 'calls'
-                elif strength < 0.8: 
-                    if random.random() < 0.7:
-                        self.game.call(id)
-                        return 'calls'
-                    else:
-                        self.game._raise(id)
-                        return 'raises'
-                else:
-                    if random.random() < 0.6:
-                        self.game._raise(id)
-                        return 'raises'
-                    else: 
-                        self.game.call(id)
-                        return 'calls'
-            else:
-                if strength > 0.75 and random.random() < 0.5:
-                    self.game.bet(id)
-                    return 'bets'
-                elif strength > 0.5 and random.random() < 0.3:
-                    self.game.bet(id)
-                    return 'bets'
-                else:
-                    self.game.check(id)
-                    return 'checks'
\ No newline at end of file
+            return self.act(self.chooseAction(), id)
@@ -0,0 +1,462 @@
+'''
+Name: poker_game.py
+
+Authors: Joshua Welicky, Gavin Billinger, Mark Kitchin, Bisshoy Bhattacharjee, Max Biundo
+
+Description: Poker game logic: dealing, betting, folding and working out who won. It has no Qt in it,
+so the PokerScreen GUI and the headless table engine (table.py) drive the same rules.
+'''
+import random
+
+from .opponent import Opponent, levelParams
+from .deck import Deck
+from .hand import Hand
+from .hand_state import HandState
+from . import evaluator, equity, preflop, settlement
+from .policy import textureClass
+from .ranges import Range, comboBuckets
+
+#=================================================#
+#===============POKER LOGIC CLASS=================#
+#=================================================#
+
+class Poker:
+    HOLE_CARDS = 2 # Cards dealt to each player.
+    HAND_STATE = HandState # Scores a player's cards as the board comes out.
+
+    def __init__(self, verbose=True, tendencies=None, history=None, difficulty=None):
+        self.deck = Deck() # We need the deck of course.
+        self.name = "Player" # ID for Player essentially
+        self.playerHand = Hand() # We need the player hand of course.
+        self.handState = self.HAND_STATE() # Player's hole cards plus the board, scored as cards come out.
+        self.bestHand = [] # Keeps track of player's best hand.
+        self.handRank = 0 # Holds hand rank in comparison to other players.
+        self.handStrength = 0 # Comparable integer for the player's best hand.
+        self.stake = 0 # Holds chips the player has bet for a given round.
+        self.board = [] # Keeps track of cards in center.
+        self.oppNo = 0 # We need to know how many opponents we have in order to make that many later.
+        self.opps = [] # Holds Opponent instances.
+        self.turn_index = 0 # Keeps track of who's turn in Poker it is.
+        self.players = [] # Full list of players, user and opponents.
+        self.activePlayers = []
+        self.checked = 0 # Keeps track of how many people have passed without betting/raising.
+        self.started = False # Keeps track of whether the Poker instance is fresh.
+        self.activeBet = False # We need to know if a bet is currently occurring.
+        self.folded = False # This will likely be valuable in interrupting gameflow.
+        self.minbet = 50 # Keeps track of largest bet that players must match.
+        self.skip = False # Keeps track of when player can be skipped (e.g. during an All-In)
+        self.strengths = [] # Showdown strength for each of players, -1 for anyone who folded.
+        self.difficulty = difficulty # Named opponent level (see opponent.loadLevels), None for the defaults.
+        self.trackRanges = True # Opponents read everyone's range from their actions.
+        self.rangeBuckets = None # Combo strength buckets for the current board, shared by all ranges.
+        self.texture = None # policy.textureClass of the current board.
+        self.tendencies = tendencies # Stats on how the human plays (see tendencies.py), if kept.
+        self.lastAggressor = None # Index of whoever bet or raised last this hand.
+        self.verbose = verbose # Print what happens. Simulations turn this off.
+        self.history = history # HandRecorder that every hand is written to (see hand_history.py), if kept.
+        self.playerChips = None # The player's chips at the start of the hand, for the history, if known.
+
+    """
+    Prints a game message unless the game is running quietly
+    """
+    def log(self, message):
+        if self.verbose:
+            print(message)
+
+    """
+    Method creates opponents at the start of a fresh instance of Poker.
+    """
+    def createOpponents(self, game):
+        # Create opponents with random chip amounts. The screen seats three, bigger tables get numbered names.
+        names = ["Super Macho Man", "King Hippo", "Glass Joe"]
+        params = levelParams(self.difficulty)
+        for i in range(self.oppNo):
+            name = names[i] if i < len(names) else f"Opponent {i + 1}"
+            self.opps.append(Opponent(name, game, i, params))
+            self.opps[i].chipTotal = random.randint(15, 25) * 50
+        # Create a list of active players including the user
+        self.players = ['Player'] + self.opps
+        for player in self.players:
+            self.activePlayers.append(player)
+    """
+    Checks to see if opponents still have chips and removes them if not
+    """
+    def removeOpponents(self):
+        for opp in self.opps:
+            if opp.chipTotal <=0:
+                opp.active = False
+
+    """
+    Method to deal initial hole cards to a given player.
+    """
+    def deal(self):
+        # Draw hole cards and 50 chip buy in
+        self.started = True
+        self.stake += 50 # Ante
+        for _ in range(self.HOLE_CARDS):
+            self.playerHand.add(self.deck.draw())
+        self.handState = self.HAND_STATE(self.playerHand.codes)
+        if self.tendencies:
+            self.tendencies.startHand()
+        # Give cards to active opponents and bet 50 chips
+        for i in range(len(self.opps)):
+            if self.opps[i].active == True:
+                self.log(f"{self.opps[i].name} gets dealt.")
+                self.opps[i].stake += 50
+                for _ in range(self.HOLE_CARDS):
+                    self.opps[i].oppHand.add(self.deck.draw())
+                self.opps[i].handState = self.HAND_STATE(self.opps[i].oppHand.codes)
+        self.startRanges()
+        if self.history:
+            seats = [(0, self.name, self.playerChips, tuple(self.playerHand.codes))]
+            seats += [(opp.id + 1, opp.name, opp.chipTotal, tuple(opp.oppHand.codes))
+                      for opp in self.opps if opp.active]
+            self.history.startHand(seats)
+
+    """
+    Gives every opponent a fresh range for each other player dealt in, minus their own hole cards
+    """
+    def startRanges(self):
+        self.rangeBuckets = None
+        self.texture = None
+        if not self.trackRanges:
+            return
+        dealt = [i for i, player in enumerate(self.players) if player in self.activePlayers]
+        for opp in self.opps:
+            if opp.active:
+                seat = opp.id + 1
+                opp.ranges = {other: Range(opp.oppHand.codes) for other in dealt if other != seat}
+
+    """
+    Updates every opponent's read on the player at index after they take an action, the human's
+    tendency stats and the hand history (where label, if given, is what the history calls the
+    action). facingBet says whether there was a bet to answer, worked out from the action and
+    activeBet when not given. Folding just drops the read, they're out of the hand.
+    """
+    def observe(self, index, action, label=None, facingBet=None):
+        if self.history:
+            stake = self.stake if index == 0 else self.opps[index - 1].stake
+            self.history.action(index, label or action, stake)
+        if action in ('bet', 'raise'):
+            self.lastAggressor = index
+        if index == 0 and self.tendencies:
+            if facingBet is None:
+                facingBet = action in ('call', 'raise') or (action in ('check', 'fold') and self.activeBet)
+            self.tendencies.record(action, facingBet)
+        if not self.trackRanges:
+            return
+        if action == 'fold':
+            for opp in self.opps:
+                opp.ranges.pop(index, None)
+            return
+        buckets = self.boardBuckets()
+        for opp in self.opps:
+            playerRange = opp.ranges.get(index)
+            if playerRange is not None:
+                playerRange.update(action, buckets)
+
+    """
+    Strength bucket of every two-card combo on the current board (see ranges.comboBuckets), worked
+    out once per street and shared by everyone's ranges and policy lookups
+    """
+    def boardBuckets(self):
+        if self.rangeBuckets is None:
+            self.rangeBuckets = comboBuckets([card.code for card in self.board])
+        return self.rangeBuckets
+
+    """
+    Texture class of the current board for the policy table (see policy.textureClass), worked out
+    once per street like the buckets
+    """
+    def boardTexture(self):
+        if self.texture is None:
+            self.texture = textureClass([card.code for card in self.board])
+        return self.texture
+
+    """
+    Starts round with player's turn
+    """
+    def start_round(self):
+        self.turn_index = 0
+
+    """
+    Moves the turn index forward to the next player
+    """
+    def next_turn(self):
+        self.turn_index = (self.turn_index + 1) % len(self.players)
+
+    """
+    Starts the game by drawing three cards to the table
+    """
+    def flop(self):
+        self.addToBoard(self.deck.draw())
+        self.addToBoard(self.deck.draw())
+        self.addToBoard(self.deck.draw())
+        self.recordBoard()
+
+    """
+    Moves to the next round by adding one more card to the table
+    """
+    def turn(self):
+        self.addToBoard(self.deck.draw())
+        self.recordBoard()
+
+    """
+    Adds one final card to the table
+    """
+    def river(self):
+        self.addToBoard(self.deck.draw())
+        self.recordBoard()
+
+    """
+    Hands the board so far to the hand history, once per street
+    """
+    def recordBoard(self):
+        if self.history:
+            self.history.board([card.code for card in self.board])
+
+    """
+    Puts a card on the board and hands it to every player's hand state, so everyone's best hand
+    stays current without re-scoring the whole pool
+    """
+    def addToBoard(self, card):
+        self.board.append(card)
+        self.handState.add(card.code)
+        for opp in self.opps:
+            opp.handState.add(card.code)
+            for playerRange in opp.ranges.values():
+                playerRange.removeCard(card.code)
+        self.rangeBuckets = None
+        self.texture = None
+
+    """
+    Game method moves turn to next player without betting any chips. ends round if everyone
+    checks
+    """
+    def check(self, index=0):
+        self.log(f"Player {index} is checking...")
+        self.checked += 1
+        self.observe(index, 'check')
+
+    """
+    Game method matches the highest bet
+    """
+    def call(self, index=0):
+        self.log("Calling...")
+        self.checked += 1
+        if index == 0:
+            # bet the minimum amount
+            self.stake = self.minbet
+        else:
+            if self.opps[index-1].chipTotal > self.minbet:
+                self.opps[index-1].stake = self.minbet
+            else:
+                self.opps[index-1].stake = self.opps[index-1].chipTotal
+        self.observe(index, 'call')
+
+    """
+    Game method to bet chips, forcing the rest of the players to call or raise
+    """
+    def bet(self, index=0):
+        self.log("Betting...")
+        self.checked = 1
+        # Raise the minimum bet by 50 and bet 50 chips
+        self.activeBet = True
+        self.minbet += 50
+        if index == 0:
+            self.stake = self.minbet
+        else:
+            if self.opps[index-1].chipTotal > self.minbet:
+                self.opps[index-1].stake = self.minbet
+            else:
+                self.opps[index-1].stake = self.opps[index-1].chipTotal
+        self.observe(index, 'bet')
+
+    """
+    Game method to raise the minimum bet and bet that amount
+    """
+    def _raise(self, index=0):
+        # Raise the minimum bet 50 chips and bet that amount
+        self.log("Raising...")
+        self.checked = 1
+        self.activeBet = True
+        self.minbet += 50
+        if index == 0:
+            self.stake = self.minbet
+        else:
+            if self.opps[index-1].chipTotal > self.minbet:
+                self.opps[index-1].stake = self.minbet
+            else:
+                self.opps[index-1].stake = self.opps[index-1].chipTotal
+        self.observe(index, 'raise')
+
+    """
+    Game method to remove the person from the round 
+    """
+    def fold(self, index=0):
+        self.log(f"Player {index} is folding...")
+
+        # Deduct the stake from player chips if player is human (index 0)
+        if index == 0:
+            self.folded = True
+            self.playerHand = Hand()  # clear player's hand
+            self.activePlayers.remove('Player')
+        else:
+            # Clear opponent hand and stake
+            self.players[index].folded = True
+            self.players[index].oppHand = Hand()
+            #self.players[index].chipTotal -= self.players[index].stake
+            self.activePlayers.remove(self.players[index])
+        self.observe(index, 'fold')
+
+    """
+    Game methond to bet all the remaining chips a player has. More than the current bet counts as a
+    bet (nothing to answer yet) or raise, anything less is a call for less and the showdown gives
+    them a side pot.
+    """
+    def allIn(self, chips, index=0):
+        self.log("GOING ALL IN!!!")
+        facingBet = self.activeBet # Before the shove changes it.
+        if index == 0:
+            self.stake = chips
+            self.skip = True # Nothing left to do but wait for the showdown.
+        else:
+            self.opps[index-1].stake = chips
+        if chips > self.minbet:
+            # Everyone else has to answer the new amount.
+            self.checked = 1
+            self.minbet = chips
+            self.activeBet = True
+            self.observe(index, 'raise' if facingBet else 'bet', 'allin', facingBet)
+        else:
+            self.checked += 1
+            self.observe(index, 'call', 'allin', facingBet)
+
+    """
+    Game method to calculate who has the best hand and find the winners. Everyone still in is scored
+    in one pass. Returns the indices of every player tied for the best hand (so the pot can be
+    split) and the name of that hand.
+    """
+    def get_results(self):
+        self.log("Ending game...")
+        board = [card.code for card in self.board]
+        holes = []
+        for i, player in enumerate(self.players):
+            if player not in self.activePlayers:
+                holes.append(None)
+            elif i == 0:
+                holes.append(self.playerHand.codes)
+            else:
+                holes.append(player.oppHand.codes)
+        strengths, winners = self.scoreShowdown(holes, board)
+        self.strengths = strengths
+        if self.tendencies:
+            self.tendencies.endHand(not self.folded and len(self.activePlayers) > 1)
+
+        # Keep everyone's hand details up to date for the results screen.
+        if not self.folded:
+            self.handRank, self.bestHand = self.analyzeHand()
+        for i in range(1, len(self.players)):
+            if holes[i] is not None:
+                self.players[i].handStrength = strengths[i]
+                self.players[i].handRank = evaluator.handName(strengths[i])
+        return winners, evaluator.handName(strengths[winners[0]])
+
+    """
+    Scores everyone still in at the showdown, see evaluator.showdown
+    """
+    def scoreShowdown(self, holes, board):
+        return evaluator.showdown(holes, board)
+
+    """
+    Works out the showdown and what every seat collects, with side pots for anyone who went all in
+    for less. Returns (payouts, winners, hand name) where payouts[i] is what players[i] gets back
+    and winners are the players with the best hand.
+    """
+    def settle(self):
+        winners, handRank = self.get_results()
+        payouts, pots = settlement.settle(self.contributions(), self.strengths)
+        if self.history:
+            handNames = [evaluator.handName(strength) if strength >= 0 else None for strength in self.strengths]
+            self.history.finish(self.getPot(), payouts, winners, handRank, len(self.activePlayers) > 1, handNames)
+        return payouts, winners, handRank
+
+    """
+    Chips each seat has put in this hand, in the same order as players
+    """
+    def contributions(self):
+        return [self.stake] + [opp.stake for opp in self.opps]
+
+    """
+    Resets game state to new round
+    """
+    def reset(self):
+        self.deck.shuffle()
+        self.playerHand = Hand()
+        self.handState = self.HAND_STATE()
+
+        self.bestHand = []
+        self.bestRank = 0
+        self.stake = 0
+        self.minbet = 50
+        self.board = []
+        self.turn_index = 0
+        self.checked = 0
+        self.activeBet = False
+        self.folded = False
+        self.skip = False
+        self.lastAggressor = None
+        self.removeOpponents()
+        self.activePlayers = []
+        for i in range(len(self.players)):
+            if i == 0:
+                self.activePlayers.append(self.players[i])
+            else:
+                if self.players[i].active:
+                    self.activePlayers.append(self.players[i])
+        for i in range(1, len(self.players)):
+            self.players[i].folded = False
+            self.players[i].stake = 0
+            self.players[i].oppHand = Hand()
+            self.players[i].handState = self.HAND_STATE()
+            self.players[i].ranges = {}
+
+    """
+    Total chips everyone has put in this hand
+    """
+    def getPot(self):
+        pot = self.stake
+        for opp in self.opps:
+            pot += opp.stake
+        return pot
+
+    """
+    Counts the opponents who are still in the current hand
+    """
+    def liveOpponents(self):
+        return sum(1 for player in self.activePlayers if player != "Player")
+
+    """
+    Works out the player's chances of winning from here against every opponent still in the hand.
+    Small spots (turn, river) are enumerated exactly and cached, bigger ones are sampled.
+    Returns an equity.Equity with win/tie/lose probabilities.
+    """
+    def getEquity(self, samples=100000, targetError=equity.TARGET_ERROR, seed=None, workers=None,
+                  threshold=equity.EXACT_THRESHOLD):
+        board = [card.code for card in self.board]
+        # Before the flop the answer comes straight out of the precomputed table. The table only
+        # stores pot share, so ties are counted into win there.
+        if not board and len(self.playerHand.codes) == 2 and preflop.isAvailable():
+            share = preflop.preflopEquity(*self.playerHand.codes, self.liveOpponents())
+            return equity.Equity(share, 0.0, 1.0 - share, share, 0)
+        return equity.calculateEquity(self.playerHand.codes, board, self.liveOpponents(), (), threshold,
+                                      samples, targetError, seed, workers)
+
+    """
+    Game method looks at hand and finds the best combination of cards with the cards on 
+    the table
+    """
+    def analyzeHand(self):
+        hand_type, best_hand = self.playerHand.getBestHand(self.board)
+        self.handStrength = self.handState.strength
+        return hand_type, best_hand
\ No newline at end of file
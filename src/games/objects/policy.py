@@ -0,0 +1,149 @@
+'''
+Name: policy.py
+
+Authors: Joshua Welicky, Gavin Billinger, Mark Kitchin, Bisshoy Bhattacharjee, Max Biundo
+
+Description: Precompiled opponent policy. Every decision is boiled down to a bucketed state:
+
+Hand bucket - where our hand ranks among every combo on this board (ranges.comboBuckets), 0-9.
+Board texture - street, how many cards share a suit, whether the board is paired and whether three
+                of its ranks fit in a straight.
+Pot odds - no bet to face, or which band the price of calling falls in.
+Players - how many are still in the hand, 2-4.
+
+tools/build_policy_table.py plays the table against itself to find the action mix that does best in
+each state and writes it to assets/policy.bin. An opponent playing from the table then needs one
+bucket lookup and one read per decision, with no equity to work out.
+
+An action mix has three slots: fold (or check when there's no bet), call, and raise (or bet).
+
+File layout: the 4 byte magic b'PLCY', then uint8 version, then uint8 counts of hand buckets,
+textures, pot odds buckets, player counts and slots, one pad byte, then a uint8 weight (scaled by
+255) for every slot of every state, in stateIndex order.
+'''
+import mmap
+import os
+import struct
+
+import numpy as np
+
+from .ranges import BUCKETS, comboIndex
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+TABLE_PATH = os.path.join(BASE_DIR, "../../assets/policy.bin")
+
+MAGIC = b'PLCY'
+VERSION = 1
+HEADER = struct.Struct('<4sBBBBBBx')
+SCALE = 255
+
+STREETS = 3 # Flop, turn and river. The betting starts on the flop.
+TEXTURES = STREETS * 3 * 2 * 2 # Street, suitedness, paired, straight possible.
+ODDS_EDGES = (0.15, 0.25, 0.35) # Pot odds bands when facing a bet.
+ODDS_BUCKETS = len(ODDS_EDGES) + 2 # Plus one for no bet.
+MIN_PLAYERS = 2
+PLAYERS = 3 # 2-4 players in the hand.
+STATES = BUCKETS * TEXTURES * ODDS_BUCKETS * PLAYERS
+
+SLOTS = 3
+FOLD, CALL, RAISE = range(SLOTS) # Check and bet share the fold and raise slots.
+
+_table = None
+
+
+'''
+Texture class of a board of 3-5 card codes.
+'''
+def textureClass(board):
+    suits = [0] * 4
+    ranks = set()
+    for code in board:
+        suits[code & 3] += 1
+        ranks.add(code >> 2)
+    suited = min(max(suits), 3) - 1 if board else 0 # Rainbow, a flush draw, a flush possible.
+    paired = len(ranks) < len(board)
+    # Three ranks inside five in a row (the ace also plays low) make a straight possible.
+    low = ranks | ({-1} if 12 in ranks else set())
+    straight = any(len(low & set(range(top - 4, top + 1))) >= 3 for top in range(3, 13))
+    street = min(max(len(board) - 3, 0), STREETS - 1)
+    return ((street * 3 + max(suited, 0)) * 2 + paired) * 2 + straight
+
+
+def oddsBucket(toCall, pot):
+    if toCall <= 0:
+        return 0
+    odds = toCall / (pot + toCall)
+    bucket = 1
+    for edge in ODDS_EDGES:
+        if odds >= edge:
+            bucket += 1
+    return bucket
+
+
+'''
+Index of a state in the table. handBucket is 0 to BUCKETS-1.
+'''
+def stateIndex(handBucket, texture, odds, players):
+    players = min(max(players, MIN_PLAYERS), MIN_PLAYERS + PLAYERS - 1) - MIN_PLAYERS
+    return ((handBucket * TEXTURES + texture) * ODDS_BUCKETS + odds) * PLAYERS + players
+
+
+'''
+State of a decision in a Poker game for a player holding `hole`, with `stake` already in. The hand
+buckets and board texture come from the game, which works them out once per street.
+'''
+def gameState(game, hole, stake):
+    handBucket = int(game.boardBuckets()[comboIndex(*hole)])
+    toCall = max(game.minbet - stake, 0) if game.activeBet else 0
+    return stateIndex(handBucket, game.boardTexture(), oddsBucket(toCall, game.getPot()),
+                      len(game.activePlayers))
+
+
+def writeTable(path, mixes):
+    weights = np.clip(np.rint(np.asarray(mixes, dtype=np.float64) * SCALE), 0, SCALE).astype(np.uint8)
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, BUCKETS, TEXTURES, ODDS_BUCKETS, PLAYERS, SLOTS))
+        f.write(weights.reshape(STATES, SLOTS).tobytes())
+
+
+'''
+The table as a (STATES, SLOTS) array of weights, straight off the memory-mapped file.
+'''
+def readTable(path=TABLE_PATH):
+    with open(path, 'rb') as f:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, *shape = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION or shape != [BUCKETS, TEXTURES, ODDS_BUCKETS, PLAYERS, SLOTS]:
+        raise ValueError(f"{path} is not a policy table this version can read")
+    return np.frombuffer(data, dtype=np.uint8, count=STATES * SLOTS, offset=HEADER.size).reshape(STATES, SLOTS)
+
+
+def _load():
+    global _table
+    if _table is None:
+        _table = readTable()
+    return _table
+
+
+def isAvailable():
+    try:
+        _load()
+        return True
+    except (OSError, ValueError):
+        return False
+
+
+'''
+Plays from `mixes` (a (STATES, SLOTS) array of weights) instead of the file, e.g. while the table is
+being built.
+'''
+def useTable(mixes):
+    global _table
+    _table = np.asarray(mixes)
+
+
+'''
+Action weights (fold, call, raise) for a state. They don't have to add up to 1.
+'''
+def actionMix(state):
+    return _load()[state]
@@ -0,0 +1,108 @@
+'''
+Name: ponder.py
+
+Authors: Joshua Welicky, Gavin Billinger, Mark Kitchin, Bisshoy Bhattacharjee, Max Biundo
+
+Description: Pondering for poker opponents. While the player is making up their mind, every action
+they could take is played out on a private copy of the game, and the opponents' answers to it are
+written down. Once the player acts, the answers for that action are played straight onto the real
+game, so nobody has to think on the GUI thread.
+
+An answer is a list of steps (seat index, action, state key), from the player's action up to the
+player's next turn or the end of the betting round. The state key is a fingerprint of the betting
+just before that seat acted. A step is only used while the real game matches its key, so an answer
+can never be played into a different spot than the one it was worked out for.
+
+A snapshot only copies what the betting changes: the game's and opponents' betting state, the seat
+lists, the ranges (updated on every action) and the tendency counters. Cards, hand states and the
+shared board buckets are read-only during a betting round and stay shared with the real game.
+'''
+import copy
+
+from .betting import BettingRound
+
+
+'''
+A copy of the game that can be played on from another thread: no hand history, no printing, and its
+own copy of the player's tendency stats so the real ones are left alone. rng, if given, is a
+random.Random the copied opponents decide with instead of the random module.
+'''
+def snapshot(game, rng=None):
+    copied = copy.copy(game)
+    copied.verbose = False
+    copied.history = None
+    if game.tendencies is not None:
+        copied.tendencies = game.tendencies.copy()
+    copied.opps = [_copyOpponent(opp, copied, rng) for opp in game.opps]
+    seats = {id(opp): other for opp, other in zip(game.opps, copied.opps)}
+    copied.players = [seats.get(id(player), player) for player in game.players]
+    copied.activePlayers = [seats.get(id(player), player) for player in game.activePlayers]
+    return copied
+
+
+def _copyOpponent(opp, game, rng):
+    other = copy.copy(opp)
+    other.game = game
+    other.ranges = {seat: playerRange.copy() for seat, playerRange in opp.ranges.items()}
+    other.policyLog = None # Pondered decisions may never be played.
+    if rng is not None:
+        other.rng = rng
+    return other
+
+
+'''
+Every action the player's buttons can lead to right now with `chips` chips, likeliest first. These
+follow the GUI's rules: anything the chips can't cover turns into a check.
+'''
+def humanActions(game, chips):
+    if game.activeBet:
+        actions = ['call' if chips >= game.stake + game.minbet else 'check', 'fold',
+                   'raise' if chips >= game.stake + game.minbet + 50 else 'check']
+    else:
+        actions = ['check', 'bet' if chips >= game.stake + 50 else 'check', 'fold']
+    actions.append('allin')
+    return list(dict.fromkeys(actions))
+
+
+def applyHumanAction(game, action, chips):
+    if action == 'call':
+        game.call(0)
+    elif action == 'raise':
+        game._raise(0)
+    elif action == 'bet':
+        game.bet()
+    elif action == 'fold':
+        game.fold(0)
+    elif action == 'allin':
+        game.allIn(chips)
+    else:
+        game.check(0)
+
+
+'''
+Fingerprint of the betting when seat `index` is about to act.
+'''
+def stateKey(game, index):
+    return (index, game.turn_index, game.minbet, game.activeBet, game.checked, len(game.activePlayers),
+            game.stake, tuple(opp.stake for opp in game.opps))
+
+
+'''
+Plays `action` for the player on a snapshot, then runs the betting round (see betting.py) until it's
+the player's turn again or the round is over. Returns the opponents' steps. stop() is checked
+between seats so a worker can give up early.
+'''
+def respond(game, action, chips, stop=lambda: False):
+    steps = []
+
+    def choose(opp, index):
+        key = stateKey(game, index)
+        choice = opp.chooseAction()
+        steps.append((index, choice, key))
+        return choice
+
+    applyHumanAction(game, action, chips)
+    betting = BettingRound(game, choose)
+    while not stop() and betting.step():
+        pass
+    return steps
@@ -0,0 +1,104 @@
+'''
+Name: preflop.py
+
+Authors: Joshua Welicky, Gavin Billinger, Mark Kitchin, Bisshoy Bhattacharjee, Max Biundo
+
+Description: Preflop equity table. Every starting hand falls in one of 169 classes (13 pairs, 78
+suited and 78 offsuit hands). tools/build_preflop_table.py works out each class's equity against
+1-8 random opponents ahead of time and writes it to assets/preflop_equity.bin. Here that file is
+memory-mapped, so a lookup is one read and opening it costs next to nothing.
+
+File layout: the 4 byte magic b'PFEQ', then uint8 version, uint8 class count, uint8 max opponents,
+one pad byte, then an equity for every (class, opponents) pair as a little-endian uint16 scaled by
+65535, class-major.
+'''
+import mmap
+import os
+import struct
+
+from .cardcodes import RANK_LABELS
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+TABLE_PATH = os.path.join(BASE_DIR, "../../assets/preflop_equity.bin")
+
+MAGIC = b'PFEQ'
+VERSION = 1
+CLASSES = 169
+MAX_OPPONENTS = 8
+HEADER = struct.Struct('<4sBBBx')
+SCALE = 65535
+
+_table = None
+
+
+'''
+Class index of two hole cards on the usual 13x13 grid: pairs on the diagonal, suited hands above it
+(row = high rank) and offsuit hands below it (row = low rank).
+'''
+def handClass(code1, code2):
+    rank1, rank2 = code1 >> 2, code2 >> 2
+    high, low = max(rank1, rank2), min(rank1, rank2)
+    if (code1 & 3) == (code2 & 3):
+        return high * 13 + low
+    return low * 13 + high
+
+
+def className(index):
+    row, col = divmod(index, 13)
+    if row == col:
+        return RANK_LABELS[row] * 2
+    if row > col:
+        return RANK_LABELS[row] + RANK_LABELS[col] + 's'
+    return RANK_LABELS[col] + RANK_LABELS[row] + 'o'
+
+
+'''
+Two card codes that belong to a class, for building the table.
+'''
+def classCards(index):
+    row, col = divmod(index, 13)
+    if row >= col:
+        # Pairs and suited hands: the first card is a heart. The second is a heart too for suited
+        # hands, and a spade for pairs (a pair can't share a suit).
+        return (row << 2) | 3, (col << 2) | (3 if row > col else 0)
+    return (col << 2) | 3, (row << 2) | 0
+
+
+def writeTable(path, equities):
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, CLASSES, MAX_OPPONENTS))
+        for index in range(CLASSES):
+            for opponents in range(1, MAX_OPPONENTS + 1):
+                value = round(min(max(equities[index][opponents - 1], 0.0), 1.0) * SCALE)
+                f.write(struct.pack('<H', value))
+
+
+def _load():
+    global _table
+    if _table is None:
+        with open(TABLE_PATH, 'rb') as f:
+            table = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, classes, maxOpps = HEADER.unpack_from(table, 0)
+        if magic != MAGIC or version != VERSION or classes != CLASSES or maxOpps != MAX_OPPONENTS:
+            raise ValueError(f"{TABLE_PATH} is not a preflop equity table this version can read")
+        _table = table
+    return _table
+
+
+def isAvailable():
+    try:
+        _load()
+        return True
+    except (OSError, ValueError):
+        return False
+
+
+'''
+Equity (0-1) of two hole cards against `opponents` random hands, before any board cards.
+'''
+def preflopEquity(code1, code2, opponents):
+    if opponents < 1:
+        return 1.0
+    opponents = min(opponents, MAX_OPPONENTS)
+    offset = HEADER.size + 2 * (handClass(code1, code2) * MAX_OPPONENTS + opponents - 1)
+    return struct.unpack_from('<H', _load(), offset)[0] / SCALE
@@ -0,0 +1,119 @@
+'''
+Name: pushfold.py
+
+Authors: Joshua Welicky, Gavin Billinger, Mark Kitchin, Bisshoy Bhattacharjee, Max Biundo
+
+Description: Push/fold charts for short stacks. Once a stack is only a few times the pot, the only
+moves worth making are all in or fold. tools/build_pushfold_table.py solves that game for every one
+of the 169 starting hand classes, 2-4 players and stack depths of 1 to MAX_DEPTH antes, and writes
+the answers to assets/pushfold.bin. Here the file is memory-mapped like the preflop table, so a
+lookup is one read.
+
+The game behind the charts: everyone has put in one ante and has `depth` antes behind. The first
+player shoves or folds, then the others in turn call or fold. The first call ends the betting, so
+every caller faces the same price and one calling chart covers them all.
+
+File layout: the 4 byte magic b'PFNE', then uint8 version, uint8 max players, uint8 max depth,
+uint8 class count, then a frequency for every (players, depth, role, class) as a uint8 scaled by
+255, from 2 players and depth 1 up, shove chart before call chart.
+'''
+import bisect
+import mmap
+import os
+import struct
+
+from . import preflop
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+TABLE_PATH = os.path.join(BASE_DIR, "../../assets/pushfold.bin")
+
+MAGIC = b'PFNE'
+VERSION = 1
+MIN_PLAYERS = 2
+MAX_PLAYERS = 4
+MAX_DEPTH = 12 # Deepest stack charted, in antes. Anything deeper is played normally.
+HEADER = struct.Struct('<4sBBBB')
+SCALE = 255
+PUSH = 0 # Chart for the player who shoves...
+CALL = 1 # ...and for everyone answering it.
+ROLES = 2
+
+_table = None
+_equivalents = {}
+
+
+def writeTable(path, charts):
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, MAX_PLAYERS, MAX_DEPTH, preflop.CLASSES))
+        for players in range(MIN_PLAYERS, MAX_PLAYERS + 1):
+            for depth in range(1, MAX_DEPTH + 1):
+                for role in range(ROLES):
+                    row = charts.get((players, depth, role))
+                    for index in range(preflop.CLASSES):
+                        value = row[index] if row is not None else 0.0
+                        f.write(struct.pack('<B', round(min(max(value, 0.0), 1.0) * SCALE)))
+
+
+def _load():
+    global _table
+    if _table is None:
+        with open(TABLE_PATH, 'rb') as f:
+            table = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, maxPlayers, maxDepth, classes = HEADER.unpack_from(table, 0)
+        if (magic != MAGIC or version != VERSION or maxPlayers != MAX_PLAYERS or maxDepth != MAX_DEPTH
+                or classes != preflop.CLASSES):
+            raise ValueError(f"{TABLE_PATH} is not a push/fold table this version can read")
+        _table = table
+    return _table
+
+
+def isAvailable():
+    try:
+        _load()
+        return True
+    except (OSError, ValueError):
+        return False
+
+
+'''
+Stack depth in antes for `behind` chips with `pot` in the middle and `players` in the hand, or None
+when it's too deep for the charts. An ante here is a player's share of the pot, so the stack to pot
+ratio matches the charted game.
+'''
+def stackDepth(behind, pot, players):
+    if pot <= 0 or players < 1:
+        return None
+    depth = round(behind * players / pot)
+    if depth > MAX_DEPTH:
+        return None
+    return max(depth, 1)
+
+
+'''
+How often (0-1) the hand class should shove (role PUSH) or call a shove (role CALL). Players past
+MAX_PLAYERS use the biggest chart.
+'''
+def frequency(players, depth, role, handClass):
+    players = min(max(players, MIN_PLAYERS), MAX_PLAYERS)
+    depth = min(max(depth, 1), MAX_DEPTH)
+    offset = HEADER.size + (((players - MIN_PLAYERS) * MAX_DEPTH + depth - 1) * ROLES + role) \
+        * preflop.CLASSES + handClass
+    return _load()[offset] / SCALE
+
+
+'''
+The starting hand class whose preflop equity against `opponents` random hands is closest to `share`.
+Once board cards are out, this stands in for the hole cards so the charts still apply.
+'''
+def equivalentClass(share, opponents):
+    opponents = min(max(opponents, 1), preflop.MAX_OPPONENTS)
+    if opponents not in _equivalents:
+        # Each class by its equity, weakest first. Any two cards of a class will do for the lookup.
+        pairs = sorted((preflop.preflopEquity(*preflop.classCards(index), opponents), index)
+                       for index in range(preflop.CLASSES))
+        _equivalents[opponents] = ([e for e, index in pairs], [index for e, index in pairs])
+    equities, classes = _equivalents[opponents]
+    i = bisect.bisect_left(equities, share)
+    if i == len(equities) or (i > 0 and share - equities[i - 1] < equities[i] - share):
+        i -= 1
+    return classes[i]
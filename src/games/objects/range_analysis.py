@@ -0,0 +1,261 @@
+'''
+Name: range_analysis.py
+
+Authors: Joshua Welicky, Gavin Billinger, Mark Kitchin, Bisshoy Bhattacharjee, Max Biundo
+
+Description: Range-vs-range equity. Ranges are written in the usual notation:
+
+QQ+          pairs from queens up        T9s-76s   suited connectors from T9s down to 76s
+QQ-88        queens down to eights       A2s+      suited aces, A2s up to AKs
+AKs / AKo    suited or offsuit only      AK        both
+AhKh         one exact combo             random    every combo
+
+separated by commas, and any part can carry a weight after a colon (AKo:0.5). parseRange expands a
+range into a weight for each of the 1326 combos in ranges.COMBOS. Expanded ranges are cached, so a
+range used again costs nothing.
+
+rangeVsRange gives each range's equity against all the others, with or without a partial board.
+Card clashes between players and with the board are found with the combo bitmasks
+(ranges.COMBO_MASKS). Two ranges on the turn or river are enumerated exactly: every runout, every
+pair of combos that don't clash, weighted by both ranges. Anything bigger is sampled: every player
+draws a combo from their range, deals with clashes are thrown out, and the board is finished from
+the cards left.
+'''
+import re
+from functools import lru_cache
+from itertools import combinations
+from math import comb
+
+import numpy as np
+
+from .batch_evaluator import strengthsBatch
+from .cardcodes import RANK_LETTERS, SUIT_LETTERS
+from .equity import Equity, Tally
+from .ranges import COMBOS, COMBO_COUNT, COMBO_MASKS, comboMask
+
+SAMPLES = 20000 # Deals kept per sampled calculation.
+EXACT_LIMIT = 30000000 # Most combo pairs times runouts worth enumerating.
+
+_HIGH = (COMBOS >> 2).max(axis=1)
+_LOW = (COMBOS >> 2).min(axis=1)
+_SUITED = (COMBOS[:, 0] & 3) == (COMBOS[:, 1] & 3)
+_CARD_BITS = np.arange(52, dtype=np.uint64)
+
+_PART = re.compile(r'^([2-9TJQKA])([2-9TJQKA])([so]?)(\+?)(?:-([2-9TJQKA])([2-9TJQKA])([so]?))?$')
+_COMBO = re.compile(r'^([2-9TJQKA])([scdh])([2-9TJQKA])([scdh])$')
+
+
+def _rank(letter):
+    return RANK_LETTERS.index(letter)
+
+
+'''
+Combos of one rank pair: a pair, or two ranks suited ('s'), offsuit ('o') or either ('').
+'''
+def _classMask(high, low, suitedness):
+    mask = (_HIGH == max(high, low)) & (_LOW == min(high, low))
+    if suitedness == 's':
+        mask &= _SUITED
+    elif suitedness == 'o':
+        mask &= ~_SUITED
+    return mask
+
+
+'''
+Combo mask for one comma-separated part of a range, without its weight.
+'''
+def _partMask(part):
+    if part in ('random', 'any', '*', '100%'):
+        return np.ones(COMBO_COUNT, dtype=bool)
+    match = _COMBO.match(part)
+    if match:
+        first = (_rank(match.group(1)) << 2) | SUIT_LETTERS.index(match.group(2))
+        second = (_rank(match.group(3)) << 2) | SUIT_LETTERS.index(match.group(4))
+        if first == second:
+            raise ValueError(f"{part} holds the same card twice")
+        mask = np.zeros(COMBO_COUNT, dtype=bool)
+        mask[(COMBO_MASKS == np.uint64((1 << first) | (1 << second)))] = True
+        return mask
+
+    match = _PART.match(part)
+    if not match:
+        raise ValueError(f"can't read range part {part!r}")
+    first, second, suitedness, plus, toFirst, toSecond, toSuitedness = match.groups()
+    high, low = _rank(first), _rank(second)
+    if high < low:
+        high, low = low, high
+    mask = np.zeros(COMBO_COUNT, dtype=bool)
+    if high == low:
+        if suitedness:
+            raise ValueError(f"{part}: pairs can't be suited or offsuit")
+        top = 12 if plus else high
+        bottom = high
+        if toFirst:
+            if toFirst != toSecond:
+                raise ValueError(f"{part}: a pair can only run down to another pair")
+            bottom = _rank(toFirst)
+        for rank in range(min(bottom, top), max(bottom, top) + 1):
+            mask |= _classMask(rank, rank, '')
+        return mask
+
+    if plus:
+        # Kicker from the one given up to one under the top card: A2s+ is A2s-AKs.
+        for kicker in range(low, high):
+            mask |= _classMask(high, kicker, suitedness)
+        return mask
+    if not toFirst:
+        return _classMask(high, low, suitedness)
+
+    endHigh, endLow = sorted((_rank(toFirst), _rank(toSecond)), reverse=True)
+    if toSuitedness != suitedness:
+        raise ValueError(f"{part}: both ends need the same suitedness")
+    if endHigh == high:
+        # Same top card, kicker range: AKo-ATo.
+        for kicker in range(min(low, endLow), max(low, endLow) + 1):
+            mask |= _classMask(high, kicker, suitedness)
+    elif endHigh - endLow == high - low:
+        # Same gap, both cards move together: T9s-76s.
+        for shift in range(min(0, endHigh - high), max(0, endHigh - high) + 1):
+            mask |= _classMask(high + shift, low + shift, suitedness)
+    else:
+        raise ValueError(f"{part}: ends need the same top card or the same gap")
+    return mask
+
+
+'''
+Expands a range in standard notation into a weight (0-1) for every combo of ranges.COMBOS. Where
+parts overlap, the later part's weight wins. Raises ValueError for anything it can't read. The
+result is cached and read-only.
+'''
+@lru_cache(maxsize=256)
+def parseRange(text):
+    weights = np.zeros(COMBO_COUNT)
+    for part in text.replace(' ', '').split(','):
+        if not part:
+            continue
+        weight = 1.0
+        if ':' in part:
+            part, value = part.split(':', 1)
+            try:
+                weight = float(value)
+            except ValueError:
+                raise ValueError(f"bad weight in range part {part}:{value}") from None
+        weights[_partMask(part)] = weight
+    weights.flags.writeable = False
+    return weights
+
+
+'''
+How many combos a range holds, counting weights (AKs is 4, QQ+ is 18).
+'''
+def comboCount(text):
+    return float(parseRange(text).sum())
+
+
+def _weights(spec, deadMask):
+    weights = parseRange(spec) if isinstance(spec, str) else np.asarray(spec, dtype=np.float64)
+    return np.where((COMBO_MASKS & np.uint64(deadMask)) != 0, 0.0, weights)
+
+
+'''
+Exact heads-up equity over every runout. Returns the two Equity results, with every dealt matchup
+counted as a sample.
+'''
+def _exactHeadsUp(weights, board):
+    boardMask = comboMask(board)
+    deck = [code for code in range(52) if not boardMask >> code & 1]
+    live = [np.flatnonzero(w) for w in weights]
+    total = wins = ties = 0.0
+    deals = 0
+    for runout in combinations(deck, 5 - len(board)):
+        fullBoard = list(board) + list(runout)
+        runoutMask = np.uint64(comboMask(runout))
+        sides = []
+        for w, rows in zip(weights, live):
+            rows = rows[(COMBO_MASKS[rows] & runoutMask) == 0]
+            cards = np.empty((len(rows), 7), dtype=np.int8)
+            cards[:, :2] = COMBOS[rows]
+            cards[:, 2:] = fullBoard
+            sides.append((w[rows], COMBO_MASKS[rows], strengthsBatch(cards)))
+        (w1, m1, s1), (w2, m2, s2) = sides
+        pair = np.outer(w1, w2) * ((m1[:, None] & m2[None, :]) == 0)
+        total += pair.sum()
+        deals += int(np.count_nonzero(pair))
+        wins += (pair * (s1[:, None] > s2[None, :])).sum()
+        ties += (pair * (s1[:, None] == s2[None, :])).sum()
+    if total <= 0:
+        raise ValueError("the ranges can't all be dealt around the board")
+    win, tie = float(wins / total), float(ties / total)
+    lose = 1.0 - win - tie
+    return [Equity(win, tie, lose, win + tie / 2, deals), Equity(lose, tie, win, lose + tie / 2, deals)]
+
+
+'''
+Sampled equity for any number of ranges. Returns one Equity per range.
+'''
+def _sampled(weights, board, samples, seed):
+    rng = np.random.default_rng(seed)
+    probabilities = []
+    for w in weights:
+        if w.sum() <= 0:
+            raise ValueError("a range has no combos left around the board")
+        probabilities.append(w / w.sum())
+    tallies = [Tally() for _ in weights]
+    missing = 5 - len(board)
+    kept = attempts = 0
+    while kept < samples:
+        attempts += 1
+        if attempts > 50 and kept == 0:
+            raise ValueError("the ranges can't all be dealt around the board")
+        count = samples - kept
+        picks = [rng.choice(COMBO_COUNT, size=count, p=p) for p in probabilities]
+        used = np.full(count, np.uint64(comboMask(board)))
+        ok = np.ones(count, dtype=bool)
+        for pick in picks:
+            masks = COMBO_MASKS[pick]
+            ok &= (used & masks) == 0
+            used |= masks
+        picks = [pick[ok] for pick in picks]
+        used = used[ok]
+        count = len(used)
+        if not count:
+            continue
+
+        fullBoard = np.empty((count, 5), dtype=np.int8)
+        fullBoard[:, :len(board)] = board
+        if missing:
+            # Cards someone holds get keys that always sort last.
+            keys = rng.random((count, 52), dtype=np.float32)
+            keys[((used[:, None] >> _CARD_BITS) & np.uint64(1)).astype(bool)] = 2.0
+            fullBoard[:, len(board):] = np.argpartition(keys, missing - 1, axis=1)[:, :missing]
+        strengths = np.array([strengthsBatch(np.concatenate((COMBOS[pick], fullBoard), axis=1))
+                              for pick in picks])
+        best = strengths.max(axis=0)
+        winners = (strengths == best).sum(axis=0)
+        for i, strength in enumerate(strengths):
+            top = strength == best
+            share = np.where(top, 1.0 / winners, 0.0)
+            tallies[i] += Tally(int((top & (winners == 1)).sum()), int((top & (winners > 1)).sum()), count,
+                                float(share.sum()), float((share * share).sum()))
+        kept += count
+    return [tally.result() for tally in tallies]
+
+
+'''
+Equity of each range against all the others. ranges is a list of range strings (or weight arrays
+over ranges.COMBOS), one per player, and board the card codes dealt so far (0, 3, 4 or 5). Heads-up
+spots small enough are enumerated exactly, the rest use `samples` deals. Returns an equity.Equity
+per range, in the same order.
+'''
+def rangeVsRange(ranges, board=(), samples=SAMPLES, seed=None, exactLimit=EXACT_LIMIT):
+    board = list(board)
+    if len(ranges) < 2:
+        raise ValueError("need at least two ranges")
+    deadMask = comboMask(board)
+    weights = [_weights(spec, deadMask) for spec in ranges]
+    if len(weights) == 2 and len(board) >= 3:
+        runouts = comb(52 - len(board), 5 - len(board))
+        work = np.count_nonzero(weights[0]) * np.count_nonzero(weights[1]) * runouts
+        if work <= exactLimit:
+            return _exactHeadsUp(weights, board)
+    return _sampled(weights, board, samples, seed)
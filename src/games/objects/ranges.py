@@ -0,0 +1,204 @@
+'''
+Name: ranges.py
+
+Authors: Joshua Welicky, Gavin Billinger, Mark Kitchin, Bisshoy Bhattacharjee, Max Biundo
+
+Description: Hand range tracking for the poker opponents. A Range is a weight for each of the 1326
+two-card combos a player could be holding. It starts out even, and every action the player takes
+multiplies in how likely that action is with each combo (Bayes' rule, one NumPy multiply). Combos
+holding cards we can see are zeroed as they show up.
+
+How strong a combo is only depends on the board, so every combo's strength bucket is worked out once
+per street (comboBuckets) and shared by everyone's ranges.
+
+rangeEquity samples opponent hands from their ranges and finishes the board with the batch
+evaluator. Live decisions give it the opponent's time budget, like equity.budgetedEquity.
+'''
+import time
+from itertools import combinations
+
+import numpy as np
+
+from .batch_evaluator import strengthsBatch
+from .cardcodes import cardMask
+from .equity import MIN_SAMPLES, TARGET_ERROR, Tally, tallyShowdowns
+from . import preflop
+
+COMBOS = np.array(list(combinations(range(52), 2)), dtype=np.int8) # (1326, 2) card codes.
+COMBO_COUNT = len(COMBOS)
+_BITS = np.uint64(1) << COMBOS.astype(np.uint64)
+COMBO_MASKS = _BITS[:, 0] | _BITS[:, 1] # Card bitmask of each combo.
+# The combos holding each card, for card removal.
+CARD_COMBOS = [np.flatnonzero((COMBOS == code).any(axis=1)) for code in range(52)]
+_CARD_BITS = np.arange(52, dtype=np.uint64)
+
+'''
+How likely each action is for a combo in each strength bucket (weakest first). Only the shape
+matters, since weights are renormalised: strong hands bet and raise, weak ones check, calls lean
+toward the middle and top.
+'''
+BUCKETS = 10
+ACTION_LIKELIHOODS = {
+    'check': np.linspace(1.0, 0.35, BUCKETS),
+    'call': np.linspace(0.45, 1.0, BUCKETS),
+    'bet': np.linspace(0.25, 1.0, BUCKETS) ** 1.5,
+    'raise': np.linspace(0.15, 1.0, BUCKETS) ** 2,
+}
+RANGE_SAMPLES = 3000 # Samples per equity query against ranges, when there's no time budget.
+RANGE_BATCH = 1000 # Samples per batch when working to a time budget.
+
+_preflopBuckets = None
+
+
+'''
+Row of COMBOS holding these two cards, in either order.
+'''
+def comboIndex(code1, code2):
+    low, high = min(code1, code2), max(code1, code2)
+    return low * (103 - low) // 2 + high - low - 1
+
+
+def comboMask(codes):
+    return cardMask(codes)
+
+
+'''
+Strength bucket (0 to BUCKETS-1) of every combo on this board, by where it ranks among the combos
+that don't clash with the board. Before the flop the preflop equity table ranks them instead.
+'''
+def comboBuckets(board):
+    board = list(board)
+    if not board:
+        return preflopBuckets()
+    live = (COMBO_MASKS & np.uint64(comboMask(board))) == 0
+    cards = np.empty((int(live.sum()), 2 + len(board)), dtype=np.int8)
+    cards[:, :2] = np.compress(live, COMBOS, axis=0) # Several times faster than COMBOS[live].
+    cards[:, 2:] = board
+    # Combos holding a board card can't exist, they just get the lowest bucket.
+    strengths = np.zeros(COMBO_COUNT, dtype=np.int32)
+    strengths[live] = strengthsBatch(cards)
+    ordered = np.sort(strengths[live])
+    # Share of live combos weaker than this one (ties count half), so equal hands share a bucket.
+    below = np.searchsorted(ordered, strengths, 'left')
+    same = np.searchsorted(ordered, strengths, 'right') - below
+    percentile = (below + 0.5 * same) / len(ordered)
+    return np.minimum((percentile * BUCKETS).astype(np.intp), BUCKETS - 1)
+
+
+'''
+Buckets before the flop, from the preflop equity table. They never change, so they are worked out
+once.
+'''
+def preflopBuckets():
+    global _preflopBuckets
+    if _preflopBuckets is None:
+        if preflop.isAvailable():
+            equities = np.array([preflop.preflopEquity(int(a), int(b), 1) for a, b in COMBOS])
+            order = np.argsort(equities, kind='stable')
+            percentile = np.empty(COMBO_COUNT)
+            percentile[order] = np.arange(COMBO_COUNT) / COMBO_COUNT
+            _preflopBuckets = np.minimum((percentile * BUCKETS).astype(np.intp), BUCKETS - 1)
+        else:
+            _preflopBuckets = np.full(COMBO_COUNT, BUCKETS // 2, dtype=np.intp)
+    return _preflopBuckets
+
+
+class Range:
+    def __init__(self, dead=()):
+        self.weights = np.ones(COMBO_COUNT)
+        for code in dead:
+            self.removeCard(code)
+
+    '''
+    Drops every combo holding this card (we can see it, so they can't have it).
+    '''
+    def removeCard(self, code):
+        self.weights[CARD_COMBOS[code]] = 0.0
+
+    '''
+    Bayes update for an action seen with the combo buckets of the current street.
+    '''
+    def update(self, action, buckets):
+        likelihood = ACTION_LIKELIHOODS.get(action)
+        if likelihood is None:
+            return
+        self.weights *= likelihood[buckets]
+        top = self.weights.max()
+        if top > 0:
+            self.weights /= top # Keeps repeated updates from underflowing.
+
+    '''
+    Combo probabilities with anything clashing with `dead` (a card bitmask) removed. Falls back to
+    every possible combo if the reads rule them all out.
+    '''
+    def probabilities(self, dead=0):
+        clash = (COMBO_MASKS & np.uint64(dead)) != 0
+        weights = np.where(clash, 0.0, self.weights)
+        total = weights.sum()
+        if total <= 0:
+            weights = (~clash).astype(np.float64)
+            total = weights.sum()
+        return weights / total
+
+    def copy(self):
+        other = Range()
+        other.weights = self.weights.copy()
+        return other
+
+
+'''
+One batch of `samples` deals against the ranges, each opponent's hand drawn with its combo
+probabilities. Deals that hand the same card to two players are thrown out. Returns an equity.Tally.
+'''
+def _rangeBatch(hole, board, dead, probabilities, samples, rng):
+    picks = [rng.choice(COMBO_COUNT, size=samples, p=p) for p in probabilities]
+
+    used = np.full(samples, np.uint64(dead))
+    ok = np.ones(samples, dtype=bool)
+    for pick in picks:
+        masks = COMBO_MASKS[pick]
+        ok &= (used & masks) == 0
+        used |= masks
+    picks = [pick[ok] for pick in picks]
+    used = used[ok]
+    count = int(ok.sum())
+
+    # Finish each board from the cards nobody holds: dead cards get keys that always sort last.
+    missing = 5 - len(board)
+    fullBoard = np.empty((count, 5), dtype=np.int8)
+    fullBoard[:, :len(board)] = board
+    if missing:
+        keys = rng.random((count, 52), dtype=np.float32)
+        keys[((used[:, None] >> _CARD_BITS) & np.uint64(1)).astype(bool)] = 2.0
+        fullBoard[:, len(board):] = np.argpartition(keys, missing - 1, axis=1)[:, :missing]
+
+    hero = np.concatenate((np.broadcast_to(np.array(hole, dtype=np.int8), (count, 2)), fullBoard), axis=1)
+    opps = [np.concatenate((COMBOS[pick], fullBoard), axis=1) for pick in picks]
+    return tallyShowdowns(hero, opps)
+
+
+'''
+Equity of hole on the (partial) board against one opponent per range, each opponent's hand drawn
+from their range. Returns an equity.Equity.
+
+With budgetMs it works like equity.budgetedEquity: batches of RANGE_BATCH deals until the time is
+up or the standard error is good enough, at least one batch always. Without it, `samples` deals
+(a few are lost to card clashes).
+'''
+def rangeEquity(hole, board, ranges, samples=RANGE_SAMPLES, seed=None, budgetMs=None):
+    deadline = time.perf_counter() + budgetMs / 1000 if budgetMs is not None else None
+    rng = np.random.default_rng(seed)
+    hole, board = list(hole), list(board)
+    dead = comboMask(hole + board)
+    probabilities = [r.probabilities(dead) for r in ranges]
+    if deadline is None:
+        return _rangeBatch(hole, board, dead, probabilities, samples, rng).result()
+
+    total = Tally()
+    while True:
+        total = total + _rangeBatch(hole, board, dead, probabilities, RANGE_BATCH, rng)
+        if time.perf_counter() >= deadline:
+            break
+        if total.samples >= MIN_SAMPLES and total.stdError() <= TARGET_ERROR:
+            break
+    return total.result()
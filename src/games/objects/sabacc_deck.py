@@ -5,7 +5,6 @@ Description: Implementation for Sabaac playing card and card deck. Methods are v
 with slight modifications for Sabacc.
 """
 import random
-from .deck import AnimatedCard
 
 class Sabacc_Card:
     def __init__(self, sign, rank, suit):
@@ -76,8 +76,10 @@ class SabaccAI:
     Outputs: The best swap option (card to swap, new hand value) or None if no beneficial swap exists."""
     def checkSwapOptions(self, hand, discard_value):
         possible_swaps = []
+        # Sum the hand once, then each swap just trades one value for the discard.
+        hand_value = sum(c.rank for c in hand)
         for card in hand:
-            new_hand_value = sum(c.rank for c in hand if c != card) + discard_value
+            new_hand_value = hand_value - card.rank + discard_value
             possible_swaps.append((card, new_hand_value))
         track_best = (None, 1000)
         for i in range(len(possible_swaps)):
@@ -0,0 +1,84 @@
+'''
+Name: settlement.py
+
+Authors: Joshua Welicky, Gavin Billinger, Mark Kitchin, Bisshoy Bhattacharjee, Max Biundo
+
+Description: Pays out a poker pot, side pots included. Each player's contribution (their stake) and
+showdown strength (from evaluator.showdown, -1 for anyone who folded) go in, and what every player
+collects comes out.
+
+Whenever someone is all in for less than the others, the pot is cut into layers. Everyone who put
+in at least that much is in a layer, but only players who haven't folded can win it. Each layer goes
+to the best hand among the players who can win it, split evenly when hands tie. Odd chips go one at
+a time to the tied players nearest seat 0.
+
+Players are sorted once by contribution and then walked from the biggest stake down in a single
+pass, so settling n players takes O(n log n) on top of writing out each pot's winners.
+'''
+
+
+class Pot:
+    def __init__(self, amount, contenders, winners):
+        self.amount = amount
+        self.contenders = contenders # How many players who haven't folded are in this pot.
+        self.winners = winners # Seats splitting it, in seat order.
+
+    def __repr__(self):
+        return f"Pot({self.amount}, contenders={self.contenders}, winners={self.winners})"
+
+
+'''
+Cuts the chips into a main pot and side pots, smallest layer (the main pot) first, and works out who
+wins each one. A layer that only folded players put chips into is added to the layer below it.
+'''
+def buildPots(contributions, strengths):
+    seats = sorted(range(len(contributions)), key=lambda seat: contributions[seat], reverse=True)
+    layers = [] # Built from the top (biggest stake) down.
+    best = -1
+    leaders = [] # Live seats holding the best hand among everyone seen so far.
+    live = 0
+    i = 0
+    while i < len(seats):
+        level = contributions[seats[i]]
+        if level <= 0:
+            break
+        # Everyone at this level joins. The deeper stacks above were already added.
+        while i < len(seats) and contributions[seats[i]] == level:
+            seat = seats[i]
+            if strengths[seat] >= 0:
+                live += 1
+                if strengths[seat] > best:
+                    best = strengths[seat]
+                    leaders = [seat]
+                elif strengths[seat] == best:
+                    leaders.append(seat)
+            i += 1
+        below = contributions[seats[i]] if i < len(seats) else 0
+        if below < 0:
+            below = 0
+        layers.append(((level - below) * i, live, list(leaders)))
+
+    pots = []
+    carried = 0
+    for amount, live, leaders in layers:
+        if not live:
+            carried += amount
+            continue
+        pots.append(Pot(amount + carried, live, sorted(leaders)))
+        carried = 0
+    pots.reverse()
+    return pots
+
+
+'''
+What each seat collects from the pot. Returns (payouts, pots) where payouts[i] is seat i's share of
+every pot it won.
+'''
+def settle(contributions, strengths):
+    payouts = [0] * len(contributions)
+    pots = buildPots(contributions, strengths)
+    for pot in pots:
+        share, oddChips = divmod(pot.amount, len(pot.winners))
+        for n, seat in enumerate(pot.winners):
+            payouts[seat] += share + (1 if n < oddChips else 0)
+    return payouts, pots
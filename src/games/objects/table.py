@@ -0,0 +1,183 @@
+'''
+Name: table.py
+
+Authors: Joshua Welicky, Gavin Billinger, Mark Kitchin, Bisshoy Bhattacharjee, Max Biundo
+
+Description: Headless poker table. TableEngine plays complete hands (deal, flop, turn, river, betting,
+showdown and paying out chips) with the same Poker and Opponent rules the GUI uses, but with no Qt,
+no dialogs and no printing, so thousands of hands can be played per second to measure and tune
+opponents offline.
+
+The user's seat (index 0) is played by a HeroSeat, which is an Opponent that keeps its cards and
+stake on the Poker object like the human player does.
+'''
+import random
+
+from .opponent import Opponent, DEFAULT_BUDGET_MS, MIN_SAMPLING_MS
+from .poker_game import Poker
+from .betting import BettingRound, PLAYER_TURN, ROUND_OVER
+
+# Opponents think with the made-hand table by default. Anything under opponent.MIN_SAMPLING_MS does.
+FAST_BUDGET_MS = 0
+
+
+'''
+Plays seat 0 with the opponent logic. Poker keeps that seat's hand, stake and fold flag on the game
+itself, so those attributes are passed straight through to it.
+'''
+class HeroSeat(Opponent):
+    def __init__(self, name, game, chips, params=None, budgetMs=DEFAULT_BUDGET_MS):
+        super().__init__(name, game, 0, params, budgetMs)
+        self.chipTotal = chips
+
+    @property
+    def oppHand(self):
+        return self.game.playerHand
+
+    @oppHand.setter
+    def oppHand(self, hand):
+        self.game.playerHand = hand
+
+    @property
+    def handState(self):
+        return self.game.handState
+
+    @handState.setter
+    def handState(self, state):
+        self.game.handState = state
+
+    @property
+    def stake(self):
+        return self.game.stake
+
+    @stake.setter
+    def stake(self, stake):
+        self.game.stake = stake
+
+    @property
+    def folded(self):
+        return self.game.folded
+
+    @folded.setter
+    def folded(self, folded):
+        self.game.folded = folded
+
+    '''
+    Same choice as an opponent, but held to the limits the GUI buttons put on the player: anything
+    the chips can't cover turns into a check.
+    '''
+    def chooseAction(self):
+        action = super().chooseAction()
+        game = self.game
+        if action == 'call' and self.chipTotal < game.stake + game.minbet:
+            return 'check'
+        if action == 'raise' and self.chipTotal < game.stake + game.minbet + 50:
+            return 'check'
+        if action == 'bet' and self.chipTotal < game.stake + 50:
+            return 'check'
+        return action
+
+
+class TableEngine:
+    '''
+    opponents: how many opponents sit with the hero (1-3 like the GUI, or more for bigger tables).
+    chips: starting chips for every seat. None gives the opponents the GUI's random stacks and the
+    hero the same as the first opponent.
+    heroParams/oppParams: play style overrides for the hero and each opponent (see
+    opponent.DEFAULT_PARAMS). oppParams may be one dict for everyone or a list with one per seat.
+    seed: seeds the random module so a run can be replayed.
+    history: a hand_history.HandRecorder to write every hand to.
+    gameClass: the game to play, Poker or a variant of it like omaha_game.Omaha.
+    samples: fixed samples per equity estimate for every seat instead of the clock (see
+    Opponent.samples), so a seeded run replays the same under any load.
+    '''
+    def __init__(self, opponents=3, chips=None, heroParams=None, oppParams=None,
+                 budgetMs=FAST_BUDGET_MS, seed=None, history=None, gameClass=Poker, samples=None):
+        if seed is not None:
+            random.seed(seed)
+        self.game = gameClass(verbose=False, history=history)
+        # Range reads only feed sampled equity, so the fast made-hand mode skips them.
+        self.game.trackRanges = self.game.trackRanges and budgetMs >= MIN_SAMPLING_MS
+        self.game.oppNo = opponents
+        self.game.createOpponents(self.game)
+        for i, opp in enumerate(self.game.opps):
+            params = oppParams[i] if isinstance(oppParams, (list, tuple)) else oppParams
+            if params:
+                opp.params.update(params)
+            opp.budgetMs = budgetMs
+            opp.samples = samples
+            if chips is not None:
+                opp.chipTotal = chips
+        heroChips = chips if chips is not None else self.game.opps[0].chipTotal
+        self.hero = HeroSeat("Player", self.game, heroChips, heroParams, budgetMs)
+        self.hero.samples = samples
+        self.seats = [self.hero] + self.game.opps # Seat i is game.players[i].
+        self.betting = BettingRound(self.game)
+        self.startingChips = [seat.chipTotal for seat in self.seats]
+        self.handsPlayed = 0
+        self.showdowns = 0
+
+    '''
+    Chips won (or lost, if negative) by every seat since the table started.
+    '''
+    def winnings(self):
+        return [seat.chipTotal - start for seat, start in zip(self.seats, self.startingChips)]
+
+    '''
+    True once the hero is broke or every opponent is, same as the GUI ending the game.
+    '''
+    def isOver(self):
+        return self.hero.chipTotal <= 0 or not any(opp.active for opp in self.game.opps)
+
+    '''
+    Plays one betting round on the same state machine the poker screen runs (see betting.py), with
+    the hero deciding whenever seat 0 is up. Returns False if the hand ended because everyone else
+    folded.
+    '''
+    def bettingRound(self):
+        betting = self.betting
+        betting.start()
+        while betting.run() == PLAYER_TURN:
+            betting.events.clear()
+            self.hero.decision(0)
+            betting.resume()
+        betting.events.clear()
+        return betting.state == ROUND_OVER
+
+    '''
+    Pays out the pot like PokerScreen.gameOver: everyone pays their stake and collects what they won,
+    side pots included. Returns (winners, hand name).
+    '''
+    def settle(self):
+        payouts, winners, handRank = self.game.settle()
+        for seat, won in zip(self.seats, payouts):
+            seat.chipTotal += won - seat.stake
+        return winners, handRank
+
+    '''
+    Plays one complete hand and gets the table ready for the next. Returns (winners, hand name).
+    '''
+    def playHand(self):
+        game = self.game
+        game.playerChips = self.hero.chipTotal
+        game.deal()
+        for street in (game.flop, game.turn, game.river):
+            street()
+            if not self.bettingRound():
+                break
+        else:
+            self.showdowns += 1
+        result = self.settle()
+        game.reset()
+        self.handsPlayed += 1
+        return result
+
+    '''
+    Plays up to `hands` hands, stopping early if the game is over. Returns how many were played.
+    '''
+    def run(self, hands):
+        played = 0
+        while played < hands and not self.isOver():
+            self.playHand()
+            played += 1
+        return played
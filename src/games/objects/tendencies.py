@@ -0,0 +1,162 @@
+'''
+Name: tendencies.py
+
+Authors: Joshua Welicky, Gavin Billinger, Mark Kitchin, Bisshoy Bhattacharjee, Max Biundo
+
+Description: Remembers how the human plays poker so the opponents can take advantage of it. Poker
+counts the player's actions as they happen, each one bumping a counter or two:
+
+VPIP - share of hands where they put chips in by choice (call, bet, raise or all in). There is no
+       betting before the flop here, so any street counts.
+Aggression factor - (bets + raises) / calls.
+Fold to bet - share of the times they faced a bet that they folded.
+Showdown frequency - share of hands they took to a showdown.
+
+There are two sets of counters: this session, and lifetime. Lifetime is saved to a small binary file
+in the user's home folder after every hand, so it survives leaving the table and closing the game.
+
+The opponents' adjustments (bluff more against someone who folds too much, call wider against
+someone who bets too much) only change when a hand ends, so they are worked out then and a
+decision just reads two numbers.
+'''
+import os
+import struct
+
+STATS_PATH = os.path.join(os.path.expanduser("~"), ".casino_poker_tendencies")
+MAGIC = b'TEND'
+VERSION = 1
+COUNTERS = ("hands", "voluntary", "bets", "raises", "calls", "facedBets", "foldsToBets", "showdowns")
+RECORD = struct.Struct('<4sB3x' + 'I' * len(COUNTERS))
+
+MIN_HANDS = 20 # Don't read anything into fewer hands than this.
+# What a "normal" player looks like, the exploits kick in past these.
+NORMAL_FOLD_TO_BET = 0.5
+NORMAL_AGGRESSION = 1.5
+MAX_BLUFF_SHIFT = 0.15
+MAX_CALL_SHIFT = 0.08
+
+
+class Counts:
+    def __init__(self, values=None):
+        self.counts = dict(zip(COUNTERS, values or [0] * len(COUNTERS)))
+
+    def bump(self, name):
+        self.counts[name] += 1
+
+    def values(self):
+        return [self.counts[name] for name in COUNTERS]
+
+    def vpip(self):
+        hands = self.counts["hands"]
+        return self.counts["voluntary"] / hands if hands else 0.0
+
+    def aggression(self):
+        aggressive = self.counts["bets"] + self.counts["raises"]
+        calls = self.counts["calls"]
+        return aggressive / calls if calls else float(aggressive)
+
+    def foldToBet(self):
+        faced = self.counts["facedBets"]
+        return self.counts["foldsToBets"] / faced if faced else 0.0
+
+    def showdownRate(self):
+        hands = self.counts["hands"]
+        return self.counts["showdowns"] / hands if hands else 0.0
+
+    def __str__(self):
+        return (f"{self.counts['hands']} hands, VPIP {self.vpip():.0%}, AF {self.aggression():.2f}, "
+                f"fold to bet {self.foldToBet():.0%}, showdowns {self.showdownRate():.0%}")
+
+
+class Tendencies:
+    def __init__(self, lifetime=None, path=STATS_PATH):
+        self.path = path
+        self.session = Counts()
+        self.lifetime = lifetime or Counts()
+        self.putChipsIn = False # Whether they've put chips in by choice this hand.
+        self.bluffShift = 0.0 # Added to the opponents' bluff chance.
+        self.callShift = 0.0 # Added to the opponents' fold margin when the player bet.
+        self.updateExploits()
+
+    '''
+    Lifetime stats from the file, or a blank slate if there isn't a readable one.
+    '''
+    @classmethod
+    def load(cls, path=STATS_PATH):
+        try:
+            with open(path, 'rb') as f:
+                magic, version, *values = RECORD.unpack(f.read(RECORD.size))
+        except (OSError, struct.error):
+            return cls(path=path)
+        if magic != MAGIC or version != VERSION:
+            return cls(path=path)
+        return cls(Counts(values), path)
+
+    def save(self):
+        if self.path is None:
+            return # A copy, see copy().
+        try:
+            tmp = self.path + ".tmp"
+            with open(tmp, 'wb') as f:
+                f.write(RECORD.pack(MAGIC, VERSION, *self.lifetime.values()))
+            os.replace(tmp, self.path) # Never leaves a half written file behind.
+        except OSError:
+            pass # Stats are nice to have, not worth interrupting the game over.
+
+    def bump(self, name):
+        self.session.bump(name)
+        self.lifetime.bump(name)
+
+    def startHand(self):
+        self.putChipsIn = False
+        self.bump("hands")
+
+    '''
+    Counts one of the player's actions. facingBet says whether there was a bet to answer.
+    '''
+    def record(self, action, facingBet):
+        if facingBet:
+            self.bump("facedBets")
+        if action == 'fold':
+            if facingBet:
+                self.bump("foldsToBets")
+            return
+        if action == 'check':
+            return
+        if action in ('bet', 'raise'):
+            self.bump("bets" if action == 'bet' else "raises")
+        else:
+            self.bump("calls")
+        if not self.putChipsIn:
+            self.putChipsIn = True
+            self.bump("voluntary")
+
+    '''
+    Copy with its own counters that never touches the stats file (see ponder.snapshot).
+    '''
+    def copy(self):
+        other = Tendencies(Counts(self.lifetime.values()), path=None)
+        other.session = Counts(self.session.values())
+        other.putChipsIn = self.putChipsIn
+        other.bluffShift = self.bluffShift
+        other.callShift = self.callShift
+        return other
+
+    def endHand(self, showdown):
+        if showdown:
+            self.bump("showdowns")
+        self.updateExploits()
+        self.save()
+
+    '''
+    Works out how the opponents should adjust, from the lifetime stats.
+    '''
+    def updateExploits(self):
+        stats = self.lifetime
+        if stats.counts["hands"] < MIN_HANDS:
+            self.bluffShift = self.callShift = 0.0
+            return
+        # Folds too much: bluff more. Calls everything: bluff less.
+        self.bluffShift = max(-MAX_BLUFF_SHIFT, min(MAX_BLUFF_SHIFT, stats.foldToBet() - NORMAL_FOLD_TO_BET))
+        # Bets a lot: their bets mean less, so fold less against them.
+        self.callShift = max(0.0, min(MAX_CALL_SHIFT, 0.04 * (stats.aggression() - NORMAL_AGGRESSION)))
@@ -0,0 +1,174 @@
+'''
+Name: tournament.py
+
+Authors: Joshua Welicky, Gavin Billinger, Mark Kitchin, Bisshoy Bhattacharjee, Max Biundo
+
+Description: Freeze-out tournaments between opponent configurations. Each match seats every
+configuration at a headless TableEngine and plays until the game is over (or a hand cap is hit).
+The chip leader at that point wins. Matches are independent, so they are spread over a
+multiprocessing pool and their results merged as they come in.
+
+Every match gets its own seed from one SeedSequence, so the same base seed gives the same results no
+matter how many workers run them. Seats rotate from match to match so no configuration keeps the
+user's seat.
+'''
+import math
+import multiprocessing
+import time
+
+import numpy as np
+
+from .table import TableEngine, FAST_BUDGET_MS
+
+STARTING_CHIPS = 1000
+MAX_HANDS = 2000 # A match still going after this many hands goes to the chip leader.
+Z_95 = 1.96
+
+
+'''
+Running mean and variance (Welford). Two of them can be merged, so every worker's numbers can be
+folded together without keeping the samples.
+'''
+class RunningStats:
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0 # Sum of squared differences from the mean.
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def merge(self, other):
+        if other.count == 0:
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def stdError(self):
+        return math.sqrt(self.variance() / self.count) if self.count else 0.0
+
+
+'''
+Everything known about one configuration so far. Win rate comes with a 95% confidence interval.
+'''
+class ConfigResult:
+    def __init__(self, name):
+        self.name = name
+        self.wins = RunningStats() # 1 for a match won, 0 otherwise.
+        self.chips = RunningStats() # Chips won or lost per match.
+
+    def winRate(self):
+        return self.wins.mean
+
+    def confidence(self):
+        return Z_95 * self.wins.stdError()
+
+    def __str__(self):
+        return (f"{self.name}: wins {100 * self.winRate():.1f}% +/- {100 * self.confidence():.1f}% "
+                f"over {self.wins.count} matches, {self.chips.mean:+.0f} chips/match")
+
+
+class TournamentResult:
+    def __init__(self, names):
+        self.configs = [ConfigResult(name) for name in names]
+        self.matches = 0
+        self.hands = 0
+        self.seconds = 0.0
+
+    def add(self, match):
+        order, winner, hands, chips = match
+        self.matches += 1
+        self.hands += hands
+        for seat, config in enumerate(order):
+            self.configs[config].wins.add(1.0 if seat == winner else 0.0)
+            self.configs[config].chips.add(chips[seat])
+
+    def handsPerSecond(self):
+        return self.hands / self.seconds if self.seconds else 0.0
+
+    def matchesPerSecond(self):
+        return self.matches / self.seconds if self.seconds else 0.0
+
+    def __str__(self):
+        lines = [str(config) for config in self.configs]
+        lines.append(f"{self.matches} matches, {self.hands} hands in {self.seconds:.1f}s "
+                     f"({self.matchesPerSecond():.1f} matches/s, {self.handsPerSecond():.0f} hands/s)")
+        return "\n".join(lines)
+
+
+'''
+Which configuration sits in which seat for a match. Seat 0 is the table's hero seat.
+'''
+def seatOrder(match, configs):
+    shift = match % configs
+    return [(seat + shift) % configs for seat in range(configs)]
+
+
+'''
+Plays one match. Takes (match number, seed, configs, chips, budgetMs, samples) so it can be sent to
+a worker process, where samples fixes the equity samples per decision (see TableEngine) or is None.
+Returns (seat order, winning seat, hands played, chips won per seat).
+'''
+def playMatch(task):
+    match, seed, configs, chips, budgetMs, samples = task
+    order = seatOrder(match, len(configs))
+    params = [configs[config] for config in order]
+    table = TableEngine(len(configs) - 1, chips, params[0], params[1:], budgetMs, seed, samples=samples)
+    table.run(MAX_HANDS)
+    final = [seat.chipTotal for seat in table.seats]
+    winner = final.index(max(final))
+    return order, winner, table.handsPlayed, table.winnings()
+
+
+'''
+Seeds for `matches` matches, all drawn from one base seed.
+'''
+def matchSeeds(seed, matches):
+    return [int(child.generate_state(1)[0]) for child in np.random.SeedSequence(seed).spawn(matches)]
+
+
+'''
+Plays `matches` freeze-out matches between the configurations (2-4 of them, each a dict of
+opponent.DEFAULT_PARAMS overrides) and returns a TournamentResult. names label the configurations in
+the report. workers=1 plays everything in this process. Otherwise a pool with one process per core
+(or `workers`) does the work. progress, if given, is called with the result so far after every match.
+samples, if given, fixes the equity samples per decision so the results don't depend on the clock.
+'''
+def runTournament(configs, matches, seed=0, names=None, chips=STARTING_CHIPS, budgetMs=FAST_BUDGET_MS,
+                  workers=None, progress=None, samples=None):
+    if not 2 <= len(configs) <= 4:
+        raise ValueError("a table seats 2-4 configurations")
+    names = names or [f"config {i}" for i in range(len(configs))]
+    result = TournamentResult(names)
+    tasks = [(match, matchSeed, configs, chips, budgetMs, samples)
+             for match, matchSeed in enumerate(matchSeeds(seed, matches))]
+    start = time.perf_counter()
+    if workers == 1:
+        outcomes = map(playMatch, tasks)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(workers)
+        # Small chunks keep every core busy to the end, big enough that the overhead stays low.
+        chunk = max(1, matches // (8 * (workers or multiprocessing.cpu_count())))
+        outcomes = pool.imap_unordered(playMatch, tasks, chunk)
+    try:
+        for outcome in outcomes:
+            result.add(outcome)
+            if progress:
+                result.seconds = time.perf_counter() - start
+                progress(result)
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+    result.seconds = time.perf_counter() - start
+    return result
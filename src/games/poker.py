@@ -1,17 +1,22 @@
-import random
-
-from PyQt6.QtWidgets import QWidget, QGraphicsScene, QMessageBox
+from PyQt6.QtWidgets import QWidget, QGraphicsScene, QMessageBox, QComboBox
 from PyQt6.QtCore import QPropertyAnimation, QRect, QPointF, QEasingCurve, QTimer, pyqtSignal, Qt, QTimer
 from PyQt6.QtGui import QPixmap
 from .ui.poker_ui import Ui_PokerScreen
-from .objects.opponent import Opponent
-from .objects.deck import Deck, AnimatedCard
-from .objects.hand import Hand
+from .objects.animated_card import AnimatedCard
+from .objects.poker_game import Poker
+from .objects.opponent import DEFAULT_LEVEL, loadLevels
+from .objects.betting import BettingRound, OPPONENT_ACTED, PLAYER_TURN, ROUND_OVER, HAND_OVER
+from .objects.tendencies import Tendencies
+from .objects.hand_history import HandHistoryWriter, HandRecorder
+from .objects import cardcodes
+from .hud import EquityHud
+from .pondering import Ponderer
 import os
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 CARDS_DIR = os.path.join(BASE_DIR, "../assets/cards")
 ASSET_DIR = os.path.join(BASE_DIR, "../assets")
+TURN_INTERVAL_MS = 0 # Pause between seats while the table bets.
 
 #=================================================#
 #================POKER SCREEN GUI=================#
@@ -41,7 +46,16 @@ class PokerScreen(QWidget):
         self.roundText = ''
         self.actionBox = QMessageBox()
         self.actionBox.setWindowTitle("Round Summary")
-        self.game = Poker()
+        self.actionBox.setModal(False) # Shown alongside the table, never waited on.
+        self.tendencies = Tendencies.load() # How the player plays, kept across tables and runs.
+        self.historyWriter = HandHistoryWriter() # Every hand played goes to ~/.casino_poker_history.
+        self.game = Poker(tendencies=self.tendencies, history=HandRecorder(self.historyWriter))
+        self.hud = EquityHud(self) # Optional odds overlay, worked out off the GUI thread.
+        self.ponder = Ponderer(self) # Opponents think about their answers while the player decides.
+        self.betting = BettingRound(self.game, self.ponderedAction)
+        self.turnTimer = QTimer(self) # Drives the betting, one seat per tick.
+        self.turnTimer.setInterval(TURN_INTERVAL_MS)
+        self.turnTimer.timeout.connect(self.drainTurns)
 
         # Opponent widgets (the icons and such)
         self.oppWidgets = [self.ui.opp1, self.ui.opp2, self.ui.opp3, self.ui.oppTotal1, self.ui.oppTotal2, self.ui.oppTotal3]
@@ -55,6 +69,13 @@ class PokerScreen(QWidget):
 
         # Handle buttons (except all in defined below)
         self.ui.oppCount.valueChanged.connect(self.updatePlayers)
+        # Opponent difficulty (see tools/tune_opponents.py), picked before the first deal like the count.
+        self.levelBox = QComboBox(self)
+        self.levelBox.setGeometry(QRect(10, 85, 271, 31))
+        self.levelBox.addItem("Default opponents", None)
+        for level in loadLevels():
+            self.levelBox.addItem(f"{level.title()} opponents", level)
+        self.levelBox.setCurrentIndex(max(self.levelBox.findData(DEFAULT_LEVEL), 0))
         self.ui.dealButton.clicked.connect(self.deal)
         self.ui.checkcallButton.clicked.connect(self.checkorcall)
         self.ui.checkcallButton.setEnabled(False)
@@ -148,7 +169,7 @@ class PokerScreen(QWidget):
         if hidden:
             path = os.path.join(CARDS_DIR, "card_back.jpg")
         else:
-            path = os.path.join(CARDS_DIR, "" + str(card.rank) + "_of_" + card.suit + ".png")
+            path = os.path.join(CARDS_DIR, cardcodes.pixmapName(card.code))
         #print(path)
         pixmap = QPixmap(path).scaled(71, 111)
         return pixmap
@@ -195,15 +216,16 @@ class PokerScreen(QWidget):
     Start a game of poker
     """
     def deal(self):
-        print("Dealing cards...")
         # First we hide insignificant details.
         self.ui.leaveButton.setEnabled(False)
         self.ui.oppCount.setEnabled(False)
         self.ui.label.hide()
         self.ui.oppCount.hide()
+        self.levelBox.hide()
 
         # Game makes opponents
         if self.game.started == False:
+            self.game.difficulty = self.levelBox.currentData()
             self.game.createOpponents(self.game)
         
         # Displays the opponent chip totals.
@@ -211,7 +233,9 @@ class PokerScreen(QWidget):
             self.oppWidgets[i+3].setText(f'Chips: {self.game.opps[i].chipTotal}')
 
         # Game deals cards.
+        self.game.playerChips = self.state.chips
         self.game.deal()
+        self.refreshHud()
 
         # Game updates pot.
         self.pot += self.game.stake
@@ -234,16 +258,23 @@ class PokerScreen(QWidget):
                 card_sprite = self.createCard(card, True)
                 end = self.opps_pos[i] + QPointF(j * 80, 0)
                 self.animateCard(self.deck_pos, end, card_sprite)
-        
-        print(self.game.playerHand)
 
         QTimer.singleShot(1500, Qt.TimerType.PreciseTimer, lambda: self.flop())
         QTimer.singleShot(1500, Qt.TimerType.PreciseTimer, lambda: self.ui.leaveButton.setEnabled(True))
-        QTimer.singleShot(1500, Qt.TimerType.PreciseTimer, lambda: self.enablePlayerActions(True))
 
         self.ui.dealButton.setEnabled(False)
 
 #=================== POKER GUI HELPER FUNCTION ===================#
+    """
+    Asks the odds overlay to work out the player's chances for the cards on the table now
+    """
+    def refreshHud(self):
+        if self.game.folded:
+            self.hud.clear()
+            return
+        board = [card.code for card in self.game.board]
+        self.hud.refresh(self.game.playerHand.codes, board, self.game.liveOpponents())
+
     """
     Enables buttons once the game begins
     """
@@ -260,94 +291,85 @@ class PokerScreen(QWidget):
     """
     def updatePot(self):
         # Get the player's stake and then iterate through opponents and calculate new pot
-        self.pot = self.game.stake
-        for i in range(self.game.oppNo):
-            self.pot += self.game.opps[i].stake
+        self.pot = self.game.getPot()
         self.ui.potLabel.setText(f'Pot: {self.pot}')
 
     """
-    Updates the pot, checks the correct buttons to display, checks to see if the 
-    game is still going, and then performs actions based on the player state
+    Shows the Call/Raise buttons when there's a bet to answer, Check/Bet otherwise
     """
-    def nextTurn(self):
-        # Update pot.
-        self.pot = self.game.stake
-        for i in range(len(self.game.opps)):
-            self.pot += self.game.opps[i].stake
-        self.ui.potLabel.setText(f'Pot: {self.pot}')
-        # Change bet buttons to call/raise if a bet has been placed
+    def updateBetButtons(self):
         if self.game.activeBet:
             self.ui.checkcallButton.setText("Call")
             self.ui.betraiseButton.setText("Raise")
         else:
-            # Else stay the same
             self.ui.checkcallButton.setText("Check")
             self.ui.betraiseButton.setText("Bet")
-        # If there's one player left run the game over to end the game and reward the plauer
-        if len(self.game.activePlayers) == 1:
-            self.gameOver()
-            return
-        # If everyone checks end the round
-        if self.game.checked == len(self.game.activePlayers):
-            self.endRound()
-            return
-        # Get the current turn and move it to the next player
-        current_turn = self.game.turn_index
-        self.game.turn_index = (self.game.turn_index + 1) % (self.game.oppNo + 1)
-        if current_turn == 0: # Player turn
-            if self.game.folded:
-                self.actionBox.setText(self.roundText)
-                if len(self.game.board) == 3:
-                    self.actionBox.exec()
-                    self.roundText = ''
-                self.nextTurn()
-            elif self.game.skip:
-                self.actionBox.setText(self.roundText)
-                if len(self.game.board) == 3:
-                    self.actionBox.exec()
-                self.roundText = ''
-                self.game.checked += 1
-                self.nextTurn()
-            else:
-                self.actionBox.setText(self.roundText)
-                if len(self.game.board) != 3:
-                    self.actionBox.exec()
-                self.roundText = ''
-                self.enablePlayerActions(True)
-        else:
-            self.enablePlayerActions(False)
-            if self.game.opps[current_turn-1].folded or not self.game.opps[current_turn-1].active:
-                self.nextTurn()
-            else:
-                #QTimer.singleShot(1500, Qt.TimerType.PreciseTimer, lambda: self.opponentTurn(current_turn))
-                self.opponentTurn(current_turn)
 
+    """
+    Keeps the betting going after the player acts or a round starts. The table itself is played by
+    the betting state machine (objects/betting.py), one seat per tick of the turn timer, so nothing
+    here waits on an opponent or a dialog.
+    """
+    def nextTurn(self):
+        self.updatePot()
+        self.updateBetButtons()
+        self.betting.resume()
+        self.turnTimer.start()
+
+    """
+    Turn timer tick: moves the table on one seat and shows whatever came of it
+    """
+    def drainTurns(self):
+        self.betting.step()
+        while self.betting.events:
+            event = self.betting.events.popleft()
+            if event[0] == OPPONENT_ACTED:
+                self.opponentActed(event[1], event[2])
+            elif event[0] == PLAYER_TURN:
+                self.turnTimer.stop()
+                self.updateBetButtons()
+                self.showRoundSummary()
+                self.ponder.start(self.game, self.state.chips)
+                self.enablePlayerActions(True)
+            elif event[0] == ROUND_OVER:
+                self.turnTimer.stop()
+                self.endRound()
+            elif event[0] == HAND_OVER:
+                self.turnTimer.stop()
+                self.showRoundSummary()
+                self.gameOver()
         self.updatePot()
 
     """
-    When an Opponent's turn happens, make a decision and re-evaluate how many chips
-    the opponent has
+    Shows what an opponent did and re-evaluates how many chips they have left
     """
-    def opponentTurn(self, index):
-        # Make betting decision and update display
-        action = self.game.opps[index-1].decision(index)
-        self.roundText += f"{self.game.opps[index-1]} {action}.\n"
-        self.oppWidgets[index+2].setText(f'Chip: {self.game.opps[index-1].chipTotal - self.game.opps[index-1].stake}')
-        self.nextTurn()
+    def opponentActed(self, index, action):
+        self.enablePlayerActions(False)
+        opp = self.game.opps[index-1]
+        self.roundText += f"{opp} {action}.\n"
+        self.oppWidgets[index+2].setText(f'Chip: {opp.chipTotal - opp.stake}')
 
     """
-    Progress the game to the next round or finish the game, reset who checked and 
-    if there was a bet placed
+    Opponent action worked out while the player was deciding, if there is one (see pondering.py)
     """
-    def endRound(self):
-        # If player folds or gets skipped, remove roundtext label
-        if self.game.folded or self.game.skip:
+    def ponderedAction(self, opp, index):
+        return self.ponder.nextAction(self.game, index)
+
+    """
+    Pops up what everyone did since the player last acted, without stopping the game for it
+    """
+    def showRoundSummary(self):
+        if self.roundText:
             self.actionBox.setText(self.roundText)
-            self.actionBox.exec()
-            self.roundText = ''
+            self.actionBox.show()
+        self.roundText = ''
+
+    """
+    Progress the game to the next round or finish the game
+    """
+    def endRound(self):
+        self.showRoundSummary()
         self.enablePlayerActions(False)
-        self.game.checked = 0
-        self.game.activeBet = False
         # Move to the next round 
         if len(self.game.board) == 3:
             self.turn()
@@ -380,42 +402,29 @@ class PokerScreen(QWidget):
     Checks who won the game, awards chips to the winner and sends a message
     """
     def gameOver(self):
-        # Determine the winner 
-        winner, handRank = self.game.get_results()
-        # Check to see who the winner is out of the players in the field and award chips
+        # Determine the winners and what everyone collects, side pots included
+        payouts, winners, handRank = self.game.settle()
+        # Everyone pays their stake, then collects whatever they won.
         for i in range(len(self.game.players)):
-            if winner == i and i == 0:
-                winner = "Player"
-                self.state.chips -= self.game.stake
-                self.state.chips += self.pot
+            won = payouts[i]
+            if i == 0:
+                self.state.chips += won - self.game.stake
                 self.ui.totalLabel.setText(f'Chip Total: {self.state.chips}')
-            elif winner == i:
-                winner = self.game.players[winner]
-                self.game.players[i].chipTotal -= self.game.players[i].stake
-                self.game.players[i].chipTotal += self.pot
-                self.oppWidgets[self.game.players[i].id + 3].setText(f'Chips: {self.game.players[i].chipTotal}')
             else:
-                # If they didn't win, remove the chips from their total
-                if i == 0:
-                    self.state.chips -= self.game.stake
-                    self.ui.totalLabel.setText(f'Chip Total: {self.state.chips}')
-                else:
-                    self.game.players[i].chipTotal -= self.game.players[i].stake
-                    self.oppWidgets[self.game.players[i].id + 3].setText(f'Chip: {self.game.players[i].chipTotal}')
-        # Alert the player if they won
-        if winner == "Player":
-            QMessageBox.information(self, "Winner", f"{winner} wins with a {handRank}.")
+                player = self.game.players[i]
+                player.chipTotal += won - player.stake
+                self.oppWidgets[player.id + 3].setText(f'Chips: {player.chipTotal}')
+        # Alert the player who won
+        names = ["Player" if i == 0 else str(self.game.players[i]) for i in winners]
+        if len(winners) > 1:
+            QMessageBox.information(self, "Split Pot", f"{' and '.join(names)} split the pot with a {handRank}.")
+        elif winners[0] == 0:
+            QMessageBox.information(self, "Winner", f"Player wins with a {handRank}.")
         else:
-            for card in winner.oppHand.hand:
-                if card.rank == 11:
-                    card.rank = "J"
-                elif card.rank == 12:
-                    card.rank = "Q"
-                elif card.rank == 13:
-                    card.rank = "K"
-                elif card.rank == 14:
-                    card.rank = "A"
-            QMessageBox.information(self, "Winner", f"{winner} wins with a {handRank}.\nHand: {winner.oppHand.hand}")
+            # Labels are built from the card codes, the cards themselves are left alone.
+            winner = self.game.players[winners[0]]
+            labels = ', '.join(cardcodes.label(code) for code in winner.oppHand.codes)
+            QMessageBox.information(self, "Winner", f"{winner} wins with a {handRank}.\nHand: {labels}")
         # Force quit if the player is out fo chips
         if self.state.chips <= 0:
             QMessageBox.information(self, "Game Over", "You're out of chips! Returning to main menu.")
@@ -426,7 +435,6 @@ class PokerScreen(QWidget):
         for i in range(len(self.game.opps)):
             if not self.game.opps[i].active:
                 index = self.game.opps[i].id - 1
-                print(f"Removing {self.game.opps[i].name}")
                 self.oppWidgets[index].hide()
                 self.oppWidgets[index+3].hide()
 
@@ -463,6 +471,9 @@ class PokerScreen(QWidget):
         QTimer.singleShot(1000, Qt.TimerType.PreciseTimer, lambda: self.scene.clear())
 
         self.game.reset()
+        self.hud.clear()
+        self.ponder.cancel()
+        self.turnTimer.stop()
         self.pot = 0
         self.ui.potLabel.setText(f"Pot: {self.pot}")
         self.ui.checkcallButton.setText("Check")
@@ -483,14 +494,18 @@ class PokerScreen(QWidget):
                 # Check if the player can't do anything else
                 QMessageBox.information(self, "Out of Chips", "You are out of chips")
                 self.game.check(0)
+                action = 'check'
             else:
                 # Otherwise call
                 self.game.call(0)
                 self.ui.totalLabel.setText(f"Chip Total: {self.state.chips - self.game.stake}")
+                action = 'call'
 
         else:
             # No bet, player can just check
             self.game.check(0)
+            action = 'check'
+        self.ponder.commit(action)
         self.nextTurn()
 
     """
@@ -503,18 +518,23 @@ class PokerScreen(QWidget):
             if self.state.chips < self.game.stake + self.game.minbet + 50:
                 QMessageBox.information(self, "Out of Chips", "You are out of chips")
                 self.game.check(0)
+                action = 'check'
             else:
                 self.game._raise(0)
                 self.ui.totalLabel.setText(f"Chip Total: {self.state.chips - self.game.stake}")
+                action = 'raise'
         # If no bet has been placed check to see if a bet can be made and check if not
         else:
             if self.state.chips < self.game.stake + 50:
                 QMessageBox.information(self, "Out of Chips", "You are out of chips")
                 self.game.check(0)
+                action = 'check'
             else:
                 self.game.bet()
                 self.ui.totalLabel.setText(f"Chip Total: {self.state.chips - self.game.stake}")
+                action = 'bet'
 
+        self.ponder.commit(action)
         self.nextTurn()
     
     """
@@ -523,6 +543,8 @@ class PokerScreen(QWidget):
     def fold(self):
         #self.state.chips -= self.game.stake
         self.game.fold(0)  # 0 = human player
+        self.hud.clear()
+        self.ponder.commit('fold')
         self.nextTurn()
 
     """
@@ -532,6 +554,7 @@ class PokerScreen(QWidget):
         # Bet all the chips that belong to the player
         self.game.allIn(self.state.chips)
         self.ui.totalLabel.setText(f"Chip Total: {self.state.chips - self.game.stake}")
+        self.ponder.commit('allin')
 
         self.nextTurn()
 
@@ -542,6 +565,7 @@ class PokerScreen(QWidget):
     """
     def flop(self):
         self.game.flop()
+        self.refreshHud()
         # Animate three new cards onto the table 
         for i, card in enumerate(self.game.board):
             card_sprite = self.createCard(card)
@@ -550,7 +574,7 @@ class PokerScreen(QWidget):
         # Reset the buttons for start of a new round
         self.ui.checkcallButton.setText("Check")
         self.ui.betraiseButton.setText("Bet")
-        self.game.start_round()
+        self.betting.start()
         self.nextTurn()
 
     """
@@ -559,34 +583,32 @@ class PokerScreen(QWidget):
     def turn(self):
         # Start the turn and animate a card to the board
         self.game.turn()
+        self.refreshHud()
         card_sprite = self.createCard(self.game.board[3])
         end = self.board_pos[3]
         self.animateCard(self.deck_pos, end, card_sprite)
         # Reset bet buttons for new roound
         self.ui.checkcallButton.setText("Check")
         self.ui.betraiseButton.setText("Bet")
-        self.game.start_round()
+        self.betting.start()
         self.nextTurn()
 
-        print(self.game.board)
-
     """
     Responsible for carrying out the third part of a poker game
     """
     def river(self):
         # Start the river round and animate a card to the table
         self.game.river()
+        self.refreshHud()
         card_sprite = self.createCard(self.game.board[4])
         end = self.board_pos[4]
         self.animateCard(self.deck_pos, end, card_sprite)
         # Reset bet buttons for new round
         self.ui.checkcallButton.setText("Check")
         self.ui.betraiseButton.setText("Bet")
-        self.game.start_round()
+        self.betting.start()
         self.nextTurn()
 
-        print(self.game.board)
-
     """
     Leave the game to the main menu
     """
@@ -598,7 +620,11 @@ class PokerScreen(QWidget):
         self.ui.potLabel.setText(f"Pot: {self.pot}")
         self.ui.checkcallButton.setText("Check")
         self.ui.betraiseButton.setText("Bet")
-        self.game = Poker()
+        self.turnTimer.stop()
+        self.game = Poker(tendencies=self.tendencies, history=HandRecorder(self.historyWriter))
+        self.betting = BettingRound(self.game, self.ponderedAction)
+        self.hud.clear()
+        self.ponder.cancel()
         self.ui.dealButton.setEnabled(True)
         self.ui.checkcallButton.setEnabled(False)
         self.ui.betraiseButton.setEnabled(False)
@@ -607,275 +633,10 @@ class PokerScreen(QWidget):
         self.ui.oppCount.setEnabled(True)
         self.ui.label.show()
         self.ui.oppCount.show()
+        self.levelBox.show()
         self.ui.oppCount.setValue(3)
         self.updatePlayers(3)
         self.ui.oppTotal1.setText("Chips:")
         self.ui.oppTotal2.setText("Chips:")
         self.ui.oppTotal3.setText("Chips:")
         self.switch_to_menu.emit()
-
-#=================================================#
-#===============POKER LOGIC CLASS=================#
-#=================================================#
-
-class Poker:
-    def __init__(self):
-        self.deck = Deck() # We need the deck of course.
-        self.name = "Player" # ID for Player essentially
-        self.playerHand = Hand() # We need the player hand of course.
-        self.bestHand = [] # Keeps track of player's best hand.
-        self.handRank = 0 # Holds hand rank in comparison to other players.
-        self.stake = 0 # Holds chips the player has bet for a given round.
-        self.board = [] # Keeps track of cards in center.
-        self.oppNo = 0 # We need to know how many opponents we have in order to make that many later.
-        self.opps = [] # Holds Opponent instances.
-        self.turn_index = 0 # Keeps track of who's turn in Poker it is.
-        self.players = [] # Full list of players, user and opponents.
-        self.activePlayers = []
-        self.checked = 0 # Keeps track of how many people have passed without betting/raising.
-        self.started = False # Keeps track of whether the Poker instance is fresh.
-        self.activeBet = False # We need to know if a bet is currently occurring.
-        self.folded = False # This will likely be valuable in interrupting gameflow.
-        self.minbet = 50 # Keeps track of largest bet that players must match.
-        self.skip = False # Keeps track of when player can be skipped (e.g. during an All-In)
-    """
-    Method creates opponents at the start of a fresh instance of Poker.
-    """
-    def createOpponents(self, game):
-        # Create up to three opponents with random chip amounts
-        names = ["Super Macho Man", "King Hippo", "Glass Joe"]
-        for i in range(self.oppNo):
-            self.opps.append(Opponent(names[i], game, i))
-            self.opps[i].chipTotal = random.randint(15, 25) * 50
-        # Create a list of active players including the user
-        self.players = ['Player'] + self.opps
-        for player in self.players:
-            self.activePlayers.append(player)
-    """
-    Checks to see if opponents still have chips and removes them if not
-    """
-    def removeOpponents(self):
-        for opp in self.opps:
-            if opp.chipTotal <=0:
-                opp.active = False
-
-    """
-    Method to deal initial two cards to a given player.
-    """
-    def deal(self):
-        # Draw 2 cards and 50 chip buy in
-        self.started = True
-        self.stake += 50 # Ante
-        self.playerHand.add(self.deck.draw())
-        self.playerHand.add(self.deck.draw())
-        # Give cards to active opponents and bet 50 chips
-        for i in range(len(self.opps)):
-            if self.opps[i].active == True:
-                print(f"{self.opps[i].name} gets dealt.")
-                self.opps[i].stake += 50
-                self.opps[i].oppHand.add(self.deck.draw())
-                self.opps[i].oppHand.add(self.deck.draw())
-
-    """
-    Starts round with player's turn
-    """
-    def start_round(self):
-        self.turn_index = 0
-
-    """
-    Moves the turn index forward to the next player
-    """
-    def next_turn(self):
-        self.turn_index = (self.turn_index + 1) % len(self.players)
-
-    """
-    Starts the game by drawing three cards to the table
-    """
-    def flop(self):
-        self.board.append(self.deck.draw())
-        self.board.append(self.deck.draw())
-        self.board.append(self.deck.draw())
-
-    """
-    Moves to the next round by adding one more card to the table
-    """
-    def turn(self):
-        self.board.append(self.deck.draw())
-
-    """
-    Adds one final card to the table
-    """
-    def river(self):
-        self.board.append(self.deck.draw())
-
-    """
-    Game method moves turn to next player without betting any chips. ends round if everyone
-    checks
-    """
-    def check(self, index=0):
-        print(f"Player {index} is checking...")
-        self.checked += 1
-
-    """
-    Game method matches the highest bet
-    """
-    def call(self, index=0):
-        print("Calling...")
-        self.checked += 1
-        if index == 0:
-            # bet the minimum amount
-            self.stake = self.minbet
-        else:
-            if self.opps[index-1].chipTotal > self.minbet:
-                self.opps[index-1].stake = self.minbet
-            else:
-                self.opps[index-1].stake = self.opps[index-1].chipTotal
-
-    """
-    Game method to bet chips, forcing the rest of the players to call or raise
-    """
-    def bet(self, index=0):
-        print("Betting...")
-        self.checked = 1
-        # Raise the minimum bet by 50 and bet 50 chips
-        self.activeBet = True
-        self.minbet += 50
-        if index == 0:
-            self.stake = self.minbet
-        else:
-            if self.opps[index-1].chipTotal > self.minbet:
-                self.opps[index-1].stake = self.minbet
-            else:
-                self.opps[index-1].stake = self.opps[index-1].chipTotal
-        
-    """
-    Game method to raise the minimum bet and bet that amount
-    """
-    def _raise(self, index=0):
-        # Raise the minimum bet 50 chips and bet that amount
-        print("Raising...")
-        self.checked = 1
-        self.activeBet = True
-        self.minbet += 50
-        if index == 0:
-            self.stake = self.minbet
-        else:
-            if self.opps[index-1].chipTotal > self.minbet:
-                self.opps[index-1].stake = self.minbet
-            else:
-                self.opps[index-1].stake = self.opps[index-1].chipTotal
-
-    """
-    Game method to remove the person from the round 
-    """
-    def fold(self, index=0):
-        print(f"Player {index} is folding...")
-
-        # Deduct the stake from player chips if player is human (index 0)
-        if index == 0:
-            self.folded = True
-            self.playerHand = Hand()  # clear player's hand
-            self.activePlayers.remove('Player')
-        else:
-            # Clear opponent hand and stake
-            self.players[index].folded = True
-            self.players[index].oppHand = Hand()
-            #self.players[index].chipTotal -= self.players[index].stake
-            self.activePlayers.remove(self.players[index])
-
-    """
-    Game methond to bet all the remaining chips a player has
-    """
-    def allIn(self,chips):
-        print("GOING ALL IN!!!")
-        # Set the minimum bet to the amount of chips the user has left and bet that
-        self.checked = 1
-        self.minbet = chips
-        self.stake = self.minbet
-        self.activeBet = True
-        self.skip = True
-        # TO DO: IMPLEMENT ALL IN METHOD
-        # BIG IDEA: RAISE OR BET WITH FULL CHIP TOTAL AS THE AMOUNT.
-            # RAISE OR BET WILL DEPEND ON IF A BET IS ACTIVE.
-
-    """
-    Game method to calculate who has the best hand and find the winner
-    """
-    def get_results(self):
-        print("Ending game...")
-        # Store all the hand ranks
-        handRanks = [
-                "High Card", "Pair", "Two Pair", "Three of a Kind", "Straight",
-                 "Flush", "Full House", "Four of a Kind", "Straight Flush", "Royal Flush"
-        ]
-        # If there is one player left reward that player the chips
-        if len(self.activePlayers) == 1:
-            if self.activePlayers[0] == "Player":
-                self.handRank, self.bestHand = self.analyzeHand()
-                return self.players.index(self.activePlayers[0]), self.handRank
-            else:
-                hand_rank, best_hand = self.activePlayers[0].oppHand.getBestHand(self.board)
-                return self.players.index(self.activePlayers[0]), hand_rank
-        # Look for the best hand and rank
-        self.handRank, self.bestHand = self.analyzeHand()
-
-        if not self.folded:
-            bestRank = handRanks.index(self.handRank)
-            bestCombo = self.bestHand
-            bestPlayerIndex = 0
-        else:
-            bestRank = -1
-            bestCombo = None
-            bestPlayerIndex = 0
-
-        for i in range(1, len(self.players)):
-            # Compare poker hands by higher index.
-            if self.players[i] not in self.activePlayers:
-                continue
-            if handRanks.index(self.players[i].handRank) > bestRank:
-                bestRank = handRanks.index(self.players[i].handRank)
-                bestCombo = self.players[i].bestHand
-                bestPlayerIndex = i
-            elif handRanks.index(self.players[i].handRank) == bestRank: # In tie breaker case, we go by highest value card.
-                if sorted([card.rank for card in self.players[i].bestHand], reverse=True) > sorted([card.rank for card in bestCombo], reverse=True):
-                    bestCombo = self.players[i].bestHand
-                    bestPlayerIndex = i
-        return bestPlayerIndex, handRanks[bestRank]
-
-    """
-    Resets game state to new round
-    """
-    def reset(self):
-        self.deck.shuffle()
-        self.playerHand = Hand()
-
-        self.bestHand = []
-        self.bestRank = 0
-        self.stake = 0
-        self.minbet = 50
-        self.board = []
-        self.turn_index = 0
-        self.checked = 0
-        self.activeBet = False
-        self.folded = False
-        self.skip = False
-        self.removeOpponents()
-        self.activePlayers = []
-        for i in range(len(self.players)):
-            if i == 0:
-                self.activePlayers.append(self.players[i])
-            else:
-                if self.players[i].active:
-                    self.activePlayers.append(self.players[i])
-        for i in range(1, len(self.players)):
-            self.players[i].folded = False
-            self.players[i].stake = 0
-            self.players[i].oppHand = Hand()
-
-    """
-    Game method looks at hand and finds the best combination of cards with the cards on 
-    the table
-    """
-    def analyzeHand(self):
-        hand_type, best_hand = self.playerHand.getBestHand(self.board)
-        return hand_type, best_hand
\ No newline at end of file
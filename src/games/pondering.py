@@ -0,0 +1,102 @@
+'''
+Name: pondering.py
+
+Authors: Joshua Welicky, Gavin Billinger, Mark Kitchin, Bisshoy Bhattacharjee, Max Biundo
+
+Description: Opponent pondering for the poker screen (see objects/ponder.py). While the player's
+buttons are up, a background thread plays every action the player could take on a copy of the game
+and hands back the opponents' answers as they're ready. When the player acts, the answer for that
+action is kept and the rest are thrown away, and the screen plays the kept answer instead of having
+each opponent think on the GUI thread. Answers that aren't ready in time are simply worked out the
+usual way.
+
+Like the odds overlay, every round of pondering gets a generation number, and a worker whose
+generation has moved on stops and is ignored.
+
+The opponents on a worker's copies draw their random numbers from a random.Random seeded off the
+random module when pondering starts, one per player action, so the worker never touches the
+module's state from its thread and a seeded game ponders the same answers every time. The exact
+equity cache is the one shared piece: equity.py locks every look at it, so workers and the GUI thread
+can use it at the same time.
+'''
+import random
+
+from PyQt6.QtCore import QObject, QThread, pyqtSignal
+
+from .objects import ponder
+
+
+class PonderWorker(QThread):
+    # generation, player action, opponents' steps
+    result = pyqtSignal(int, str, object)
+
+    def __init__(self, ponderer, generation, game, chips, actions, seed):
+        super().__init__()
+        self.ponderer = ponderer
+        self.generation = generation
+        self.game = game # A snapshot, only this thread touches it.
+        self.chips = chips
+        self.actions = actions
+        self.seed = seed
+
+    def stale(self):
+        return self.ponderer.generation != self.generation
+
+    def run(self):
+        for action in self.actions:
+            if self.stale():
+                return
+            # Each action starts from its own copy, the snapshot itself stays as it was.
+            rng = random.Random(f"{self.seed}:{action}")
+            steps = ponder.respond(ponder.snapshot(self.game, rng), action, self.chips, self.stale)
+            if self.stale():
+                return
+            self.result.emit(self.generation, action, steps)
+
+
+class Ponderer(QObject):
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.generation = 0
+        self.workers = [] # Running workers, kept alive until they finish.
+        self.answers = {} # Player action to opponents' steps, for the current generation.
+        self.plan = [] # Steps still to play for the action the player took.
+
+    '''
+    Starts pondering every action the player can take in the game as it is now.
+    '''
+    def start(self, game, chips):
+        self.cancel()
+        worker = PonderWorker(self, self.generation, ponder.snapshot(game), chips,
+                              ponder.humanActions(game, chips), random.getrandbits(32))
+        worker.result.connect(self.store)
+        worker.finished.connect(lambda: self.workers.remove(worker))
+        self.workers.append(worker)
+        worker.start()
+
+    def store(self, generation, action, steps):
+        if generation == self.generation:
+            self.answers[action] = steps
+
+    '''
+    The player took `action`: keep its answer, if it's ready, and drop everything else.
+    '''
+    def commit(self, action):
+        plan = self.answers.get(action, [])
+        self.cancel()
+        self.plan = list(plan)
+
+    def cancel(self):
+        self.generation += 1
+        self.answers = {}
+        self.plan = []
+
+    '''
+    The pondered action for the opponent in seat `index`, or None if there isn't one for the game as
+    it stands. Either way the step is used up, and a mismatch drops the rest of the plan.
+    '''
+    def nextAction(self, game, index):
+        if self.plan and self.plan[0][0] == index and self.plan[0][2] == ponder.stateKey(game, index):
+            return self.plan.pop(0)[1]
+        self.plan = []
+        return None
@@ -13,7 +13,7 @@ Inputs: state = A GameState object storing the global chip count.
 Outputs: Functional GUI implementation for Sabaac.
 '''
 from .objects.sabacc_deck import Sabacc_Deck
-from .objects.deck import AnimatedCard
+from .objects.animated_card import AnimatedCard
 from PyQt6.QtWidgets import QWidget, QGraphicsScene, QMessageBox
 from PyQt6.QtCore import QPropertyAnimation, QPointF, QEasingCurve, QTimer, pyqtSignal, QTimer, QUrl
 from PyQt6.QtGui import QPixmap
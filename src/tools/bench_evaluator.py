@@ -0,0 +1,80 @@
+'''
+Name: bench_evaluator.py
+
+Authors: Joshua Welicky, Gavin Billinger, Mark Kitchin, Bisshoy Bhattacharjee, Max Biundo
+
+Description: Benchmark for poker hand evaluation. Deals random 7-card hands and reports hands/second
+for the old 21-combination search (Hand.getBestHandReference) against the lookup-table evaluator and
+the NumPy batch evaluator.
+
+Run from the src folder:
+
+python3 -m tools.bench_evaluator [hands] [batch hands]
+'''
+import random
+import sys
+import time
+
+import numpy as np
+
+from games.objects.deck import Deck
+from games.objects.hand import Hand
+from games.objects import evaluator
+from games.objects.batch_evaluator import evaluateBatch
+
+
+def dealHands(count, seed=581):
+    random.seed(seed)
+    deals = []
+    for _ in range(count):
+        deck = Deck()
+        hand = Hand()
+        hand.add(deck.draw())
+        hand.add(deck.draw())
+        board = [deck.draw() for _ in range(5)]
+        deals.append((hand, board))
+    return deals
+
+
+def timeIt(label, fn, deals):
+    start = time.perf_counter()
+    for hand, board in deals:
+        fn(hand, board)
+    elapsed = time.perf_counter() - start
+    rate = len(deals) / elapsed
+    print(f"{label:<32}{rate:>14,.0f} hands/sec")
+    return rate
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    deals = dealHands(count)
+    codes = [hand.codes + [card.code for card in board] for hand, board in deals]
+
+    print(f"Evaluating {count} random 7-card hands\n")
+    before = timeIt("Before (21-combination loop)", lambda h, b: h.getBestHandReference(b), deals)
+    after = timeIt("After (getBestHand)", lambda h, b: h.getBestHand(b), deals)
+    timeIt("After (getStrength)", lambda h, b: h.getStrength(b), deals)
+
+    # Raw evaluator speed, with the cards already encoded.
+    start = time.perf_counter()
+    for hand in codes:
+        evaluator.evaluate(hand)
+    raw = count / (time.perf_counter() - start)
+    print(f"{'After (evaluate on card codes)':<32}{raw:>14,.0f} hands/sec")
+
+    # The batch evaluator gets one big array of random hands.
+    batchCount = int(sys.argv[2]) if len(sys.argv) > 2 else 2000000
+    rng = np.random.default_rng(581)
+    batch = np.argsort(rng.random((batchCount, 52)), axis=1)[:, :7].astype(np.int8)
+    start = time.perf_counter()
+    evaluateBatch(batch)
+    batchRate = batchCount / (time.perf_counter() - start)
+    print(f"{'After (evaluateBatch, NumPy)':<32}{batchRate:>14,.0f} hands/sec")
+
+    print(f"\ngetBestHand speedup: {after / before:.1f}x, raw evaluator speedup: {raw / before:.1f}x, "
+          f"batch speedup: {batchRate / before:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+'''
+Name: bench_omaha.py
+
+Authors: Joshua Welicky, Gavin Billinger, Mark Kitchin, Bisshoy Bhattacharjee, Max Biundo
+
+Description: Benchmark for Omaha showdowns. Deals random 4-player river showdowns and reports
+showdowns/second for scoring every two-plus-three hand through Hand.getBestHand and through
+evaluator.evaluate, for the shared partials in omaha_evaluator.py and for the NumPy batch version,
+with a Hold'em showdown of the same size as the mark to aim for.
+
+The game itself never scores a showdown from scratch: every player's hand state is updated as each
+board card comes out and the showdown just reads the strengths. The "live" lines time that whole
+path, hole cards to river, for HandState and OmahaHandState.
+
+Run from the src folder:
+
+python3 -m tools.bench_omaha [showdowns] [players] [batch showdowns]
+'''
+import random
+import sys
+import time
+from itertools import combinations
+
+import numpy as np
+
+from games.objects.deck import Deck
+from games.objects.hand import Hand
+from games.objects.hand_state import HandState
+from games.objects.omaha_game import OmahaHandState
+from games.objects import evaluator, omaha_evaluator
+from games.objects.batch_evaluator import omahaStrengthsBatch
+
+
+def dealShowdowns(count, players, seed=581):
+    random.seed(seed)
+    deals = []
+    for _ in range(count):
+        deck = Deck()
+        holes = [[deck.draw() for _ in range(4)] for _ in range(players)]
+        board = [deck.draw() for _ in range(5)]
+        deals.append((holes, board))
+    return deals
+
+
+def naiveHands(holes, board):
+    best = []
+    for hole in holes:
+        strength = 0
+        for pair in combinations(hole, 2):
+            hand = Hand()
+            for card in pair:
+                hand.add(card)
+            for triple in combinations(board, 3):
+                name, cards = hand.getBestHand(list(triple))
+                strength = max(strength, evaluator.evaluate([card.code for card in cards]))
+        best.append(strength)
+    return best
+
+
+def naiveCodes(holes, board):
+    return [max(evaluator.evaluate(pair + triple) for pair in combinations(hole, 2)
+                for triple in combinations(board, 3)) for hole in holes]
+
+
+'''
+What the game does over a hand: one state per player, a board card at a time, strengths read at the
+end.
+'''
+def liveHand(stateClass):
+    def play(holes, board):
+        states = [stateClass(hole) for hole in holes]
+        for code in board:
+            for state in states:
+                state.add(code)
+        return [state.strength for state in states]
+    return play
+
+
+def timeIt(label, fn, deals, baseline=None):
+    start = time.perf_counter()
+    for deal in deals:
+        fn(*deal)
+    rate = len(deals) / (time.perf_counter() - start)
+    vsHoldem = f"{rate / baseline:>8.2f}x Hold'em" if baseline else ""
+    print(f"{label:<36}{rate:>12,.0f} showdowns/sec{vsHoldem}")
+    return rate
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    players = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    batchCount = int(sys.argv[3]) if len(sys.argv) > 3 else 200000
+    deals = dealShowdowns(count, players)
+    codes = [([tuple(card.code for card in hole) for hole in holes], tuple(card.code for card in board))
+             for holes, board in deals]
+    holdem = [([hole[:2] for hole in holes], board) for holes, board in codes]
+
+    print(f"Scoring {count} random {players}-player river showdowns\n")
+    baseline = timeIt("Hold'em (evaluator.showdown)", evaluator.showdown, holdem)
+    slow = max(count // 20, 1) # The Hand path is slow enough to time on a slice.
+    timeIt("Omaha, 60 x Hand.getBestHand", naiveHands, deals[:slow], baseline)
+    naive = timeIt("Omaha, 60 x evaluate", naiveCodes, codes, baseline)
+    partial = timeIt("Omaha, shared partials (showdown)", omaha_evaluator.showdown, codes, baseline)
+    liveBaseline = timeIt("Hold'em live (HandState)", liveHand(HandState), holdem, baseline)
+    timeIt("Omaha live (OmahaHandState)", liveHand(OmahaHandState), codes, liveBaseline)
+    print(f"{'':<36}{'':>26}(live Omaha vs live Hold'em)")
+
+    # Every player of every showdown is a row for the batch version.
+    rng = np.random.default_rng(581)
+    cards = np.argsort(rng.random((batchCount, 52)), axis=1)[:, :4 * players + 5].astype(np.int8)
+    holes = cards[:, :4 * players].reshape(-1, 4)
+    boards = np.repeat(cards[:, 4 * players:], players, axis=0)
+    start = time.perf_counter()
+    omahaStrengthsBatch(holes, boards)
+    batchRate = batchCount / (time.perf_counter() - start)
+    print(f"{'Omaha, omahaStrengthsBatch (NumPy)':<36}{batchRate:>12,.0f} showdowns/sec{batchRate / baseline:>8.2f}x Hold'em")
+
+    # Spot check that every method agrees.
+    for holes, board in codes[:200]:
+        expected = omaha_evaluator.showdown(holes, board)[0]
+        assert naiveCodes(holes, board) == expected
+        assert list(omahaStrengthsBatch(holes, [board] * len(holes))) == expected
+        assert liveHand(OmahaHandState)(holes, board) == expected
+    for deal, (holes, board) in zip(deals[:20], codes[:20]):
+        assert naiveHands(*deal) == omaha_evaluator.showdown(holes, board)[0]
+
+    print(f"\nShared partials speedup over 60 x evaluate: {partial / naive:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+'''
+Name: build_policy_table.py
+
+Authors: Joshua Welicky, Gavin Billinger, Mark Kitchin, Bisshoy Bhattacharjee, Max Biundo
+
+Description: Build step for assets/policy.bin, the precompiled opponent policy in
+games/objects/policy.py.
+
+The policy is found by self-play. Every seat at headless tables plays from the current table, with
+some share of random actions so every action gets tried. After each hand, every decision a seat
+made is credited with the chips that seat won or lost on the hand. Averaged over many hands, that
+is a value for each action in each state. The next table leans toward the actions that did best
+(a softmax over their values), averaged with the table before it so the policy settles down instead
+of chasing noise. Hands are spread over a process pool.
+
+States with too few samples borrow the numbers of the same state over every board texture, and
+whatever is still short keeps its old mix. Everything starts from an even mix.
+
+Run from the src folder:
+
+python3 -m tools.build_policy_table [generations] [hands per generation] [workers]
+'''
+import multiprocessing
+import random
+import sys
+import time
+
+import numpy as np
+
+from games.objects import policy
+from games.objects.ranges import BUCKETS
+from games.objects.table import TableEngine, FAST_BUDGET_MS
+
+EXPLORE = 0.15 # Share of random actions while playing.
+TEMPERATURE = 20.0 # Chips. Smaller leans harder on the best action.
+STEP = 0.5 # How far each generation moves toward the new mix.
+MIN_SAMPLES = 40 # Samples an action needs before its value counts.
+HANDS_PER_JOB = 2000
+STARTING_CHIPS = 1000
+
+
+'''
+One job: plays `hands` hands from `seed` with every seat on `mixes`. Returns (chips won, times
+taken) for every (state, slot), flattened.
+'''
+def playJob(task):
+    seed, hands, mixes = task
+    policy.useTable(mixes)
+    rng = random.Random(seed)
+    total = np.zeros(policy.STATES * policy.SLOTS)
+    counts = np.zeros(policy.STATES * policy.SLOTS)
+    played = 0
+    table = None
+    while played < hands:
+        if table is None or table.isOver():
+            # Fresh stacks and a random number of opponents, so every player count gets seen.
+            params = {"policyMix": 1.0}
+            table = TableEngine(rng.randint(1, 3), STARTING_CHIPS, params, params, FAST_BUDGET_MS,
+                                rng.getrandbits(32))
+            for seat in table.seats:
+                seat.explore = EXPLORE
+        for seat in table.seats:
+            seat.policyLog = []
+        before = [seat.chipTotal for seat in table.seats]
+        table.playHand()
+        played += 1
+        for seat, start in zip(table.seats, before):
+            won = seat.chipTotal - start
+            for state, slot in seat.policyLog:
+                total[state * policy.SLOTS + slot] += won
+                counts[state * policy.SLOTS + slot] += 1
+    return total, counts
+
+
+'''
+Chips won and samples for every (state, slot) over `hands` hands played on `mixes`.
+'''
+def actionTotals(pool, mixes, hands, seed):
+    jobs = (hands + HANDS_PER_JOB - 1) // HANDS_PER_JOB
+    seeds = [int(child.generate_state(1)[0]) for child in np.random.SeedSequence(seed).spawn(jobs)]
+    tasks = [(jobSeed, min(HANDS_PER_JOB, hands - i * HANDS_PER_JOB), mixes) for i, jobSeed in enumerate(seeds)]
+    total = np.zeros(policy.STATES * policy.SLOTS)
+    counts = np.zeros(policy.STATES * policy.SLOTS)
+    for jobTotal, jobCounts in pool.imap_unordered(playJob, tasks):
+        total += jobTotal
+        counts += jobCounts
+    return total.reshape(policy.STATES, policy.SLOTS), counts.reshape(policy.STATES, policy.SLOTS)
+
+
+'''
+Where a state has too few samples, falls back on the same state with every board texture pooled.
+'''
+def backOff(total, counts):
+    shape = (BUCKETS, policy.TEXTURES, policy.ODDS_BUCKETS, policy.PLAYERS, policy.SLOTS)
+    pooledTotal = np.broadcast_to(total.reshape(shape).sum(axis=1, keepdims=True), shape).reshape(total.shape)
+    pooledCounts = np.broadcast_to(counts.reshape(shape).sum(axis=1, keepdims=True), shape).reshape(counts.shape)
+    few = counts < MIN_SAMPLES
+    return np.where(few, pooledTotal, total), np.where(few, pooledCounts, counts)
+
+
+'''
+Next generation's mixes: a softmax over the action values, only in states where at least two
+actions have enough samples, blended into the old mixes.
+'''
+def improve(mixes, total, counts):
+    total, counts = backOff(total, counts)
+    tried = counts >= MIN_SAMPLES
+    ready = tried.sum(axis=1) >= 2 # Nothing to compare with fewer than two actions.
+    values = np.where(tried, total / np.maximum(counts, 1), -np.inf)
+    best = np.where(ready, values.max(axis=1), 0.0)
+    target = np.where(tried, np.exp((np.where(tried, values, 0.0) - best[:, None]) / TEMPERATURE), 0.0)
+    target /= np.maximum(target.sum(axis=1, keepdims=True), 1e-12)
+    # Actions without enough samples keep the share they had, the others split the rest.
+    untried = np.where(tried, 0.0, mixes)
+    target = target * (1.0 - untried.sum(axis=1, keepdims=True)) + untried
+    updated = np.where(ready[:, None], (1 - STEP) * mixes + STEP * target, mixes)
+    return updated, int(ready.sum())
+
+
+def main():
+    generations = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    hands = int(sys.argv[2]) if len(sys.argv) > 2 else 150000
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else None
+    seed = 581
+
+    start = time.perf_counter()
+    mixes = np.full((policy.STATES, policy.SLOTS), 1.0 / policy.SLOTS)
+    with multiprocessing.Pool(workers) as pool:
+        for generation in range(generations):
+            total, counts = actionTotals(pool, mixes, hands, seed + generation)
+            mixes, updated = improve(mixes, total, counts)
+            print(f"generation {generation + 1}: {int(counts.sum())} decisions, {updated} of "
+                  f"{policy.STATES} states updated ({time.perf_counter() - start:.0f}s)")
+
+    # Scale so the likeliest action of each state gets the full byte.
+    policy.writeTable(policy.TABLE_PATH, mixes / mixes.max(axis=1, keepdims=True))
+    print(f"\nWrote {policy.TABLE_PATH} in {time.perf_counter() - start:.0f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+'''
+Name: build_preflop_table.py
+
+Authors: Joshua Welicky, Gavin Billinger, Mark Kitchin, Bisshoy Bhattacharjee, Max Biundo
+
+Description: Build step for assets/preflop_equity.bin. Runs the Monte Carlo equity calculator for
+each of the 169 starting hand classes against 1-8 random opponents and writes the compact table
+that games/objects/preflop.py memory-maps at runtime.
+
+Run from the src folder (takes a few minutes on one core):
+
+python3 -m tools.build_preflop_table [samples per entry]
+'''
+import sys
+import time
+
+from games.objects import equity, preflop
+
+
+def main():
+    samples = int(sys.argv[1]) if len(sys.argv) > 1 else 60000
+    start = time.perf_counter()
+    equities = []
+    for index in range(preflop.CLASSES):
+        hole = preflop.classCards(index)
+        row = []
+        for opponents in range(1, preflop.MAX_OPPONENTS + 1):
+            # Fixed seeds keep the table the same from one build to the next.
+            result = equity.monteCarloEquity(hole, [], opponents, samples, targetError=0.0,
+                                             seed=index * 16 + opponents)
+            row.append(result.equity)
+        equities.append(row)
+        print(f"{preflop.className(index):>4} " + " ".join(f"{e:.3f}" for e in row))
+
+    preflop.writeTable(preflop.TABLE_PATH, equities)
+    equity.shutdown()
+    print(f"\nWrote {preflop.TABLE_PATH} in {time.perf_counter() - start:.0f}s")
+
+
+if __name__ == "__main__":
+    main()
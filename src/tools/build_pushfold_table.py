@@ -0,0 +1,153 @@
+'''
+Name: build_pushfold_table.py
+
+Authors: Joshua Welicky, Gavin Billinger, Mark Kitchin, Bisshoy Bhattacharjee, Max Biundo
+
+Description: Build step for assets/pushfold.bin, the short stack charts games/objects/pushfold.py
+reads at runtime.
+
+First it builds a 169x169 matrix of heads-up preflop equities, one class against another. Random
+two-player deals are scored with the batch evaluator across a process pool and every result is
+filed under the two players' classes. Then for every player count and stack depth it solves the
+push/fold game (see pushfold.py) by fictitious play: every round each role plays its best response
+to the others' average strategy so far, and the averages settle on an equilibrium.
+
+Hands are weighted by how many combos the two classes can make together without sharing a card.
+Callers are each weighed against the shover alone, so card removal between callers is ignored.
+
+Run from the src folder (takes a minute or two on one core):
+
+python3 -m tools.build_pushfold_table [deals, millions] [workers]
+'''
+import multiprocessing
+import sys
+import time
+
+import numpy as np
+
+from games.objects import preflop, pushfold
+from games.objects.batch_evaluator import strengthsBatch
+from games.objects.ranges import COMBOS, COMBO_MASKS
+
+CHUNK = 1000000 # Deals per job.
+ITERATIONS = 3000 # Fictitious play rounds per spot.
+
+CLASSES = preflop.CLASSES
+COMBO_CLASSES = np.array([preflop.handClass(int(a), int(b)) for a, b in COMBOS])
+
+
+'''
+One job: `count` random heads-up deals from `seed`. Returns (pot share of the first hand, deals) for
+every (class, class) cell, flattened.
+'''
+def dealChunk(task):
+    seed, count = task
+    rng = np.random.default_rng(seed)
+    deals = np.argpartition(rng.random((count, 52), dtype=np.float32), 8, axis=1)[:, :9].astype(np.int8)
+    first = strengthsBatch(np.concatenate((deals[:, :2], deals[:, 4:]), axis=1))
+    second = strengthsBatch(deals[:, 2:])
+    share = np.where(first > second, 1.0, np.where(first == second, 0.5, 0.0))
+
+    holes = deals[:, :4].astype(np.intp)
+    high, low = holes[:, ::2] >> 2, holes[:, 1::2] >> 2
+    suited = (holes[:, ::2] & 3) == (holes[:, 1::2] & 3)
+    high, low = np.maximum(high, low), np.minimum(high, low)
+    classes = np.where(suited, high * 13 + low, low * 13 + high)
+    # Each deal counts once from each side.
+    cells = np.concatenate((classes[:, 0] * CLASSES + classes[:, 1], classes[:, 1] * CLASSES + classes[:, 0]))
+    shares = np.concatenate((share, 1.0 - share))
+    return (np.bincount(cells, shares, CLASSES * CLASSES), np.bincount(cells, minlength=CLASSES * CLASSES))
+
+
+'''
+Heads-up equity of every class against every other: equities[i, j] is class i's pot share against j.
+'''
+def equityMatrix(deals, workers, seed=581):
+    seeds = np.random.SeedSequence(seed).spawn((deals + CHUNK - 1) // CHUNK)
+    tasks = [(child, min(CHUNK, deals - i * CHUNK)) for i, child in enumerate(seeds)]
+    shares = np.zeros(CLASSES * CLASSES)
+    counts = np.zeros(CLASSES * CLASSES)
+    with multiprocessing.Pool(workers) as pool:
+        for done, (share, count) in enumerate(pool.imap_unordered(dealChunk, tasks), 1):
+            shares += share
+            counts += count
+            print(f"\rdeals: {done}/{len(tasks)} million", end="", flush=True)
+    print()
+    # A cell nothing landed in is a coin flip, and carries next to no weight anyway.
+    return np.where(counts > 0, shares / np.maximum(counts, 1), 0.5).reshape(CLASSES, CLASSES)
+
+
+'''
+weights[i, j] is how many (combo of class i, combo of class j) pairs share no card.
+'''
+def comboWeights():
+    free = (COMBO_MASKS[:, None] & COMBO_MASKS[None, :]) == 0
+    onehot = np.zeros((len(COMBOS), CLASSES))
+    onehot[np.arange(len(COMBOS)), COMBO_CLASSES] = 1.0
+    return onehot.T @ free.astype(np.float64) @ onehot
+
+
+'''
+Solves one spot: `players` in the hand, `depth` antes behind each. Returns the average strategies,
+(shove frequency, call frequency) per class. Every caller faces the same shove for the same price,
+so they all share one calling strategy.
+'''
+def solve(equities, weights, players, depth, iterations=ITERATIONS):
+    pot = float(players) # Antes in the middle.
+    showdown = pot + 2 * depth
+    rowWeights = weights / weights.sum(axis=1, keepdims=True)
+    winWeights = rowWeights * equities # What a hand expects to take against each class.
+    pairWins = weights * equities
+
+    push = np.full(CLASSES, 0.5)
+    call = np.full(CLASSES, 0.5)
+    for t in range(1, iterations + 1):
+        # The shover against the callers' average so far, one caller after another.
+        chance = rowWeights @ call
+        called = winWeights @ call * showdown - chance * depth
+        value = np.zeros(CLASSES)
+        reached = np.ones(CLASSES) # Chance nobody has called yet.
+        for caller in range(players - 1):
+            value += reached * called
+            reached *= 1.0 - chance
+        value += reached * pot
+        bestPush = (value > 0).astype(np.float64)
+
+        # A caller against the shover's average range: call when their share of the pot beats the price.
+        bestCall = (pairWins @ push * showdown > weights @ push * depth).astype(np.float64)
+
+        push += (bestPush - push) / (t + 1)
+        call += (bestCall - call) / (t + 1)
+    return push, call
+
+
+'''
+Share of all starting hands (by combos) played at these frequencies.
+'''
+def handShare(frequencies):
+    combos = np.bincount(COMBO_CLASSES, minlength=CLASSES)
+    return float(combos @ frequencies / combos.sum())
+
+
+def main():
+    deals = int(float(sys.argv[1]) * 1000000) if len(sys.argv) > 1 else 40000000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    start = time.perf_counter()
+    equities = equityMatrix(deals, workers)
+    weights = comboWeights()
+    print(f"equity matrix in {time.perf_counter() - start:.0f}s")
+
+    charts = {}
+    for players in range(pushfold.MIN_PLAYERS, pushfold.MAX_PLAYERS + 1):
+        for depth in range(1, pushfold.MAX_DEPTH + 1):
+            push, call = solve(equities, weights, players, depth)
+            charts[(players, depth, pushfold.PUSH)] = push
+            charts[(players, depth, pushfold.CALL)] = call
+            print(f"{players} players, {depth:>2} antes: shove {handShare(push):.0%}, call {handShare(call):.0%}")
+
+    pushfold.writeTable(pushfold.TABLE_PATH, charts)
+    print(f"\nWrote {pushfold.TABLE_PATH} in {time.perf_counter() - start:.0f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+'''
+Name: tournament.py
+
+Authors: Joshua Welicky, Gavin Billinger, Mark Kitchin, Bisshoy Bhattacharjee, Max Biundo
+
+Description: Plays freeze-out matches between opponent play styles on every core and prints win
+rates with 95% confidence intervals, plus hands/s and matches/s.
+
+Run from the src folder:
+
+python3 -m tools.tournament [matches] [workers] [seed]
+'''
+import sys
+
+from games.objects import tournament
+from games.objects.opponent import DEFAULT_PARAMS
+
+# A few styles to pit against each other. Each is a set of overrides for opponent.DEFAULT_PARAMS.
+STYLES = {
+    "default": {},
+    "loose": {"foldMargin": 0.08, "heroCallChance": 0.25, "betEdge": 1.0, "bluffChance": 0.15},
+    "tight": {"foldMargin": -0.05, "heroCallChance": 0.02, "raiseEdge": 2.0, "bluffChance": 0.02},
+    "policy": {"policyMix": 1.0},
+}
+
+
+def main():
+    matches = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 581
+
+    names = list(STYLES)
+    configs = [dict(DEFAULT_PARAMS, **STYLES[name]) for name in names]
+
+    def progress(result):
+        if result.matches % max(1, matches // 10) == 0:
+            print(f"{result.matches}/{matches} matches, {result.handsPerSecond():.0f} hands/s")
+
+    result = tournament.runTournament(configs, matches, seed, names, workers=workers, progress=progress)
+    print()
+    print(result)
+
+
+if __name__ == "__main__":
+    main()
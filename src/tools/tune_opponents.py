@@ -0,0 +1,160 @@
+'''
+Name: tune_opponents.py
+
+Authors: Joshua Welicky, Gavin Billinger, Mark Kitchin, Bisshoy Bhattacharjee, Max Biundo
+
+Description: Tunes the opponent play style params (opponent.DEFAULT_PARAMS) by self-play and writes
+named difficulty levels to assets/opponent_levels.json, where opponent.levelParams picks them up.
+
+Candidates play the way the GUI's opponents think (opponent.DEFAULT_BUDGET_MS, range reads on), but
+every equity estimate deals a fixed EQUITY_SAMPLES instead of running against the clock. How busy
+the machine is then can't change a decision, so the common random numbers below stay common and a
+run with the same arguments writes the same levels.
+
+The search is a small evolution strategy in the spirit of CMA-ES, with a diagonal covariance. Every
+generation samples a batch of candidates around the current mean. Each candidate plays headless
+freeze-out matches against default opponents and is scored by the chips it wins per match. The
+best candidates pull the mean and the per-param step sizes toward themselves.
+
+All candidates play the same match seeds (common random numbers), so differences in score come from
+the params and not from the cards. Every match of every candidate in a generation goes to one
+process pool, so all cores stay busy.
+
+Levels are anchored to the default opponents, since those are what they play against: "easy" is the
+candidate closest to losing EASY_TARGET chips per match to them, "medium" the one closest to
+breaking even and "hard" the best. The chosen levels are re-scored on fresh seeds before they are
+written, and the names go out in order of those fresh scores, so easy is always the weakest.
+
+Run from the src folder:
+
+python3 -m tools.tune_opponents [generations] [population] [matches per candidate] [workers]
+'''
+import json
+import multiprocessing
+import sys
+import time
+
+import numpy as np
+
+from games.objects import opponent, tournament
+
+# Range searched for each param. Candidates live in [0, 1] per param and are scaled into these.
+BOUNDS = {
+    "foldMargin": (-0.1, 0.2),
+    "heroCallChance": (0.0, 0.5),
+    "raiseEdge": (0.8, 3.0),
+    "raiseChance": (0.0, 1.0),
+    "betEdge": (0.6, 3.0),
+    "betChance": (0.0, 1.0),
+    "bluffChance": (0.0, 0.4),
+    "noise": (0.0, 0.15),
+    "policyMix": (0.0, 1.0),
+}
+NAMES = list(BOUNDS)
+LOW = np.array([BOUNDS[name][0] for name in NAMES])
+HIGH = np.array([BOUNDS[name][1] for name in NAMES])
+
+OPPONENTS = 3 # Default opponents each candidate plays against.
+LEVEL_NAMES = ["easy", "medium", "hard"] # Weakest first.
+EASY_TARGET = -300 # Chips per match "easy" should lose to the defaults.
+BUDGET_MS = opponent.DEFAULT_BUDGET_MS
+EQUITY_SAMPLES = 10000 # About what BUDGET_MS buys on a desktop, dealt in full whatever the load.
+
+
+def toParams(x):
+    values = LOW + np.clip(x, 0.0, 1.0) * (HIGH - LOW)
+    return {name: round(float(value), 4) for name, value in zip(NAMES, values)}
+
+
+def fromParams(params):
+    return (np.array([params[name] for name in NAMES]) - LOW) / (HIGH - LOW)
+
+
+'''
+Chips won per match by each candidate, all on the same seeds, with every match sent to the pool.
+'''
+def scoreCandidates(pool, candidates, seeds):
+    base = opponent.DEFAULT_PARAMS
+    tasks = []
+    for params in candidates:
+        configs = [dict(base, **params)] + [base] * OPPONENTS
+        for match, seed in enumerate(seeds):
+            tasks.append((match, int(seed), configs, tournament.STARTING_CHIPS, BUDGET_MS, EQUITY_SAMPLES))
+    stats = [tournament.RunningStats() for _ in candidates]
+    for i, (order, winner, hands, chips) in enumerate(pool.imap(tournament.playMatch, tasks, 16)):
+        stats[i // len(seeds)].add(chips[order.index(0)])
+    return np.array([s.mean for s in stats])
+
+
+'''
+Diagonal evolution strategy over the unit cube. Returns every (params, score) it tried.
+'''
+def evolve(pool, generations, population, matches, seed):
+    rng = np.random.default_rng(seed)
+    dims = len(NAMES)
+    parents = population // 2
+    weights = np.log(parents + 0.5) - np.log(np.arange(1, parents + 1))
+    weights /= weights.sum()
+    mueff = 1.0 / np.sum(weights ** 2)
+    learnRate = min(1.0, mueff / (dims + 2) ** 1.5) # Step size adaptation rate.
+
+    mean = fromParams(opponent.DEFAULT_PARAMS)
+    sigma = 0.2
+    scale = np.ones(dims) # Per-param step sizes relative to sigma.
+    seeds = tournament.matchSeeds(seed, matches)
+    history = []
+    for generation in range(generations):
+        steps = rng.standard_normal((population, dims))
+        samples = np.clip(mean + sigma * scale * steps, 0.0, 1.0)
+        candidates = [toParams(x) for x in samples]
+        scores = scoreCandidates(pool, candidates, seeds)
+        history.extend(zip(candidates, scores))
+
+        best = np.argsort(-scores)[:parents]
+        mean = weights @ samples[best]
+        # Widen the params whose good steps were long, narrow the ones whose good steps were short.
+        spread = weights @ (steps[best] ** 2)
+        scale = np.clip(scale * np.exp(0.5 * learnRate * (spread - 1.0)), 0.1, 3.0)
+        # Shrink the overall step when the winners agree on a short move, grow it on a long one.
+        meanStep = np.sqrt(mueff) * (weights @ steps[best])
+        sigma *= np.exp(learnRate * (np.linalg.norm(meanStep) / np.sqrt(dims) - 1.0))
+        print(f"generation {generation + 1}: best {scores[best[0]]:+.0f}, "
+              f"mean {scores.mean():+.0f} chips/match, sigma {sigma:.3f}")
+    return history
+
+
+'''
+The candidates closest to EASY_TARGET and to breaking even against the defaults, and the best, in
+that order.
+'''
+def pickLevels(history):
+    scores = np.array([score for params, score in history])
+    picks = [np.argmin(np.abs(scores - EASY_TARGET)), np.argmin(np.abs(scores)), np.argmax(scores)]
+    return [history[int(i)][0] for i in picks]
+
+
+def main():
+    generations = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    population = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    matches = int(sys.argv[3]) if len(sys.argv) > 3 else 120
+    workers = int(sys.argv[4]) if len(sys.argv) > 4 else None
+    seed = 581
+
+    start = time.perf_counter()
+    with multiprocessing.Pool(workers) as pool:
+        levels = pickLevels(evolve(pool, generations, population, matches, seed))
+        # Fresh seeds, so the reported numbers aren't flattered by the seeds the search tuned on.
+        check = scoreCandidates(pool, levels, tournament.matchSeeds(seed + 1, 4 * matches))
+
+    output = {}
+    for name, i in zip(LEVEL_NAMES, np.argsort(check)):
+        output[name] = {"params": levels[i], "chipsPerMatch": round(float(check[i]), 1),
+                        "budgetMs": BUDGET_MS, "equitySamples": EQUITY_SAMPLES}
+        print(f"{name:>6}: {check[i]:+.0f} chips/match against defaults  {levels[i]}")
+    with open(opponent.LEVELS_PATH, 'w') as f:
+        json.dump(output, f, indent=4)
+    print(f"\nWrote {opponent.LEVELS_PATH} in {time.perf_counter() - start:.0f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+'''
+Name: verify_evaluator.py
+
+Authors: Joshua Welicky, Gavin Billinger, Mark Kitchin, Bisshoy Bhattacharjee, Max Biundo
+
+Description: Exhaustive check of the poker evaluators. Every one of the 133,784,560 seven-card hands
+is scored with the NumPy batch evaluator over a process pool, giving the exact number of hands in
+each category, which is checked against the known counts. On a random sample of the hands, the
+categories from Hand.getBestHand, the original 21-combination search (Hand.getBestHandReference)
+and evaluator.evaluate all have to agree with the batch evaluator.
+
+A job is every hand whose two lowest cards are a given pair, so the other five come from the cards
+above both. Jobs are handed out grouped by the second card so each worker keeps reusing the same
+five-card index table.
+
+Run from the src folder:
+
+python3 -m tools.verify_evaluator [sampled hands] [workers]
+'''
+import multiprocessing
+import sys
+import time
+from functools import lru_cache
+from itertools import chain, combinations
+from math import comb
+
+import numpy as np
+
+from games.objects.deck import Deck
+from games.objects.hand import Hand
+from games.objects import evaluator
+from games.objects.batch_evaluator import evaluateBatch
+
+TOTAL_HANDS = comb(52, 7)
+
+# Known number of seven-card hands in each category, HIGH_CARD first.
+EXPECTED = [23294460, 58627800, 31433400, 6461620, 6180020, 4047644, 3473184, 224848, 37260, 4324]
+
+_cards = None
+
+
+def cardsByCode():
+    global _cards
+    if _cards is None:
+        _cards = {card.code: card for card in Deck().deck}
+    return _cards
+
+
+'''
+Every 5-card combination of n cards as an index array, reused by all jobs that draw from n cards.
+'''
+@lru_cache(maxsize=4)
+def fiveOf(n):
+    flat = np.fromiter(chain.from_iterable(combinations(range(n), 5)), dtype=np.int8, count=comb(n, 5) * 5)
+    return flat.reshape(-1, 5)
+
+
+'''
+Checks a sample of hands with every other evaluator. Returns the first disagreement, or None.
+'''
+def checkSample(hands, categories):
+    cards = cardsByCode()
+    for codes, category in zip(hands.tolist(), categories.tolist()):
+        hand = Hand()
+        for code in codes[:2]:
+            hand.add(cards[code])
+        board = [cards[code] for code in codes[2:]]
+        expected = evaluator.HAND_RANKS[category]
+        results = {
+            "getBestHand": hand.getBestHand(board)[0],
+            "getBestHandReference": hand.getBestHandReference(board)[0],
+            "evaluate": evaluator.handName(evaluator.evaluate(codes)),
+        }
+        for name, result in results.items():
+            if result != expected:
+                return f"{name} says {result} for {codes}, evaluateBatch says {expected}"
+    return None
+
+
+'''
+One job: every hand whose two lowest cards are `first` and `second`. Returns (category counts,
+hands checked, first mismatch or None, seconds spent scoring).
+'''
+def runJob(task):
+    first, second, sampleRate, seed = task
+    start = time.perf_counter()
+    rest = np.arange(second + 1, 52, dtype=np.int8)
+    hands = np.empty((comb(len(rest), 5), 7), dtype=np.int8)
+    hands[:, 0] = first
+    hands[:, 1] = second
+    hands[:, 2:] = rest[fiveOf(len(rest))]
+    categories = evaluateBatch(hands)[1]
+    counts = np.bincount(categories, minlength=len(EXPECTED))
+    seconds = time.perf_counter() - start
+
+    rng = np.random.default_rng(seed)
+    picked = np.flatnonzero(rng.random(len(hands)) < sampleRate)
+    mismatch = checkSample(hands[picked], categories[picked])
+    return counts, len(picked), mismatch, seconds
+
+
+def main():
+    samples = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else multiprocessing.cpu_count()
+    sampleRate = samples / TOTAL_HANDS
+    # Grouped by second card, lowest first so the biggest jobs start early.
+    tasks = [(first, second, sampleRate, second * 52 + first)
+             for second in range(1, 47) for first in range(second)]
+
+    print(f"Scoring all {TOTAL_HANDS:,} seven-card hands on {workers} workers\n")
+    start = time.perf_counter()
+    counts = np.zeros(len(EXPECTED), dtype=np.int64)
+    checked = 0
+    busy = 0.0 # Seconds spent scoring, summed over workers.
+    mismatches = []
+    with multiprocessing.Pool(workers) as pool:
+        for jobCounts, jobChecked, mismatch, seconds in pool.imap_unordered(runJob, tasks, chunksize=8):
+            counts += jobCounts
+            checked += jobChecked
+            busy += seconds
+            if mismatch:
+                mismatches.append(mismatch)
+    elapsed = time.perf_counter() - start
+
+    print(f"{'Category':<18}{'Hands':>14}{'Expected':>14}{'Share':>10}")
+    for category, (count, expected) in enumerate(zip(counts, EXPECTED)):
+        flag = "" if count == expected else "  MISMATCH"
+        print(f"{evaluator.HAND_RANKS[category]:<18}{count:>14,}{expected:>14,}{count / TOTAL_HANDS:>10.4%}{flag}")
+    print(f"{'Total':<18}{int(counts.sum()):>14,}{TOTAL_HANDS:>14,}")
+
+    print(f"\n{checked:,} sampled hands checked against getBestHand, getBestHandReference and evaluate")
+    for mismatch in mismatches[:10]:
+        print("  " + mismatch)
+    print(f"\n{elapsed:.1f}s wall, {TOTAL_HANDS / elapsed:,.0f} hands/sec overall, "
+          f"{TOTAL_HANDS / busy:,.0f} hands/sec per core ({busy:.1f} core-seconds scoring)")
+
+    ok = not mismatches and list(counts) == EXPECTED
+    print("\nAll evaluators agree." if ok else "\nVERIFICATION FAILED")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+'''
+Name: conftest.py
+
+Authors: Joshua Welicky, Gavin Billinger, Mark Kitchin, Bisshoy Bhattacharjee, Max Biundo
+
+Description: The game code is imported from the src folder (games.objects..., tools...), the same way
+main.py and the tools run it, so the tests put that folder on the path.
+
+Run from the repository root:
+
+python3 -m pytest tests
+'''
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
@@ -0,0 +1,89 @@
+'''
+Name: test_evaluator.py
+
+Authors: Joshua Welicky, Gavin Billinger, Mark Kitchin, Bisshoy Bhattacharjee, Max Biundo
+
+Description: Tests for the hand evaluators. Every five-card hand is scored to check the category
+counts, one job of tools/verify_evaluator.py checks the batch evaluator against the others on
+seven-card hands, and a few hand-picked hands check the ranking rules (kickers, the wheel, full
+house over flush) and ties at the showdown.
+'''
+import numpy as np
+
+from games.objects import evaluator
+from games.objects.batch_evaluator import evaluateBatch
+from games.objects.cardcodes import RANK_LETTERS, SUIT_LETTERS
+from tools import verify_evaluator
+
+# Known number of five-card hands in each category, HIGH_CARD first.
+FIVE_CARD_COUNTS = [1302540, 1098240, 123552, 54912, 10200, 5108, 3744, 624, 36, 4]
+
+
+'''
+Card codes from hand history notation, e.g. cards("Ah Kd Tc").
+'''
+def cards(text):
+    return [(RANK_LETTERS.index(card[0]) << 2) | SUIT_LETTERS.index(card[1]) for card in text.split()]
+
+
+def strength(text):
+    return evaluator.evaluate(cards(text))
+
+
+def testFiveCardCategoryCounts():
+    hands = verify_evaluator.fiveOf(52)
+    categories = evaluateBatch(hands)[1]
+    assert np.bincount(categories, minlength=len(FIVE_CARD_COUNTS)).tolist() == FIVE_CARD_COUNTS
+
+
+def testSevenCardEvaluatorsAgree():
+    # Every hand holding the two lowest cards, with about a thousand of them checked against
+    # Hand.getBestHand, Hand.getBestHandReference and evaluator.evaluate.
+    counts, checked, mismatch, seconds = verify_evaluator.runJob((0, 1, 1000 / 2118760, 581))
+    assert mismatch is None
+    assert checked > 500
+    assert counts.sum() == 2118760
+
+
+def testCategoriesRankInOrder():
+    hands = [
+        ("High Card", "Ah Kd 9c 7s 2h"),
+        ("Pair", "2h 2d 3c 4s 6h"),
+        ("Two Pair", "3h 3d 2c 2s 4h"),
+        ("Three of a Kind", "2h 2d 2c 3s 4h"),
+        ("Straight", "Ah 2d 3c 4s 5h"),
+        ("Straight", "2h 3d 4c 5s 6h"),
+        ("Straight", "Th Jd Qc Ks Ah"),
+        ("Flush", "2h 3h 4h 5h 7h"),
+        ("Full House", "2h 2d 2c 3s 3h"),
+        ("Four of a Kind", "2h 2d 2c 2s 3h"),
+        ("Straight Flush", "Ac 2c 3c 4c 5c"),
+        ("Royal Flush", "Ts Js Qs Ks As"),
+    ]
+    strengths = [strength(text) for name, text in hands]
+    assert [evaluator.handName(s) for s in strengths] == [name for name, text in hands]
+    assert strengths == sorted(strengths)
+    assert len(set(strengths)) == len(strengths)
+
+
+def testKickersDecide():
+    board = "Kh 9c 7d 4s 2h"
+    assert strength("Ad Qc " + board) > strength("Ac Jd " + board)
+    assert strength("Kd Qc " + board) > strength("Ks Jd " + board)
+    # Two pair on the board: the fifth card plays.
+    assert strength("Ah 3c 9h 9s 5d 5c 2d") > strength("Kh 3d 9h 9s 5d 5c 2d")
+
+
+def testBestFiveOfSeven():
+    # A flush and a full house in the same seven cards: the full house counts.
+    assert evaluator.handName(strength("Ah Kh 7h 7d 7c 2h Kd")) == "Full House"
+    # Six cards to a straight: the higher one counts.
+    assert strength("4c 5d 6h 7s 8c 9d 2h") == strength("5d 6h 7s 8c 9d")
+
+
+def testShowdownSplitsTies():
+    board = cards("Ah Kh Qd Jc Ts")
+    holes = [cards("2c 3d"), None, cards("4s 5s"), cards("Ac 2d")]
+    strengths, winners = evaluator.showdown(holes, board)
+    assert strengths[1] == -1
+    assert winners == [0, 2, 3] # Everyone plays the broadway straight on the board.
@@ -0,0 +1,36 @@
+'''
+Name: test_hand_history.py
+
+Authors: Joshua Welicky, Gavin Billinger, Mark Kitchin, Bisshoy Bhattacharjee, Max Biundo
+
+Description: Tests for the hand history text (hand_history.formatHand), mainly the summary of a
+showdown with a side pot, where a player can win something without holding the best hand.
+'''
+from games.objects.hand_history import formatHand
+
+from test_evaluator import cards
+
+SEATS = ((0, "Player", 1000, tuple(cards("Jh Kd"))),
+         (1, "King Hippo", 300, tuple(cards("7c 7h"))),
+         (2, "Glass Joe", 1000, tuple(cards("Qs Jd"))))
+BOARD = tuple(cards("2c 7d Js 9h 3s"))
+
+
+def showdownHand(payouts, handNames=None):
+    return [('start', 0, "Hold'em", SEATS), ('board', BOARD),
+            ('end', sum(payouts), tuple(payouts), (1,), "Three of a Kind", True, handNames)]
+
+
+def testSidePotWinnerIsWrittenAsWinning():
+    text = formatHand("1", showdownHand((200, 900, 0), ("Pair", "Three of a Kind", "Pair")))
+    assert "Player: shows [Jh Kd] (Pair)" in text
+    assert "Glass Joe: shows [Qs Jd] (loses)" in text
+    assert "Seat 1: Player showed [Jh Kd] and won (200) with Pair" in text
+    assert "Seat 2: King Hippo showed [7c 7h] and won (900) with Three of a Kind" in text
+    assert "Seat 3: Glass Joe showed [Qs Jd] and lost" in text
+
+
+def testSingleWinner():
+    text = formatHand("1", showdownHand((0, 1100, 0)))
+    assert "Seat 1: Player showed [Jh Kd] and lost" in text
+    assert "Seat 2: King Hippo showed [7c 7h] and won (1100) with Three of a Kind" in text
@@ -0,0 +1,78 @@
+'''
+Name: test_settlement.py
+
+Authors: Joshua Welicky, Gavin Billinger, Mark Kitchin, Bisshoy Bhattacharjee, Max Biundo
+
+Description: Tests for paying out poker pots (settlement.py): single winners, split pots and odd
+chips, side pots from short all ins, chips left by folded players, and that no chips are ever made
+or lost, checked on random pots and over whole headless games.
+'''
+import random
+
+from games.objects import settlement
+from games.objects.table import TableEngine
+
+FOLDED = -1
+
+
+def testWinnerTakesAll():
+    payouts, pots = settlement.settle([100, 100, 100], [5, 9, 3])
+    assert payouts == [0, 300, 0]
+    assert len(pots) == 1
+
+
+def testSplitPotOddChipGoesNearestSeatZero():
+    payouts, pots = settlement.settle([101, 100, 100], [7, FOLDED, 7])
+    assert payouts == [151, 0, 150]
+
+
+def testShortAllInOnlyWinsMainPot():
+    # Seat 0 is all in for 100 with the best hand, seat 1 beats seat 2 for the rest.
+    payouts, pots = settlement.settle([100, 300, 300], [9, 5, 3])
+    assert payouts == [300, 400, 0]
+    assert [(pot.amount, pot.winners) for pot in pots] == [(300, [0]), (400, [1])]
+
+
+def testTwoSidePots():
+    payouts, pots = settlement.settle([50, 200, 500, 500], [9, 8, 2, 7])
+    # Main 200 to seat 0, 450 between seats 1-3 to seat 1, 600 between seats 2-3 to seat 3.
+    assert payouts == [200, 450, 0, 600]
+    assert [pot.contenders for pot in pots] == [4, 3, 2]
+
+
+def testSidePotTie():
+    payouts, pots = settlement.settle([100, 300, 300], [9, 5, 5])
+    assert payouts == [300, 200, 200]
+
+
+def testFoldedChipsStayInThePot():
+    # Seat 2 put in the most and folded: the layer nobody live can win goes to the layer below.
+    payouts, pots = settlement.settle([100, 100, 400], [3, 8, FOLDED])
+    assert payouts == [0, 600, 0]
+
+
+def testRandomPotsKeepEveryChip():
+    rng = random.Random(581)
+    for _ in range(2000):
+        seats = rng.randint(2, 6)
+        contributions = [rng.choice([0, 50, 100, 150, 275, 1000]) for _ in range(seats)]
+        strengths = [rng.choice([FOLDED, 1, 2, 3]) for _ in range(seats)]
+        live = [seat for seat in range(seats) if contributions[seat] > 0]
+        if not live:
+            continue
+        strengths[rng.choice(live)] = 4 # Somebody always gets to the showdown.
+        payouts, pots = settlement.settle(contributions, strengths)
+        assert sum(payouts) == sum(contributions)
+        assert all(payout == 0 for payout, s in zip(payouts, strengths) if s == FOLDED)
+        if FOLDED in strengths:
+            continue # Folded chips above every live stake go to the pot below, so no cap.
+        # Nobody collects more than each player put in up to their own stake.
+        for seat, payout in enumerate(payouts):
+            assert payout <= sum(min(c, contributions[seat]) for c in contributions)
+
+
+def testHeadlessGamesKeepEveryChip():
+    table = TableEngine(3, chips=1000, seed=7)
+    table.run(300)
+    assert sum(table.winnings()) == 0
+    assert table.handsPlayed > 0
@@ -0,0 +1,25 @@
+'''
+Name: test_tournament.py
+
+Authors: Joshua Welicky, Gavin Billinger, Mark Kitchin, Bisshoy Bhattacharjee, Max Biundo
+
+Description: Tests for headless matches (tournament.playMatch). With a fixed number of equity
+samples a seeded match has to replay exactly, since tools/tune_opponents.py relies on every
+candidate seeing the same games.
+'''
+from games.objects import tournament
+from games.objects.opponent import DEFAULT_BUDGET_MS, DEFAULT_PARAMS
+
+
+def testFixedSampleMatchesReplay():
+    configs = [dict(DEFAULT_PARAMS, foldMargin=0.1), DEFAULT_PARAMS]
+    task = (0, 12345, configs, 500, DEFAULT_BUDGET_MS, 2000)
+    assert tournament.playMatch(task) == tournament.playMatch(task)
+
+
+def testMatchesKeepEveryChip():
+    configs = [DEFAULT_PARAMS] * 4
+    order, winner, hands, chips = tournament.playMatch((1, 581, configs, 1000, 0, None))
+    assert sorted(order) == [0, 1, 2, 3]
+    assert sum(chips) == 0
+    assert hands > 0